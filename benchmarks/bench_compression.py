@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк сжатия ответов на уровнях прямого pyOpenSSL и curl
+
+Локальный сервер (ThreadedTLSServer с compress=True) отдает XML документ,
+сжатый по Accept-Encoding запроса. Для каждого уровня запросы выполняются со
+сжатием (Accept-Encoding по умолчанию) и без него (Accept-Encoding: identity),
+обычным и потоковым чтением. Выводятся байты по сети (Content-Length ответа)
+и после распаковки, степень сжатия, запросы в секунду и расчетное время
+передачи тела по каналу заданной скорости (--link-mbit).
+
+Использование:
+    python3 benchmarks/bench_compression.py [--body-size 1048576] [--requests 20] [--link-mbit 10] [--key-type gost|rsa]
+"""
+
+import argparse
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from gost_server import ThreadedTLSServer
+from gost_http.gost_http_client import GOSTHTTPClient, TIER_CURL, TIER_PYOPENSSL
+
+
+def fetch(client: GOSTHTTPClient, url: str, headers: dict, stream: bool) -> tuple:
+    """
+    Выполняет запрос и читает тело
+
+    Returns:
+        Кортеж (байтов по сети, байтов после распаковки, Content-Encoding)
+    """
+    response = client.get(url, headers=headers, stream=stream)
+    if response is None or response.status_code != 200:
+        raise RuntimeError(f'Запрос не выполнен: {response}')
+    if stream:
+        decoded = sum(len(chunk) for chunk in response.iter_content(64 * 1024))
+    else:
+        decoded = len(response.content)
+    wire = int(response.headers.get('Content-Length', decoded))
+    return wire, decoded, response.headers.get('Content-Encoding', 'identity')
+
+
+def run(client: GOSTHTTPClient, url: str, tier: str, compressed: bool, stream: bool, requests: int) -> dict:
+    """Замер ``requests`` запросов через уровень ``tier``"""
+    client.tiers = [tier]
+    headers = {} if compressed else {'Accept-Encoding': 'identity'}
+    # Прогрев: соединение и TLS handshake не входят в замер
+    wire, decoded, encoding = fetch(client, url, headers, stream)
+    started = time.perf_counter()
+    for _ in range(requests):
+        fetch(client, url, headers, stream)
+    elapsed = time.perf_counter() - started
+    return {
+        'encoding': encoding,
+        'wire': wire,
+        'decoded': decoded,
+        'rps': requests / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк сжатия ответов на уровнях pyOpenSSL и curl')
+    parser.add_argument('--body-size', type=int, default=1024 * 1024, help='Размер XML документа в байтах')
+    parser.add_argument('--requests', type=int, default=20, help='Запросов на каждый вариант')
+    parser.add_argument('--link-mbit', type=float, default=10.0,
+                        help='Скорость канала для расчета времени передачи, Мбит/с')
+    parser.add_argument('--key-type', choices=['gost', 'rsa'], default='gost', help='Тип ключа сервера')
+    args = parser.parse_args()
+    # Сервер с самоподписанным сертификатом: предупреждение на каждый запрос
+    warnings.filterwarnings('ignore', message='Unverified HTTPS request')
+
+    print("=" * 78)
+    print(f"Сжатие ответов: XML {args.body_size} байт, ключ {args.key_type}, канал {args.link_mbit:g} Мбит/с")
+    print("=" * 78)
+    print(f"{'Уровень':<11}{'Чтение':<9}{'Кодировка':<11}{'По сети':>11}{'Распаковано':>13}"
+          f"{'Сжатие':>8}{'Запросов/с':>12}{'По каналу, с':>14}")
+
+    with ThreadedTLSServer(key_type=args.key_type, body_size=args.body_size, compress=True) as server:
+        for tier in (TIER_PYOPENSSL, TIER_CURL):
+            for stream in (False, True):
+                for compressed in (False, True):
+                    with GOSTHTTPClient() as client:
+                        result = run(client, server.url, tier, compressed, stream, args.requests)
+                    link_seconds = result['wire'] * 8 / (args.link_mbit * 1e6)
+                    print(f"{tier:<11}{('поток' if stream else 'целиком'):<9}{result['encoding']:<11}"
+                          f"{result['wire']:>11}{result['decoded']:>13}"
+                          f"{result['decoded'] / result['wire']:>7.1f}x{result['rps']:>12.1f}{link_seconds:>14.3f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
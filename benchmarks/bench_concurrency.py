@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный бенчмарк GOSTHTTPClient из нескольких потоков
+
+Один общий GOSTHTTPClient используется из 1-64 потоков одновременно против
+локального многопоточного GOST сервера (ThreadedTLSServer). Для каждого
+количества потоков выводит запросы в секунду, p50 и p99 задержки и число
+ошибок. Перед замером все потоки одновременно вызывают load_gost_engine,
+чтобы проверить однократную инициализацию engine под конкуренцией.
+
+Использование:
+    python3 benchmarks/bench_concurrency.py [--threads 1,2,4,8,16,32,64] [--seconds 3] [--key-type gost|rsa]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from gost_server import ThreadedTLSServer
+from gost_http.gost_http_client import GOSTHTTPClient, load_gost_engine
+
+
+def percentile(values, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def concurrent_engine_init(threads: int) -> set:
+    """Одновременный первый вызов load_gost_engine из ``threads`` потоков"""
+    barrier = threading.Barrier(threads)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(load_gost_engine())
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return set(results)
+
+
+def run(client: GOSTHTTPClient, url: str, threads: int, seconds: float) -> dict:
+    """Нагрузка из ``threads`` потоков в течение ``seconds`` секунд"""
+    barrier = threading.Barrier(threads + 1)
+    latencies = [[] for _ in range(threads)]
+    errors = [0] * threads
+    deadline = [0.0]
+
+    def worker(index: int):
+        # Прогрев: соединение и сессия потока создаются до начала замера
+        client.get(url)
+        barrier.wait()
+        own = latencies[index]
+        while time.perf_counter() < deadline[0]:
+            started = time.perf_counter()
+            response = client.get(url)
+            if response is None or response.status_code != 200:
+                errors[index] += 1
+                continue
+            own.append((time.perf_counter() - started) * 1000)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    # Потоки читают deadline только после barrier: все прогреты - начинаем замер
+    started = time.perf_counter()
+    deadline[0] = started + seconds
+    barrier.wait()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    values = [value for own in latencies for value in own]
+    return {
+        'requests': len(values),
+        'rps': len(values) / elapsed,
+        'p50': percentile(values, 0.5) if values else 0.0,
+        'p99': percentile(values, 0.99) if values else 0.0,
+        'errors': sum(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Нагрузочный бенчмарк GOSTHTTPClient из нескольких потоков')
+    parser.add_argument('--threads', default='1,2,4,8,16,32,64', help='Количества потоков через запятую')
+    parser.add_argument('--seconds', type=float, default=3.0, help='Длительность замера для каждого количества')
+    parser.add_argument('--key-type', choices=['gost', 'rsa'], default='gost', help='Тип ключа сервера')
+    parser.add_argument('--body-size', type=int, default=1024, help='Размер тела ответа в байтах')
+    args = parser.parse_args()
+    counts = [int(value) for value in args.threads.split(',')]
+    # Сервер с самоподписанным сертификатом: предупреждение на каждый запрос
+    warnings.filterwarnings('ignore', message='Unverified HTTPS request')
+
+    print("=" * 60)
+    print(f"Общий GOSTHTTPClient из нескольких потоков, ключ {args.key_type}")
+    print("=" * 60)
+
+    loaded = concurrent_engine_init(max(counts))
+    print(f"Одновременный load_gost_engine из {max(counts)} потоков: {sorted(loaded)}")
+
+    with ThreadedTLSServer(key_type=args.key_type, body_size=args.body_size) as server:
+        print(f"{'Потоки':>7}{'Запросов/с':>14}{'p50, мс':>10}{'p99, мс':>10}{'Ошибки':>9}")
+        for threads in counts:
+            # Пул соединений рассчитан на все потоки, иначе замеряется его ожидание
+            with GOSTHTTPClient(pool_maxsize=threads) as client:
+                result = run(client, server.url, threads, args.seconds)
+            print(f"{threads:>7}{result['rps']:>14.0f}{result['p50']:>10.2f}"
+                  f"{result['p99']:>10.2f}{result['errors']:>9}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
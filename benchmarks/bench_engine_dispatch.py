@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк AES/SHA после загрузки GOST engine
+
+Измеряет пропускную способность AES-256-GCM и SHA-256 через EVP API
+libcrypto (ctypes) и hashlib в трех режимах, каждый в отдельном процессе:
+- none    - GOST engine не загружен;
+- scoped  - engine зарегистрирован только для ГОСТ алгоритмов (по умолчанию);
+- default - engine назначен реализацией по умолчанию (ENGINE_METHOD_ALL).
+
+Крупные блоки показывают скорость самих реализаций, короткие сообщения с
+инициализацией контекста на каждое сообщение - стоимость выбора реализации.
+Смешанная нагрузка не должна замедляться в режиме scoped.
+
+Использование:
+    python3 benchmarks/bench_engine_dispatch.py [--seconds 1.0] [--modes none,scoped,default]
+"""
+
+import argparse
+import ctypes
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+MODES = ('none', 'scoped', 'default')
+BULK_SIZE = 1024 * 1024
+SMALL_SIZE = 1024
+
+
+class EVP:
+    """Минимальные привязки EVP API libcrypto через ctypes"""
+
+    def __init__(self):
+        lib = ctypes.CDLL('libcrypto.so.3')
+        for name in ('EVP_aes_256_gcm', 'EVP_sha256', 'EVP_CIPHER_CTX_new', 'EVP_MD_CTX_new'):
+            getattr(lib, name).restype = ctypes.c_void_p
+        lib.EVP_CIPHER_CTX_free.argtypes = [ctypes.c_void_p]
+        lib.EVP_MD_CTX_free.argtypes = [ctypes.c_void_p]
+        lib.EVP_EncryptInit_ex.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p,
+                                           ctypes.c_char_p, ctypes.c_char_p]
+        lib.EVP_EncryptUpdate.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.POINTER(ctypes.c_int),
+                                          ctypes.c_char_p, ctypes.c_int]
+        lib.EVP_EncryptFinal_ex.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
+        lib.EVP_DigestInit_ex.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p]
+        lib.EVP_DigestUpdate.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_size_t]
+        lib.EVP_DigestFinal_ex.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint)]
+        self.lib = lib
+        self.key = os.urandom(32)
+        self.iv = os.urandom(12)
+        self.out = ctypes.create_string_buffer(BULK_SIZE + 64)
+
+    def aes_gcm(self, data: bytes) -> None:
+        """Шифрует data в новом контексте (инициализация + шифрование)"""
+        lib = self.lib
+        ctx = lib.EVP_CIPHER_CTX_new()
+        length = ctypes.c_int()
+        lib.EVP_EncryptInit_ex(ctx, lib.EVP_aes_256_gcm(), None, self.key, self.iv)
+        lib.EVP_EncryptUpdate(ctx, self.out, ctypes.byref(length), data, len(data))
+        lib.EVP_EncryptFinal_ex(ctx, self.out, ctypes.byref(length))
+        lib.EVP_CIPHER_CTX_free(ctx)
+
+    def sha256(self, data: bytes) -> None:
+        """Хеширует data в новом контексте"""
+        lib = self.lib
+        ctx = lib.EVP_MD_CTX_new()
+        length = ctypes.c_uint()
+        lib.EVP_DigestInit_ex(ctx, lib.EVP_sha256(), None)
+        lib.EVP_DigestUpdate(ctx, data, len(data))
+        lib.EVP_DigestFinal_ex(ctx, self.out, ctypes.byref(length))
+        lib.EVP_MD_CTX_free(ctx)
+
+
+def throughput(operation, data: bytes, seconds: float) -> float:
+    """Выполняет операцию в течение ``seconds`` секунд, возвращает МБ/с"""
+    operations = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while True:
+        for _ in range(16):
+            operation(data)
+        operations += 16
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+    return operations * len(data) / (now - started) / (1024 * 1024)
+
+
+def run_child(mode: str, seconds: float) -> dict:
+    """Измерения в текущем процессе после загрузки engine в режиме ``mode``"""
+    if mode != 'none':
+        from gost_http.gost_http_client import load_gost_engine
+        if not load_gost_engine(mode):
+            return {'error': 'GOST engine недоступен'}
+
+    evp = EVP()
+    bulk = os.urandom(BULK_SIZE)
+    small = os.urandom(SMALL_SIZE)
+    return {
+        'aes-256-gcm 1MiB': throughput(evp.aes_gcm, bulk, seconds),
+        'aes-256-gcm 1KiB': throughput(evp.aes_gcm, small, seconds),
+        'sha256 1MiB': throughput(evp.sha256, bulk, seconds),
+        'sha256 1KiB': throughput(evp.sha256, small, seconds),
+        'hashlib sha256 1KiB': throughput(lambda data: hashlib.sha256(data).digest(), small, seconds),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк AES/SHA после загрузки GOST engine')
+    parser.add_argument('--seconds', type=float, default=1.0, help='Длительность каждого измерения')
+    parser.add_argument('--modes', default=','.join(MODES), help='Режимы через запятую')
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.seconds)))
+        return 0
+
+    results = {}
+    for mode in args.modes.split(','):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', mode, '--seconds', str(args.seconds)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    baseline = results.get('none', {})
+    names = next((list(r) for r in results.values() if 'error' not in r), [])
+    print(f"{'Операция':<22}" + ''.join(f'{mode:>20}' for mode in results))
+    for name in names:
+        row = f'{name:<22}'
+        for mode, result in results.items():
+            if 'error' in result:
+                row += f"{'-':>20}"
+                continue
+            value = result[name]
+            relative = f' ({value / baseline[name] * 100:.0f}%)' if baseline.get(name) and mode != 'none' else ''
+            row += f'{value:.0f} МБ/с{relative}'.rjust(20)
+        print(row)
+    for mode, result in results.items():
+        if 'error' in result:
+            print(f"{mode}: {result['error']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк времени импорта gost_http
+
+Запускает ``python -X importtime -c "import <module>"`` в отдельных процессах
+(холодный старт, как у CLI и serverless обработчиков) и выводит медиану
+суммарного времени импорта. Дополнительно проверяет, что при импорте не
+загружаются тяжелые зависимости (requests, pyOpenSSL, urllib3, cryptography).
+
+Возвращает ненулевой код, если время превышает --max-ms или тяжелые модули
+импортированы, поэтому скрипт можно использовать как проверку в CI.
+
+Использование:
+    python3 benchmarks/bench_import.py [--runs 10] [--max-ms 20] [--module gost_http]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Модули, которые не должны загружаться при import gost_http
+HEAVY_MODULES = ('requests', 'OpenSSL', 'urllib3', 'cryptography')
+
+
+def import_time_us(module: str) -> int:
+    """Суммарное время импорта модуля в микросекундах (по -X importtime)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, check=True, env=os.environ.copy()
+    )
+    for line in reversed(result.stderr.splitlines()):
+        # import time: self [us] | cumulative | imported package
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise RuntimeError(f'Не найдена строка importtime для {module}')
+
+
+def loaded_heavy_modules(module: str) -> list:
+    """Возвращает тяжелые модули, загруженные при импорте"""
+    code = (
+        f'import sys, {module}\n'
+        f'print(" ".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк времени импорта gost_http')
+    parser.add_argument('--module', default='gost_http', help='Импортируемый модуль')
+    parser.add_argument('--runs', type=int, default=10, help='Количество запусков')
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help='Допустимая медиана времени импорта, мс (по умолчанию без проверки)')
+    args = parser.parse_args()
+
+    timings = [import_time_us(args.module) / 1000 for _ in range(args.runs)]
+    median = statistics.median(timings)
+    heavy = loaded_heavy_modules(args.module)
+
+    print(f'import {args.module}: медиана {median:.1f} мс, '
+          f'мин {min(timings):.1f} мс, макс {max(timings):.1f} мс ({args.runs} запусков)')
+    print(f'Тяжелые модули при импорте: {", ".join(heavy) if heavy else "нет"}')
+
+    failed = False
+    if heavy:
+        print('✗ Импорт загружает тяжелые зависимости')
+        failed = True
+    if args.max_ms is not None and median > args.max_ms:
+        print(f'✗ Медиана {median:.1f} мс превышает порог {args.max_ms} мс')
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
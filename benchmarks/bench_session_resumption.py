@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк возобновления TLS сессий
+
+Сравнивает задержку полного и возобновленного handshake для прямого
+pyOpenSSL подключения и для SSL контекста GOSTAdapter на локальном
+`openssl s_server` с GOST сертификатом.
+
+Использование:
+    python3 benchmarks/bench_session_resumption.py [--rounds 50] [--key-type gost|rsa]
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from gost_server import OpenSSLServer
+from gost_http.gost_http_client import (
+    _connect_via_pyopenssl,
+    _remember_tls_session,
+    get_ssl_context,
+    tls_session_cache,
+)
+
+
+def connect_direct(host: str, port: int):
+    """Handshake через прямое pyOpenSSL подключение, возвращает SSL.Connection"""
+    conn = _connect_via_pyopenssl(host, port, timeout=10)
+    if conn is None:
+        raise RuntimeError('прямое pyOpenSSL подключение не удалось')
+    return conn
+
+
+def connect_adapter(host: str, port: int):
+    """Handshake через SSL контекст GOSTAdapter, возвращает SSL.Connection"""
+    sock = socket.create_connection((host, port), timeout=10)
+    return get_ssl_context().wrap_socket(sock, server_hostname=host).connection
+
+
+def finish(conn, host: str, port: int) -> None:
+    """Выполняет HTTP запрос, чтобы получить session ticket, и закрывает соединение"""
+    try:
+        conn.sendall(b'GET / HTTP/1.0\r\n\r\n')
+        while True:
+            try:
+                if not conn.recv(65536):
+                    break
+            except Exception:
+                break
+        _remember_tls_session(conn, host, port)
+        # Корректный close_notify, иначе OpenSSL считает сессию невозобновляемой
+        conn.shutdown()
+    except Exception:
+        pass
+    finally:
+        conn.close()
+
+
+def measure(connect, host: str, port: int, rounds: int, resume: bool):
+    """Возвращает список задержек handshake в миллисекундах"""
+    latencies = []
+    tls_session_cache.clear()
+    if resume:
+        # Первое соединение создает сессию для последующих
+        finish(connect(host, port), host, port)
+    for _ in range(rounds):
+        if not resume:
+            tls_session_cache.clear()
+        started = time.perf_counter()
+        conn = connect(host, port)
+        latencies.append((time.perf_counter() - started) * 1000)
+        finish(conn, host, port)
+    return latencies, tls_session_cache.stats()
+
+
+def percentile(values, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк возобновления TLS сессий')
+    parser.add_argument('--rounds', type=int, default=50, help='Количество handshake на режим')
+    parser.add_argument('--key-type', choices=['gost', 'rsa'], default='gost', help='Тип ключа сервера')
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print(f"Возобновление TLS сессий: {args.rounds} handshake, ключ {args.key_type}")
+    print("=" * 60)
+    
+    with OpenSSLServer(key_type=args.key_type) as server:
+        for name, connect in [('Прямой pyOpenSSL', connect_direct), ('GOSTAdapter', connect_adapter)]:
+            full, _ = measure(connect, server.host, server.port, args.rounds, resume=False)
+            resumed, stats = measure(connect, server.host, server.port, args.rounds, resume=True)
+            print(f"{name}:")
+            for label, values in [('Полный handshake', full), ('Возобновленный', resumed)]:
+                print(f"  {label}: среднее {statistics.mean(values):.2f} мс, "
+                      f"p50 {percentile(values, 0.5):.2f} мс, p95 {percentile(values, 0.95):.2f} мс")
+            print(f"  Ускорение: {statistics.mean(full) / statistics.mean(resumed):.2f}x")
+            print(f"  Доля возобновленных handshake: {stats['resumed_ratio']:.0%}")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк построения SSL контекстов
+
+Сравнивает создание нового pyOpenSSL контекста на каждый клиент
+(build_ssl_context) и получение общего контекста из кеша (get_ssl_context):
+время построения и прирост RSS процесса.
+
+Использование:
+    python3 benchmarks/bench_ssl_context.py [--clients 200] [--verify]
+"""
+
+import argparse
+import gc
+import sys
+import time
+
+from gost_http.gost_http_client import build_ssl_context, get_ssl_context
+
+
+def current_rss_kb() -> int:
+    """Текущий RSS процесса в килобайтах (Linux)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(factory, clients: int, verify: bool):
+    """Создает контексты для ``clients`` клиентов и возвращает (время, прирост RSS)"""
+    gc.collect()
+    rss_before = current_rss_kb()
+    # Клиенты держат свои контексты, как долгоживущие сессии в воркере
+    contexts = []
+    started = time.perf_counter()
+    for _ in range(clients):
+        contexts.append(factory(verify=verify))
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    rss_delta = current_rss_kb() - rss_before
+    return elapsed, rss_delta, len({id(c) for c in contexts})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк построения SSL контекстов')
+    parser.add_argument('--clients', type=int, default=200, help='Количество клиентов')
+    parser.add_argument('--verify', action='store_true', help='Загружать системный CA bundle')
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print(f"Построение SSL контекстов: {args.clients} клиентов, verify={args.verify}")
+    print("=" * 60)
+    
+    results = [
+        ('Без кеша (build_ssl_context)', measure(build_ssl_context, args.clients, args.verify)),
+        ('С кешем (get_ssl_context)', measure(get_ssl_context, args.clients, args.verify)),
+    ]
+    
+    for name, (elapsed, rss_delta, unique) in results:
+        print(f"{name}:")
+        print(f"  Время: {elapsed * 1000:.1f} мс ({elapsed * 1e6 / args.clients:.1f} мкс на клиент)")
+        print(f"  Прирост RSS: {rss_delta} КБ")
+        print(f"  Уникальных контекстов: {unique}")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
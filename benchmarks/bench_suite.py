@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Офлайн набор бенчмарков gost_http с локальным GOST сервером
+
+Не обращается к внешним сайтам: для каждого варианта запускается локальный
+многопоточный HTTPS сервер (ThreadedTLSServer):
+- gost  - сайт только с GOST cipher suites (TLS 1.2, GOST сертификат);
+- mixed - смешанный сайт: GOST и RSA сертификаты, GOST и ECDHE cipher suites,
+          TLS 1.2 и 1.3.
+
+Для каждого варианта в отдельном процессе измеряются:
+- handshake в секунду (полные и возобновленные) прямого pyOpenSSL подключения;
+- запросы в секунду и p50/p90/p99 задержки каждого транспортного уровня;
+- скорость чтения большого тела (МБ/с) каждым уровнем;
+- пиковый RSS клиентского процесса.
+
+Результаты сохраняются в JSON (--output) и сравниваются с результатами
+предыдущего релиза (--compare). С --max-regression скрипт завершается с
+ошибкой, если какая-либо метрика ухудшилась больше порога, поэтому его можно
+использовать как проверку в CI. Без GOST engine (--key-type rsa) варианты
+используют RSA сертификат и проверяют только работоспособность набора.
+
+Использование:
+    python3 benchmarks/bench_suite.py [--variants gost,mixed] [--seconds 2] [--output results.json]
+    python3 benchmarks/bench_suite.py --compare old.json [new.json] [--max-regression 10]
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from gost_server import GOST_SERVER_CIPHERS, MIXED_SERVER_CIPHERS, ThreadedTLSServer
+
+VARIANTS = ('gost', 'mixed')
+TIERS = ('session', 'pyopenssl', 'curl')
+
+
+def percentile(values, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def server_for(variant: str, key_type: str, body_size: int) -> ThreadedTLSServer:
+    """Локальный сервер варианта; при key_type='rsa' GOST сертификаты не используются"""
+    if key_type != 'gost':
+        return ThreadedTLSServer(key_type='rsa', body_size=body_size, tls1_2=(variant == 'gost'))
+    if variant == 'gost':
+        return ThreadedTLSServer(key_type='gost', ciphers=GOST_SERVER_CIPHERS, body_size=body_size)
+    return ThreadedTLSServer(key_type='gost', ciphers=MIXED_SERVER_CIPHERS, tls1_2=False,
+                             body_size=body_size, extra_key_type='rsa')
+
+
+def finish(conn, host: str, port: int) -> None:
+    """Выполняет запрос, чтобы получить session ticket (TLS 1.3), и закрывает соединение"""
+    from gost_http.gost_http_client import _remember_tls_session
+
+    try:
+        # Сокет с таймаутом неблокирующий для pyOpenSSL: читаем в блокирующем режиме
+        conn.setblocking(True)
+        conn.sendall(b'GET / HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n')
+        while True:
+            try:
+                if not conn.recv(65536):
+                    break
+            except Exception:
+                break
+        _remember_tls_session(conn, host, port)
+        conn.shutdown()
+    except Exception:
+        pass
+    finally:
+        conn.close()
+
+
+def measure_handshakes(host: str, port: int, seconds: float, resume: bool) -> dict:
+    """Handshake прямого pyOpenSSL подключения в секунду (время только handshake)"""
+    from gost_http.gost_http_client import _connect_via_pyopenssl, tls_session_cache
+
+    tls_session_cache.clear()
+    if resume:
+        conn = _connect_via_pyopenssl(host, port, timeout=10)
+        if conn is None:
+            return {'error': 'подключение не удалось'}
+        finish(conn, host, port)
+    before = tls_session_cache.stats()
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        if not resume:
+            tls_session_cache.clear()
+        started = time.perf_counter()
+        conn = _connect_via_pyopenssl(host, port, timeout=10)
+        elapsed = time.perf_counter() - started
+        if conn is None:
+            errors += 1
+            continue
+        latencies.append(elapsed)
+        finish(conn, host, port)
+    if not latencies:
+        return {'error': 'подключение не удалось'}
+    return {
+        'per_sec': len(latencies) / sum(latencies),
+        'p50_ms': percentile(latencies, 0.5) * 1000,
+        'resumed_ratio': (tls_session_cache.stats()['resumed'] - before['resumed']) / len(latencies),
+        'errors': errors,
+    }
+
+
+def measure_tier(client, tier: str, url: str, seconds: float) -> dict:
+    """Последовательные запросы через один уровень в течение ``seconds`` секунд"""
+    # Прогрев: соединение, TLS сессия и пулы создаются до замера
+    client._request_via_tier(tier, 'GET', url, {})
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        request_started = time.perf_counter()
+        response = client._request_via_tier(tier, 'GET', url, {})
+        if response is None or response.status_code != 200:
+            errors += 1
+            continue
+        latencies.append((time.perf_counter() - request_started) * 1000)
+    elapsed = time.perf_counter() - started
+    if not latencies:
+        return {'rps': 0.0, 'errors': errors}
+    return {
+        'rps': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 0.5),
+        'p90_ms': percentile(latencies, 0.9),
+        'p99_ms': percentile(latencies, 0.99),
+        'errors': errors,
+    }
+
+
+def measure_large_body(client, tier: str, url: str, size: int, rounds: int) -> dict:
+    """Скорость чтения тела из ``size`` байт через уровень"""
+    # Прогрев: сервер готовит ответ такого размера при первом запросе
+    client._request_via_tier(tier, 'GET', url, {})
+    received = 0
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        response = client._request_via_tier(tier, 'GET', url, {})
+        if response is None or len(response.content) != size:
+            errors += 1
+            continue
+        received += len(response.content)
+    elapsed = time.perf_counter() - started
+    return {'mb_per_sec': received / elapsed / (1024 * 1024), 'errors': errors}
+
+
+def run_child(variant: str, args) -> dict:
+    """Все измерения варианта в текущем процессе"""
+    from gost_http.gost_http_client import GOSTHTTPClient, load_gost_engine
+
+    warnings.filterwarnings('ignore', message='Unverified HTTPS request')
+    if args.key_type == 'gost' and not load_gost_engine():
+        return {'error': 'GOST engine недоступен'}
+
+    result = {'tiers': {}, 'large_body': {}}
+    with server_for(variant, args.key_type, args.body_size) as server:
+        host = '127.0.0.1'
+        url = f'https://{host}:{server.port}/'
+        result['handshakes'] = {
+            'full': measure_handshakes(host, server.port, args.seconds, resume=False),
+            'resumed': measure_handshakes(host, server.port, args.seconds, resume=True),
+        }
+        with GOSTHTTPClient() as client:
+            for tier in args.tiers.split(','):
+                result['tiers'][tier] = measure_tier(client, tier, url, args.seconds)
+                result['large_body'][tier] = measure_large_body(
+                    client, tier, f'{url}{args.large_size}', args.large_size, args.large_rounds
+                )
+    # ru_maxrss в Linux - килобайты (процессы curl не учитываются)
+    result['peak_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return result
+
+
+def flatten(data: dict, prefix: str = '') -> dict:
+    """Превращает вложенные результаты в словарь 'вариант.раздел.метрика' -> число"""
+    values = {}
+    for key, value in data.items():
+        name = f'{prefix}.{key}' if prefix else key
+        if isinstance(value, dict):
+            values.update(flatten(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[name] = value
+    return values
+
+
+def lower_is_better(name: str) -> bool:
+    metric = name.rsplit('.', 1)[-1]
+    return metric.endswith('_ms') or metric.startswith('peak_rss') or metric == 'errors'
+
+
+def compare(old: dict, new: dict, max_regression: float = None) -> int:
+    """Печатает изменения метрик; возвращает 1, если регрессия превышает порог"""
+    old_values = flatten(old['variants'])
+    new_values = flatten(new['variants'])
+    print(f"{'Метрика':<44}{'Было':>12}{'Стало':>12}{'Изменение':>12}")
+    regressions = []
+    for name in sorted(set(old_values) & set(new_values)):
+        before, after = old_values[name], new_values[name]
+        if before:
+            change = (after - before) / before * 100
+            worse = change > 0 if lower_is_better(name) else change < 0
+        else:
+            change, worse = 0.0, after > before and lower_is_better(name)
+        mark = ''
+        if worse and max_regression is not None and (abs(change) > max_regression or not before):
+            regressions.append(name)
+            mark = ' ✗'
+        print(f'{name:<44}{before:>12.2f}{after:>12.2f}{change:>+11.1f}%{mark}')
+    for name in sorted(set(old_values) ^ set(new_values)):
+        print(f'{name:<44} есть только в {"старых" if name in old_values else "новых"} результатах')
+    if regressions:
+        print(f'✗ Регрессия больше {max_regression}%: {", ".join(regressions)}')
+        return 1
+    return 0
+
+
+def print_results(results: dict) -> None:
+    for variant, result in results['variants'].items():
+        print(f'Вариант {variant}:')
+        if 'error' in result:
+            print(f"  {result['error']}")
+            continue
+        for mode, handshakes in result['handshakes'].items():
+            if 'error' in handshakes:
+                print(f"  Handshake ({mode}): {handshakes['error']}")
+                continue
+            print(f"  Handshake ({mode}): {handshakes['per_sec']:.0f}/с, p50 {handshakes['p50_ms']:.2f} мс, "
+                  f"возобновлено {handshakes['resumed_ratio']:.0%}")
+        print(f"  {'Уровень':<12}{'Запросов/с':>12}{'p50, мс':>10}{'p90, мс':>10}{'p99, мс':>10}"
+              f"{'МБ/с':>10}{'Ошибки':>9}")
+        for tier, stats in result['tiers'].items():
+            large = result['large_body'][tier]
+            print(f"  {tier:<12}{stats['rps']:>12.0f}{stats.get('p50_ms', 0):>10.2f}{stats.get('p90_ms', 0):>10.2f}"
+                  f"{stats.get('p99_ms', 0):>10.2f}{large['mb_per_sec']:>10.1f}"
+                  f"{stats['errors'] + large['errors']:>9}")
+        print(f"  Пиковый RSS: {result['peak_rss_kb'] / 1024:.1f} МБ")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Офлайн набор бенчмарков gost_http с локальным GOST сервером')
+    parser.add_argument('--variants', default=','.join(VARIANTS), help='Варианты сервера через запятую')
+    parser.add_argument('--tiers', default=','.join(TIERS), help='Транспортные уровни через запятую')
+    parser.add_argument('--seconds', type=float, default=2.0, help='Длительность каждого замера')
+    parser.add_argument('--key-type', choices=['gost', 'rsa'], default='gost', help='Тип ключа сервера')
+    parser.add_argument('--body-size', type=int, default=1024, help='Размер тела ответа для замера запросов')
+    parser.add_argument('--large-size', type=int, default=16 * 1024 * 1024, help='Размер большого тела в байтах')
+    parser.add_argument('--large-rounds', type=int, default=5, help='Количество запросов большого тела')
+    parser.add_argument('--output', help='Файл для результатов в JSON')
+    parser.add_argument('--compare', nargs='+', metavar='JSON',
+                        help='Сравнить с предыдущими результатами (или два файла между собой)')
+    parser.add_argument('--max-regression', type=float, default=None,
+                        help='Допустимое ухудшение метрики при сравнении, %% (по умолчанию без проверки)')
+    parser.add_argument('--child', choices=VARIANTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args)))
+        return 0
+
+    if args.compare and len(args.compare) == 2:
+        with open(args.compare[0]) as old, open(args.compare[1]) as new:
+            return compare(json.load(old), json.load(new), args.max_regression)
+
+    from gost_http import __version__
+    import ssl
+
+    results = {
+        'meta': {
+            'version': __version__,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'openssl': ssl.OPENSSL_VERSION,
+            'key_type': args.key_type,
+            'seconds': args.seconds,
+            'body_size': args.body_size,
+            'large_size': args.large_size,
+        },
+        'variants': {},
+    }
+    # Каждый вариант - в своем процессе: пиковый RSS не зависит от предыдущих
+    child_args = ['--seconds', str(args.seconds), '--key-type', args.key_type, '--tiers', args.tiers,
+                  '--body-size', str(args.body_size), '--large-size', str(args.large_size),
+                  '--large-rounds', str(args.large_rounds)]
+    for variant in args.variants.split(','):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', variant] + child_args,
+            capture_output=True, text=True, check=True
+        ).stdout
+        results['variants'][variant] = json.loads(output.strip().splitlines()[-1])
+
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f'Результаты сохранены в {args.output}')
+
+    if args.compare:
+        print()
+        with open(args.compare[0]) as old:
+            return compare(json.load(old), results, args.max_regression)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Локальный GOST TLS сервер для бенчмарков
+
+Запускает `openssl s_server` с самоподписанным GOST сертификатом
+(GOST R 34.10-2012, 256 бит) из GOST engine образа. Для окружений без
+GOST engine можно использовать RSA сертификат (key_type='rsa').
+
+`openssl s_server -www` обслуживает соединения по одному и закрывает их после
+ответа, поэтому для нагрузочных бенчмарков есть ThreadedTLSServer -
+многопоточный pyOpenSSL сервер с keep-alive в отдельном процессе. С
+extra_key_type он работает как смешанный сайт: GOST и RSA сертификаты
+одновременно, сервер выбирает сертификат по согласованному cipher suite.
+С compress=True тело ответа - XML документ, сжатый по Accept-Encoding запроса.
+"""
+
+import argparse
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from typing import List, Optional, Tuple
+
+# Cipher suites TLS 1.2, которые согласовывает GOST engine
+GOST_SERVER_CIPHERS = 'GOST2012-KUZNYECHIK-KUZNYECHIKOMAC:GOST2012-MAGMA-MAGMAOMAC:GOST2012-GOST8912-GOST8912'
+
+# Cipher suites смешанного сайта: GOST и стандартные ECDHE
+MIXED_SERVER_CIPHERS = GOST_SERVER_CIPHERS + ':ECDHE-RSA-AES128-GCM-SHA256:ECDHE-RSA-AES256-GCM-SHA384'
+
+
+def free_port() -> int:
+    """Возвращает свободный TCP порт на localhost"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def generate_certificate(directory: str, key_type: str = 'gost') -> Tuple[str, str]:
+    """
+    Создает самоподписанный сертификат для localhost
+    
+    Args:
+        directory: Каталог для cert.pem и key.pem
+        key_type: 'gost' (GOST R 34.10-2012 256 бит) или 'rsa'
+    
+    Returns:
+        Кортеж (путь к сертификату, путь к ключу)
+    """
+    cert = os.path.join(directory, 'cert.pem')
+    key = os.path.join(directory, 'key.pem')
+    
+    if key_type == 'gost':
+        subprocess.run(
+            ['openssl', 'genpkey', '-algorithm', 'gost2012_256', '-pkeyopt', 'paramset:A', '-out', key],
+            check=True, capture_output=True
+        )
+        subprocess.run(
+            ['openssl', 'req', '-new', '-x509', '-md_gost12_256', '-key', key, '-out', cert,
+             '-subj', '/CN=localhost', '-days', '1'],
+            check=True, capture_output=True
+        )
+    else:
+        subprocess.run(
+            ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-keyout', key, '-out', cert,
+             '-subj', '/CN=localhost', '-days', '1'],
+            check=True, capture_output=True
+        )
+    return cert, key
+
+
+class OpenSSLServer:
+    """
+    `openssl s_server -www` на localhost как контекстный менеджер
+    
+    Example:
+        >>> with OpenSSLServer(key_type='gost') as server:
+        ...     print(server.url)
+    """
+    
+    # Имя сервера в сообщениях об ошибках
+    name = 'openssl s_server'
+    
+    def __init__(self, key_type: str = 'gost', ciphers: Optional[str] = None,
+                 tls1_2: bool = True, port: Optional[int] = None):
+        """
+        Args:
+            key_type: Тип ключа сервера: 'gost' или 'rsa'
+            ciphers: Cipher suites сервера (по умолчанию только GOST для key_type='gost')
+            tls1_2: Ограничить сервер TLS 1.2 (GOST cipher suites определены для TLS 1.2)
+            port: Порт (по умолчанию выбирается свободный)
+        """
+        self.key_type = key_type
+        self.ciphers = ciphers if ciphers is not None else (GOST_SERVER_CIPHERS if key_type == 'gost' else None)
+        self.tls1_2 = tls1_2
+        self.port = port or free_port()
+        self.host = 'localhost'
+        self._tmpdir = None
+        self._process = None
+    
+    @property
+    def url(self) -> str:
+        return f'https://{self.host}:{self.port}/'
+    
+    def start(self) -> 'OpenSSLServer':
+        """Запускает сервер и ждет, пока он начнет принимать соединения"""
+        self._tmpdir = tempfile.TemporaryDirectory()
+        cert, key = generate_certificate(self._tmpdir.name, self.key_type)
+        
+        self._process = subprocess.Popen(self._command(cert, key), stdin=subprocess.DEVNULL,
+                                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise RuntimeError(f'{self.name} завершился с кодом {self._process.returncode}')
+            try:
+                socket.create_connection(('127.0.0.1', self.port), timeout=0.5).close()
+                return self
+            except OSError:
+                time.sleep(0.05)
+        self.stop()
+        raise RuntimeError(f'{self.name} не начал принимать соединения')
+    
+    def _command(self, cert: str, key: str) -> List[str]:
+        """Команда запуска сервера"""
+        cmd = ['openssl', 's_server', '-accept', str(self.port), '-cert', cert, '-key', key, '-www', '-quiet']
+        if self.ciphers:
+            cmd.extend(['-cipher', self.ciphers])
+        if self.tls1_2:
+            cmd.append('-tls1_2')
+        return cmd
+    
+    def stop(self) -> None:
+        """Останавливает сервер и удаляет временные файлы"""
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+            self._process = None
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+            self._tmpdir = None
+    
+    def __enter__(self) -> 'OpenSSLServer':
+        return self.start()
+    
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+
+class ThreadedTLSServer(OpenSSLServer):
+    """
+    Многопоточный HTTPS сервер на pyOpenSSL с keep-alive
+    
+    Работает в отдельном процессе (этот же скрипт с --serve), чтобы не делить
+    GIL с клиентом. Каждое соединение обслуживается своим потоком; на любой
+    запрос сервер отвечает 200 с телом из ``body_size`` байт, на запрос пути
+    ``/<число>`` - телом из указанного числа байт. С ``compress=True`` тело -
+    XML документ, сжатый gzip, deflate или br по Accept-Encoding запроса.
+    
+    Example:
+        >>> with ThreadedTLSServer(key_type='gost') as server:
+        ...     print(server.url)
+    """
+    
+    name = 'ThreadedTLSServer'
+    
+    def __init__(self, key_type: str = 'gost', ciphers: Optional[str] = None,
+                 tls1_2: bool = True, port: Optional[int] = None, body_size: int = 1024,
+                 extra_key_type: Optional[str] = None, compress: bool = False):
+        """
+        Args:
+            key_type: Тип ключа сервера: 'gost' или 'rsa'
+            ciphers: Cipher suites сервера (по умолчанию только GOST для key_type='gost')
+            tls1_2: Ограничить сервер TLS 1.2
+            port: Порт (по умолчанию выбирается свободный)
+            body_size: Размер тела ответа в байтах
+            extra_key_type: Тип ключа второго сертификата (например, 'rsa' для
+                смешанного сайта с GOST ключом)
+            compress: Отдавать XML документ, сжатый по Accept-Encoding
+        """
+        super().__init__(key_type, ciphers, tls1_2, port)
+        self.body_size = body_size
+        self.extra_key_type = extra_key_type
+        self.compress = compress
+    
+    def _command(self, cert: str, key: str) -> List[str]:
+        cmd = [sys.executable, os.path.abspath(__file__), '--serve', '--port', str(self.port),
+               '--cert', cert, '--key', key, '--body-size', str(self.body_size)]
+        if self.extra_key_type:
+            directory = os.path.join(self._tmpdir.name, self.extra_key_type)
+            os.mkdir(directory)
+            extra_cert, extra_key = generate_certificate(directory, self.extra_key_type)
+            cmd.extend(['--extra-cert', extra_cert, '--extra-key', extra_key])
+        if self.ciphers:
+            cmd.extend(['--ciphers', self.ciphers])
+        if self.tls1_2:
+            cmd.append('--tls1_2')
+        if 'gost' in (self.key_type, self.extra_key_type):
+            cmd.append('--gost')
+        if self.compress:
+            cmd.append('--compress')
+        return cmd
+
+
+def xml_document(size: int) -> bytes:
+    """XML документ размером ``size`` байт, похожий на выгрузки порталов"""
+    records = []
+    length = 0
+    index = 0
+    while length < size:
+        record = (f'<record id="{index}"><inn>77{index * 7919 % 100000000:08d}</inn>'
+                  f'<name>Организация {index}</name><status>{("active", "closed")[index % 3 == 0]}</status>'
+                  f'<amount>{index * 104729 % 1000000}.{index % 100:02d}</amount></record>\n').encode('utf-8')
+        records.append(record)
+        length += len(record)
+        index += 1
+    return b''.join(records)[:size]
+
+
+def compress_body(body: bytes, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+    """Сжимает тело лучшим из поддерживаемых клиентом способов"""
+    accepted = {value.split(';')[0].strip() for value in accept_encoding.lower().split(',')}
+    if 'br' in accepted:
+        try:
+            import brotli
+            return brotli.compress(body, quality=5), 'br'
+        except ImportError:
+            pass
+    if 'gzip' in accepted:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress(body) + compressor.flush(), 'gzip'
+    if 'deflate' in accepted:
+        return zlib.compress(body, 6), 'deflate'
+    return body, None
+
+
+def _read_request(conn, buffer: bytes) -> Tuple[Optional[bytes], bytes]:
+    """
+    Читает один HTTP запрос из SSL соединения
+    
+    Returns:
+        Кортеж (заголовки запроса или None при закрытии соединения, остаток буфера)
+    """
+    from OpenSSL import SSL
+    
+    while b'\r\n\r\n' not in buffer:
+        try:
+            chunk = conn.recv(65536)
+        except (SSL.ZeroReturnError, SSL.SysCallError, SSL.Error):
+            return None, b''
+        if not chunk:
+            return None, b''
+        buffer += chunk
+    head, _, buffer = buffer.partition(b'\r\n\r\n')
+    
+    # Тело запроса (Content-Length) пропускается
+    length = 0
+    for line in head.split(b'\r\n')[1:]:
+        name, _, value = line.partition(b':')
+        if name.strip().lower() == b'content-length':
+            length = int(value.strip() or 0)
+    while len(buffer) < length:
+        try:
+            chunk = conn.recv(65536)
+        except (SSL.ZeroReturnError, SSL.SysCallError, SSL.Error):
+            return None, b''
+        if not chunk:
+            return None, b''
+        buffer += chunk
+    return head, buffer[length:]
+
+
+def serve(port: int, cert: str, key: str, ciphers: Optional[str], tls1_2: bool,
+          body_size: int, gost: bool, extra_cert: Optional[str] = None, extra_key: Optional[str] = None,
+          compress: bool = False) -> None:
+    """Запускает многопоточный HTTPS сервер (режим --serve)"""
+    from OpenSSL import SSL
+    
+    if gost:
+        from gost_http.gost_http_client import load_gost_engine
+        load_gost_engine()
+    
+    ctx = SSL.Context(SSL.TLS_SERVER_METHOD)
+    if tls1_2:
+        ctx.set_max_proto_version(SSL.TLS1_2_VERSION)
+    if ciphers:
+        ctx.set_cipher_list(ciphers.encode('ascii'))
+    ctx.use_certificate_file(cert)
+    ctx.use_privatekey_file(key)
+    if extra_cert:
+        # OpenSSL хранит сертификаты разных типов ключей в отдельных слотах
+        ctx.use_certificate_file(extra_cert)
+        ctx.use_privatekey_file(extra_key)
+    
+    # Готовые ответы по размеру тела и Accept-Encoding
+    responses = {}
+    
+    def response_for(head: bytes) -> bytes:
+        parts = head.split(b' ', 2)
+        path = parts[1] if len(parts) > 1 else b'/'
+        size = int(path[1:]) if path[1:].isdigit() else body_size
+        accept_encoding = ''
+        if compress:
+            for line in head.split(b'\r\n')[1:]:
+                name, _, value = line.partition(b':')
+                if name.strip().lower() == b'accept-encoding':
+                    accept_encoding = value.strip().decode('latin-1')
+        response = responses.get((size, accept_encoding))
+        if response is None:
+            if compress:
+                body, encoding = compress_body(xml_document(size), accept_encoding)
+                headers = b'Content-Type: application/xml\r\n'
+                if encoding:
+                    headers += b'Content-Encoding: ' + encoding.encode('ascii') + b'\r\n'
+            else:
+                body, headers = b'x' * size, b'Content-Type: text/plain\r\n'
+            response = responses[(size, accept_encoding)] = (
+                b'HTTP/1.1 200 OK\r\n' + headers + b'Content-Length: ' + str(len(body)).encode('ascii')
+                + b'\r\n\r\n' + body)
+        return response
+    
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self):
+            conn = SSL.Connection(ctx, self.request)
+            conn.set_accept_state()
+            try:
+                conn.do_handshake()
+                buffer = b''
+                while True:
+                    head, buffer = _read_request(conn, buffer)
+                    if head is None:
+                        break
+                    conn.sendall(response_for(head))
+                    if b'connection: close' in head.lower():
+                        break
+                conn.shutdown()
+            except SSL.Error:
+                pass
+            finally:
+                conn.close()
+    
+    class Server(socketserver.ThreadingTCPServer):
+        daemon_threads = True
+        allow_reuse_address = True
+        request_queue_size = 1024
+    
+    with Server(('127.0.0.1', port), Handler) as server:
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Многопоточный HTTPS сервер для бенчмарков')
+    parser.add_argument('--serve', action='store_true', required=True)
+    parser.add_argument('--port', type=int, required=True)
+    parser.add_argument('--cert', required=True)
+    parser.add_argument('--key', required=True)
+    parser.add_argument('--ciphers', default=None)
+    parser.add_argument('--tls1_2', action='store_true')
+    parser.add_argument('--body-size', type=int, default=1024)
+    parser.add_argument('--gost', action='store_true')
+    parser.add_argument('--extra-cert', default=None)
+    parser.add_argument('--extra-key', default=None)
+    parser.add_argument('--compress', action='store_true')
+    args = parser.parse_args()
+    serve(args.port, args.cert, args.key, args.ciphers, args.tls1_2, args.body_size, args.gost,
+          args.extra_cert, args.extra_key, args.compress)
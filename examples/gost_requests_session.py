@@ -16,15 +16,16 @@ def main():
     # Создаем сессию
     session = gost_session(verify=False, timeout=10)
     
-    # Множественные запросы через одну сессию
+    # Множественные запросы через одну сессию: выполняются параллельно,
+    # ответы возвращаются в порядке списка
     sites = [
         'https://dss.uc-em.ru/',
         'https://cryptopro.ru/'
     ]
     
-    for i, url in enumerate(sites, 1):
+    responses = session.map(sites, max_workers=4, per_host=2)
+    for i, (url, response) in enumerate(zip(sites, responses), 1):
         print(f"{i}. Запрос к {url}...")
-        response = session.get(url)
         if response:
             print(f"   ✓ Успешно! Status: {response.status_code}")
             print(f"   Размер ответа: {len(response.text)} символов")
@@ -6,31 +6,58 @@ GOST HTTP Client - Python wrapper библиотека для работы с GO
 - Использует pyOpenSSL для сайтов только с GOST cipher suites
 - Использует стандартный requests для смешанных сайтов
 - Fallback на subprocess с curl при необходимости
+
+Для asyncio приложений есть AsyncGOSTHTTPClient с тем же интерфейсом.
+
+Модули загружаются при первом обращении к имени (PEP 562), поэтому
+``import gost_http`` не импортирует requests и pyOpenSSL.
 """
 
+import importlib
 import os
+from typing import TYPE_CHECKING
 
-from .gost_http_client import (
-    GOSTHTTPClient,
-    gost_get,
-    gost_post,
-    gost_put,
-    gost_delete,
-    gost_patch,
-    gost_head,
-    gost_options,
-    gost_session
-)
-
-# Импортируем requests_gost для удобного использования
-from . import requests_gost
+if TYPE_CHECKING:
+    from .gost_http_client import (
+        GOSTHTTPClient,
+        gost_get,
+        gost_post,
+        gost_put,
+        gost_delete,
+        gost_patch,
+        gost_head,
+        gost_options,
+        gost_session,
+        get_default_client,
+        configure_default_client
+    )
+    from .async_client import AsyncGOSTHTTPClient
+    from . import requests_gost
 
 # Версия библиотеки может быть установлена через переменную окружения GOST_HTTP_VERSION
 # (например, через ARG в Dockerfile для CI/CD)
 __version__ = os.environ.get('GOST_HTTP_VERSION', '0.1.0')
 
+# Имя -> модуль пакета, из которого оно загружается при первом обращении
+_LAZY_ATTRIBUTES = {
+    'GOSTHTTPClient': 'gost_http_client',
+    'gost_get': 'gost_http_client',
+    'gost_post': 'gost_http_client',
+    'gost_put': 'gost_http_client',
+    'gost_delete': 'gost_http_client',
+    'gost_patch': 'gost_http_client',
+    'gost_head': 'gost_http_client',
+    'gost_options': 'gost_http_client',
+    'gost_session': 'gost_http_client',
+    'get_default_client': 'gost_http_client',
+    'configure_default_client': 'gost_http_client',
+    'AsyncGOSTHTTPClient': 'async_client',
+    'requests_gost': 'requests_gost',
+}
+
 __all__ = [
     'GOSTHTTPClient',
+    'AsyncGOSTHTTPClient',
     'gost_get',
     'gost_post',
     'gost_put',
@@ -39,6 +66,22 @@ __all__ = [
     'gost_head',
     'gost_options',
     'gost_session',
+    'get_default_client',
+    'configure_default_client',
     'requests_gost'
 ]
 
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    module = importlib.import_module(f'.{module_name}', __name__)
+    value = module if name == module_name else getattr(module, name)
+    # Следующие обращения не проходят через __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,301 @@
+"""
+Командная строка gost_http
+
+Нагрузочный генератор для GOST сайтов (wrk, hey и ab не поддерживают GOST TLS):
+
+    python -m gost_http bench https://dss.uc-em.ru/ -c 10 -n 1000
+    python -m gost_http bench https://example.ru/api -c 4 -n 200 --method POST --data '{"a": 1}'
+    python -m gost_http bench https://example.ru/ --tier pyopenssl --async
+
+Запросы выполняет GOSTHTTPClient из ``-c`` потоков (или AsyncGOSTHTTPClient из
+``-c`` задач asyncio с ``--async``). В конце выводится пропускная способность,
+гистограмма задержки, количество TLS handshake, распределение по уровням и
+статусам и ошибки (``--json`` - те же данные в JSON).
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+import warnings
+from typing import Any, Dict, List, Optional
+
+from .gost_http_client import GOSTHTTPClient, tls_session_cache, TIERS, TIER_SESSION, TIER_CURL
+
+# Количество корзин гистограммы задержки
+HISTOGRAM_BUCKETS = 10
+
+
+class BenchResult:
+    """Результаты нагрузочного прогона"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.statuses: Dict[int, int] = {}
+        self.tiers: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.bytes = 0
+        self.elapsed = 0.0
+        self.handshakes = {'full': 0, 'resumed': 0}
+        self.new_connections = 0
+        self._lock = threading.Lock()
+
+    def add(self, latency: float, response, error: Optional[str] = None) -> None:
+        """Учитывает завершенный запрос (response=None - запрос не выполнен)"""
+        with self._lock:
+            if response is None:
+                error = error or 'нет ответа ни от одного уровня'
+                self.errors[error] = self.errors.get(error, 0) + 1
+                return
+            self.latencies.append(latency)
+            self.statuses[response.status_code] = self.statuses.get(response.status_code, 0) + 1
+            # GOSTResponse знает уровень сам, у requests.Response он есть только в замерах
+            timing = getattr(response, 'timing', None)
+            tier = getattr(response, 'tier', None) or (timing.tier if timing is not None else None) or 'unknown'
+            self.tiers[tier] = self.tiers.get(tier, 0) + 1
+            self.bytes += len(response.content)
+            if timing is not None and timing.connection_reused is False:
+                self.new_connections += 1
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies) + sum(self.errors.values())
+
+    def percentile(self, p: float) -> float:
+        values = sorted(self.latencies)
+        return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+    def histogram(self, buckets: int = HISTOGRAM_BUCKETS) -> List[List[float]]:
+        """Гистограмма задержки: пары [верхняя граница, количество] с равным шагом"""
+        if not self.latencies:
+            return []
+        low, high = min(self.latencies), max(self.latencies)
+        step = (high - low) / buckets or 1.0
+        counts = [0] * buckets
+        for value in self.latencies:
+            counts[min(buckets - 1, int((value - low) / step))] += 1
+        return [[low + step * (index + 1), count] for index, count in enumerate(counts)]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Результаты в JSON-совместимом виде (времена в миллисекундах)"""
+        completed = len(self.latencies)
+        return {
+            'requests': self.requests,
+            'completed': completed,
+            'elapsed': self.elapsed,
+            'rps': completed / self.elapsed if self.elapsed else 0.0,
+            'bytes': self.bytes,
+            'latency_ms': {
+                'min': min(self.latencies, default=0.0) * 1000,
+                'mean': sum(self.latencies) / completed * 1000 if completed else 0.0,
+                'p50': self.percentile(0.5) * 1000,
+                'p90': self.percentile(0.9) * 1000,
+                'p99': self.percentile(0.99) * 1000,
+                'max': max(self.latencies, default=0.0) * 1000,
+            },
+            'histogram_ms': [[bound * 1000, count] for bound, count in self.histogram()],
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items())},
+            'tiers': dict(self.tiers),
+            'handshakes': dict(self.handshakes),
+            'new_connections': self.new_connections,
+            'errors': dict(self.errors),
+        }
+
+
+def _last_error(response, timing) -> Optional[str]:
+    """Ошибка последнего уровня из замеров неудачного запроса"""
+    if response is None and timing is not None and timing.failed_tiers:
+        failure = timing.failed_tiers[-1]
+        return f"{failure['tier']}: {failure['error'] or 'нет ответа'}"
+    return None
+
+
+def run_sync(url: str, concurrency: int, requests: int, method: str = 'GET',
+             kwargs: Optional[Dict[str, Any]] = None, tier: Optional[str] = None,
+             timeout: float = 10) -> BenchResult:
+    """Выполняет ``requests`` запросов из ``concurrency`` потоков через GOSTHTTPClient"""
+    result = BenchResult()
+    kwargs = kwargs or {}
+    local = threading.local()
+
+    def sink(timing):
+        local.timing = timing
+
+    # --tier: цепочка уровней из одного указанного уровня
+    client = GOSTHTTPClient(timeout=timeout, pool_maxsize=concurrency, metrics_sink=sink,
+                            tiers=[tier] if tier else None)
+    remaining = [requests]
+    lock = threading.Lock()
+    before = tls_session_cache.stats()
+
+    def worker():
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            local.timing = None
+            started = time.perf_counter()
+            try:
+                response = client._request(method, url, **kwargs)
+                error = _last_error(response, local.timing)
+            except Exception as e:
+                response, error = None, f'{type(e).__name__}: {e}'
+            result.add(time.perf_counter() - started, response, error)
+
+    with client:
+        started = time.perf_counter()
+        workers = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        result.elapsed = time.perf_counter() - started
+    _count_handshakes(result, before)
+    return result
+
+
+def run_async(url: str, concurrency: int, requests: int, method: str = 'GET',
+              kwargs: Optional[Dict[str, Any]] = None, tier: Optional[str] = None,
+              timeout: float = 10) -> BenchResult:
+    """Выполняет ``requests`` запросов из ``concurrency`` задач через AsyncGOSTHTTPClient"""
+    from .async_client import AsyncGOSTHTTPClient
+
+    result = BenchResult()
+    kwargs = kwargs or {}
+    before = tls_session_cache.stats()
+
+    async def main():
+        client = AsyncGOSTHTTPClient(timeout=timeout, pool_maxsize=concurrency,
+                                     tiers=[tier] if tier else None)
+        remaining = [requests]
+
+        async def worker():
+            while remaining[0] > 0:
+                remaining[0] -= 1
+                started = time.perf_counter()
+                try:
+                    response = await client._request(method, url, **kwargs)
+                    error = None
+                except Exception as e:
+                    response, error = None, f'{type(e).__name__}: {e}'
+                result.add(time.perf_counter() - started, response, error)
+
+        async with client:
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            result.elapsed = time.perf_counter() - started
+
+    asyncio.run(main())
+    _count_handshakes(result, before)
+    return result
+
+
+def _count_handshakes(result: BenchResult, before: Dict[str, Any]) -> None:
+    """Handshake за прогон по статистике кеша TLS сессий (уровни session и pyopenssl)"""
+    after = tls_session_cache.stats()
+    result.handshakes = {
+        'full': after['full'] - before['full'],
+        'resumed': after['resumed'] - before['resumed'],
+    }
+
+
+def format_report(result: BenchResult) -> str:
+    """Текстовый отчет о прогоне"""
+    data = result.as_dict()
+    latency = data['latency_ms']
+    lines = [
+        'Итого:',
+        f"  Запросов:     {data['requests']} (выполнено {data['completed']}, "
+        f"ошибок {data['requests'] - data['completed']})",
+        f"  Время:        {data['elapsed']:.2f} с",
+        f"  Запросов/с:   {data['rps']:.1f}",
+        f"  Получено:     {data['bytes'] / 1024 / 1024:.2f} МБ "
+        f"({data['bytes'] / 1024 / 1024 / data['elapsed'] if data['elapsed'] else 0:.2f} МБ/с)",
+        '',
+        f"Задержка, мс: мин {latency['min']:.2f}, среднее {latency['mean']:.2f}, p50 {latency['p50']:.2f}, "
+        f"p90 {latency['p90']:.2f}, p99 {latency['p99']:.2f}, макс {latency['max']:.2f}",
+    ]
+    histogram = data['histogram_ms']
+    if histogram:
+        lines.append('')
+        lines.append('Гистограмма задержки, мс:')
+        peak = max(count for _, count in histogram) or 1
+        for bound, count in histogram:
+            lines.append(f"  {bound:>10.2f} [{count:>6}] {'■' * round(count / peak * 40)}")
+    lines.append('')
+    lines.append('Статусы: ' + (', '.join(f'{status}: {count}' for status, count in data['statuses'].items()) or '-'))
+    lines.append('Уровни: ' + (', '.join(f'{tier}: {count}' for tier, count in data['tiers'].items()) or '-'))
+    handshakes = data['handshakes']
+    lines.append(f"TLS handshake: полных {handshakes['full']}, возобновленных {handshakes['resumed']}"
+                 + (f", новых соединений {data['new_connections']}" if data['new_connections'] else ''))
+    if data['tiers'].get(TIER_CURL):
+        lines.append(f"  (без учета curl: отдельный handshake на каждый из {data['tiers'][TIER_CURL]} запросов)")
+    if data['errors']:
+        lines.append('')
+        lines.append('Ошибки:')
+        for error, count in sorted(data['errors'].items(), key=lambda item: -item[1]):
+            lines.append(f'  [{count}] {error}')
+    return '\n'.join(lines)
+
+
+def _request_kwargs(args) -> Dict[str, Any]:
+    """Заголовки и тело запроса из аргументов командной строки"""
+    kwargs: Dict[str, Any] = {}
+    headers = {}
+    for header in args.header or ():
+        name, _, value = header.partition(':')
+        headers[name.strip()] = value.strip()
+    if headers:
+        kwargs['headers'] = headers
+    if args.data is not None:
+        # Как в curl: @путь - тело из файла
+        if args.data.startswith('@'):
+            with open(args.data[1:], 'rb') as f:
+                kwargs['data'] = f.read()
+        else:
+            kwargs['data'] = args.data.encode('utf-8')
+    return kwargs
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m gost_http', description='Инструменты gost_http')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    bench = commands.add_parser('bench', help='Нагрузочный тест GOST сайта',
+                                description='Нагрузочный тест GOST сайта через GOSTHTTPClient')
+    bench.add_argument('url', help='URL запроса')
+    bench.add_argument('-c', '--concurrency', type=int, default=10, help='Количество одновременных запросов')
+    bench.add_argument('-n', '--requests', type=int, default=200, help='Общее количество запросов')
+    bench.add_argument('-m', '--method', default='GET', help='HTTP метод')
+    bench.add_argument('-d', '--data', help='Тело запроса (@путь - из файла)')
+    bench.add_argument('-H', '--header', action='append', help='Заголовок "Имя: значение" (можно несколько)')
+    bench.add_argument('--tier', choices=TIERS, help='Выполнять запросы только через указанный уровень')
+    bench.add_argument('--timeout', type=float, default=10, help='Таймаут запроса в секундах')
+    bench.add_argument('--async', dest='use_async', action='store_true',
+                       help='Использовать AsyncGOSTHTTPClient (уровни pyopenssl и curl)')
+    bench.add_argument('--json', action='store_true', help='Вывести результаты в JSON')
+    args = parser.parse_args(argv)
+
+    if args.concurrency < 1 or args.requests < 1:
+        parser.error('-c и -n должны быть положительными')
+    if args.use_async and args.tier == TIER_SESSION:
+        parser.error('у AsyncGOSTHTTPClient нет уровня session')
+
+    # verify=False по умолчанию: предупреждение urllib3 на каждый запрос
+    warnings.filterwarnings('ignore', message='Unverified HTTPS request')
+    run = run_async if args.use_async else run_sync
+    result = run(args.url, args.concurrency, args.requests, args.method.upper(),
+                 _request_kwargs(args), args.tier, args.timeout)
+
+    if args.json:
+        print(json.dumps(result.as_dict(), indent=2, ensure_ascii=False))
+    else:
+        print(format_report(result))
+    return 0 if result.latencies else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,704 @@
+"""
+async_client - асинхронный GOST HTTP клиент на asyncio
+
+AsyncGOSTHTTPClient повторяет интерфейс GOSTHTTPClient (get/post/put/...),
+но не занимает поток на каждый запрос:
+- TLS выполняется pyOpenSSL через memory BIO поверх asyncio streams, поэтому
+  работает и для сайтов только с GOST cipher suites;
+- соединения держатся открытыми (keep-alive) в асинхронном пуле по (host, port);
+- ответы разбираются тем же парсером HTTP/1.1, что и в прямом уровне
+  синхронного клиента;
+- fallback - curl через asyncio.create_subprocess_exec.
+
+Пример:
+    async with AsyncGOSTHTTPClient() as client:
+        responses = await asyncio.gather(*(client.get(url) for url in urls))
+"""
+
+import asyncio
+import io
+import os
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlparse
+
+from .gost_http_client import (
+    PYOPENSSL_AVAILABLE,
+    SSL,
+    TIER_CURL,
+    TIER_PYOPENSSL,
+    TierRoutingCache,
+    get_ssl_context,
+    load_gost_engine,
+    tls_session_cache,
+    _read_curl_head,
+    _remember_tls_session,
+    _request_target,
+    _response_headers,
+    _session_reused,
+    _total_timeout,
+)
+from .http11 import HTTP11ResponseParser, HTTPParseError, NEED_DATA, END_OF_MESSAGE, ResponseHead
+from .response import GOSTResponse
+from .body import body_length, body_rewinder, is_stream_body, iter_body
+from .transport import IDEMPOTENT_METHODS, RECV_BUFFER_SIZE, DirectResponse, build_request, encode_body
+
+# Методы, для которых тело запроса отправляется всегда (хотя бы пустое)
+BODY_METHODS = ('POST', 'PUT', 'PATCH')
+
+
+async def _aiter_body(body: Any) -> AsyncIterator[Any]:
+    """
+    Итерирует тело фрагментами (см. iter_body), не блокируя event loop
+
+    Файлы и итераторы вызывающего могут блокироваться при чтении, поэтому
+    очередной фрагмент читается в пуле потоков loop.
+    """
+    chunks = iter_body(body)
+    if not is_stream_body(body):
+        for chunk in chunks:
+            yield chunk
+        return
+    loop = asyncio.get_running_loop()
+    while True:
+        chunk = await loop.run_in_executor(None, next, chunks, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+class AsyncTLSConnection:
+    """
+    TLS соединение поверх asyncio streams
+
+    SSL.Connection создается без сокета (memory BIO): зашифрованные данные из
+    StreamReader передаются в bio_write(), исходящие забираются через
+    bio_read() и записываются в StreamWriter. Поэтому pyOpenSSL никогда не
+    блокирует event loop.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 ssl_conn, host: str, port: int):
+        """
+        Args:
+            reader: StreamReader TCP соединения
+            writer: StreamWriter TCP соединения
+            ssl_conn: SSL.Connection в режиме memory BIO
+            host: Имя хоста
+            port: Порт
+        """
+        self.reader = reader
+        self.writer = writer
+        self.ssl_conn = ssl_conn
+        self.host = host
+        self.port = port
+        self.created = time.monotonic()
+        self.last_used = self.created
+        self.requests = 0
+        self.closed = False
+        self._eof = False
+
+    @classmethod
+    async def open(cls, host: str, port: int, ctx) -> 'AsyncTLSConnection':
+        """
+        Устанавливает TCP соединение и выполняет TLS handshake
+
+        Args:
+            host: Имя хоста
+            port: Порт
+            ctx: SSL.Context (например, get_ssl_context()._ctx)
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        ssl_conn = SSL.Connection(ctx, None)
+        ssl_conn.set_tlsext_host_name(host.encode())
+        conn = cls(reader, writer, ssl_conn, host, port)
+        try:
+            await conn._handshake(ctx)
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    async def _handshake(self, ctx) -> None:
+        """Выполняет клиентский handshake, предлагая серверу сохраненную TLS сессию"""
+        session = tls_session_cache.get(ctx, self.host, self.port)
+        if session is not None:
+            try:
+                self.ssl_conn.set_session(session)
+            except Exception:
+                tls_session_cache.invalidate(ctx, self.host, self.port)
+
+        self.ssl_conn.set_connect_state()
+        while True:
+            try:
+                self.ssl_conn.do_handshake()
+            except SSL.WantReadError:
+                await self._flush()
+                if not await self._fill():
+                    raise ConnectionError(f'{self.host}:{self.port} закрыл соединение во время TLS handshake')
+                continue
+            except SSL.Error:
+                tls_session_cache.invalidate(ctx, self.host, self.port)
+                raise
+            break
+        await self._flush()
+
+        tls_session_cache.record_handshake(_session_reused(self.ssl_conn))
+        tls_session_cache.put(ctx, self.host, self.port, self.ssl_conn.get_session())
+
+    def _outgoing(self) -> bytes:
+        """Забирает из memory BIO все зашифрованные данные для отправки"""
+        chunks = []
+        while True:
+            try:
+                chunks.append(self.ssl_conn.bio_read(RECV_BUFFER_SIZE))
+            except SSL.WantReadError:
+                return b''.join(chunks)
+
+    async def _flush(self) -> None:
+        data = self._outgoing()
+        if data:
+            self.writer.write(data)
+            await self.writer.drain()
+
+    async def _fill(self) -> bool:
+        """Передает в memory BIO очередную порцию данных из сокета; False - сервер закрыл TCP"""
+        data = await self.reader.read(RECV_BUFFER_SIZE)
+        if not data:
+            self._eof = True
+            self.ssl_conn.bio_shutdown()
+            return False
+        self.ssl_conn.bio_write(data)
+        return True
+
+    async def sendall(self, data) -> None:
+        """Шифрует и отправляет все данные"""
+        view = memoryview(data)
+        while view:
+            sent = self.ssl_conn.send(view)
+            view = view[sent:]
+            await self._flush()
+
+    async def receive(self, parser: HTTP11ResponseParser) -> None:
+        """Читает очередную порцию расшифрованных данных и передает ее парсеру"""
+        while True:
+            try:
+                data = self.ssl_conn.recv(RECV_BUFFER_SIZE)
+            except SSL.WantReadError:
+                if self._eof:
+                    parser.feed_eof()
+                    return
+                # Ответные TLS записи (например, на KeyUpdate) отправляем до ожидания данных
+                await self._flush()
+                await self._fill()
+                continue
+            except SSL.ZeroReturnError:
+                parser.feed_eof()
+                return
+            except SSL.SysCallError as e:
+                # (-1, 'Unexpected EOF') - сервер закрыл TCP без close_notify
+                if e.args and e.args[0] in (-1, 0):
+                    parser.feed_eof()
+                    return
+                raise
+            parser.feed(data)
+            return
+
+    def is_dropped(self) -> bool:
+        """Проверяет, закрыл ли сервер простаивающее соединение"""
+        return self.closed or self._eof or self.reader.at_eof() or self.writer.is_closing()
+
+    def close(self) -> None:
+        """Закрывает соединение, отправляя close_notify"""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.ssl_conn.shutdown()
+            data = self._outgoing()
+            if data:
+                self.writer.write(data)
+        except Exception:
+            pass
+        # Транспорт отправит буферизованные данные перед закрытием сокета
+        self.writer.close()
+
+
+class AsyncTLSPool:
+    """
+    Асинхронный пул постоянных TLS соединений по (host, port)
+
+    Соединения создаются корутиной connect(host, port). После полностью
+    прочитанного ответа с keep-alive соединение возвращается в пул. Число
+    одновременных запросов к одному хосту можно ограничить limit_per_host.
+    """
+
+    def __init__(self, connect: Callable[[str, int], Awaitable[AsyncTLSConnection]],
+                 maxsize: int = 10, idle_timeout: float = 60.0,
+                 limit_per_host: Optional[int] = None):
+        """
+        Args:
+            connect: Корутина создания TLS соединения
+            maxsize: Максимум простаивающих соединений на хост
+            idle_timeout: Через сколько секунд простоя соединение закрывается
+            limit_per_host: Максимум одновременных запросов к одному хосту (None - без ограничения)
+        """
+        self.connect = connect
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.limit_per_host = limit_per_host
+        self._idle: Dict[Tuple[str, int], deque] = {}
+        self._limits: Dict[Tuple[str, int], asyncio.Semaphore] = {}
+        self.connections_created = 0
+        self.connections_reused = 0
+
+    async def acquire(self, host: str, port: int) -> Tuple[AsyncTLSConnection, bool]:
+        """
+        Берет простаивающее соединение из пула или создает новое
+
+        Returns:
+            Кортеж (соединение, было ли соединение переиспользовано)
+        """
+        idle = self._idle.get((host, port))
+        now = time.monotonic()
+        while idle:
+            conn = idle.pop()
+            if now - conn.last_used > self.idle_timeout or conn.is_dropped():
+                conn.close()
+                continue
+            self.connections_reused += 1
+            return conn, True
+
+        conn = await self.connect(host, port)
+        self.connections_created += 1
+        return conn, False
+
+    def release(self, conn: AsyncTLSConnection) -> None:
+        """Возвращает соединение в пул (или закрывает, если пул хоста заполнен)"""
+        if conn.closed:
+            return
+        conn.last_used = time.monotonic()
+        idle = self._idle.setdefault((conn.host, conn.port), deque())
+        if len(idle) < self.maxsize:
+            idle.append(conn)
+        else:
+            conn.close()
+
+    def close(self) -> None:
+        """Закрывает все простаивающие соединения"""
+        connections = [conn for idle in self._idle.values() for conn in idle]
+        self._idle.clear()
+        for conn in connections:
+            conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает количество созданных, переиспользованных и простаивающих соединений"""
+        return {
+            'created': self.connections_created,
+            'reused': self.connections_reused,
+            'idle': sum(len(idle) for idle in self._idle.values()),
+        }
+
+    async def request(self, method: str, host: str, port: int, target: str,
+                      headers: Optional[Iterable[Tuple[str, str]]] = None,
+                      body: Any = None, timeout: float = 10) -> DirectResponse:
+        """
+        Выполняет HTTP/1.1 запрос через пул соединений
+
+        Если переиспользованное соединение оказалось закрытым сервером до
+        получения первого байта ответа, идемпотентный запрос повторяется на
+        новом соединении (если тело можно отправить повторно, см. body_rewinder).
+
+        Args:
+            method: HTTP метод
+            host: Имя хоста
+            port: Порт
+            target: Путь с query string
+            headers: Заголовки запроса
+            body: Тело запроса: bytes, буфер, файловый объект или итератор
+                (см. модуль body); потоковое тело отправляется фрагментами по
+                мере чтения, без длины - chunked
+            timeout: Таймаут всего обмена в секундах (ожидание limit_per_host не учитывается)
+
+        Returns:
+            DirectResponse с прочитанным телом
+
+        Raises:
+            asyncio.TimeoutError: если обмен не уложился в таймаут
+            OSError, SSL.Error, HTTPParseError: при ошибке подключения или обмена
+        """
+        method = method.upper()
+        headers = list(headers or ())
+        length = body_length(body) if body is not None else None
+        chunked = body is not None and length is None
+        names = {name.lower() for name, _ in headers}
+        if chunked:
+            headers.append(('Transfer-Encoding', 'chunked'))
+        elif body is not None and 'content-length' not in names:
+            headers.append(('Content-Length', str(length)))
+        request_bytes = build_request(method, host, port, target, headers)
+        if body is not None and not is_stream_body(body):
+            # Тело в памяти уходит одной записью вместе с заголовками
+            request_bytes += bytes(body)
+            body = None
+        exchange = self._exchange(method, host, port, request_bytes, body, chunked)
+
+        if self.limit_per_host is None:
+            return await asyncio.wait_for(exchange, timeout)
+
+        limit = self._limits.get((host, port))
+        if limit is None:
+            limit = self._limits[(host, port)] = asyncio.Semaphore(self.limit_per_host)
+        async with limit:
+            return await asyncio.wait_for(exchange, timeout)
+
+    async def _exchange(self, method: str, host: str, port: int, request_bytes: bytes,
+                        body: Any = None, chunked: bool = False) -> DirectResponse:
+        rewind = body_rewinder(body)
+        while True:
+            conn, reused = await self.acquire(host, port)
+            parser = HTTP11ResponseParser(method)
+            try:
+                await conn.sendall(request_bytes)
+                if body is not None:
+                    await _send_body(conn, body, chunked)
+                head, content = await _read_response(conn, parser)
+            except (OSError, SSL.Error, HTTPParseError):
+                conn.close()
+                if (reused and not parser.received_any and method in IDEMPOTENT_METHODS
+                        and rewind is not None):
+                    # Устаревшее keep-alive соединение - повторяем на новом
+                    rewind()
+                    continue
+                raise
+            except BaseException:
+                # Отмена или таймаут посреди ответа: соединение нельзя переиспользовать
+                conn.close()
+                raise
+
+            conn.requests += 1
+            if conn.requests == 1:
+                # В TLS 1.3 ticket приходит после handshake - сохраняем актуальную сессию
+                _remember_tls_session(conn.ssl_conn, conn.host, conn.port)
+            if parser.keep_alive:
+                self.release(conn)
+            else:
+                conn.close()
+            return DirectResponse(head, content, reused)
+
+
+async def _send_body(conn: AsyncTLSConnection, body: Any, chunked: bool) -> None:
+    """Отправляет потоковое тело фрагментами (при chunked - блоками Transfer-Encoding: chunked)"""
+    async for chunk in _aiter_body(body):
+        if chunked:
+            await conn.sendall(b'%x\r\n' % len(chunk) + bytes(chunk) + b'\r\n')
+        else:
+            await conn.sendall(chunk)
+    if chunked:
+        await conn.sendall(b'0\r\n\r\n')
+
+
+async def _read_response(conn: AsyncTLSConnection,
+                         parser: HTTP11ResponseParser) -> Tuple[ResponseHead, bytes]:
+    """Читает из соединения ответ целиком"""
+    head = None
+    chunks: List[bytes] = []
+    while True:
+        event = parser.next_event()
+        if event is NEED_DATA:
+            await conn.receive(parser)
+        elif event is END_OF_MESSAGE:
+            if head is None:
+                raise HTTPParseError('Ответ завершился без заголовков')
+            return head, b''.join(chunks)
+        elif isinstance(event, ResponseHead):
+            head = event
+        elif event:
+            chunks.append(event)
+
+
+async def _request_via_curl_async(method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                                  body: Any = None,
+                                  timeout: float = 10) -> Optional[Dict[str, Any]]:
+    """
+    Выполняет запрос через curl в отдельном процессе, не блокируя event loop
+
+    Тело запроса передается через stdin: в памяти - --data-binary @-,
+    потоковое - -T - фрагментами по мере чтения (Content-Length, если длина
+    известна, иначе chunked). Заголовки ответа curl выводит в stdout перед
+    телом (-D -).
+
+    Returns:
+        Словарь с 'status_code', 'reason', 'headers' (список пар) и 'content'
+        (bytes) или None при ошибке
+    """
+    cmd = ['curl', '-k', '-L', '-s', '--compressed', '--connect-timeout', str(timeout),
+           '--max-time', str(timeout + 5), '--suppress-connect-headers', '-D', '-']
+    if method == 'HEAD':
+        cmd.extend(['--head', '-o', os.devnull])
+    elif method != 'GET':
+        cmd.extend(['-X', method])
+    for name, value in (headers or {}).items():
+        cmd.extend(['-H', f'{name}: {value}'])
+    if is_stream_body(body):
+        # --data-binary @- сначала читает stdin целиком, -T - отправляет по мере чтения
+        cmd.extend(['-T', '-', '-H', 'Expect:'])
+        if method == 'GET':
+            cmd.extend(['-X', method])
+        length = body_length(body)
+        if length is not None and not any(name.lower() == 'content-length' for name in headers or {}):
+            cmd.extend(['-H', 'Transfer-Encoding:', '-H', f'Content-Length: {length}'])
+    elif body is not None:
+        body = bytes(body)
+        cmd.extend(['--data-binary', '@-'])
+    cmd.append(url)
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE if body is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+    except Exception:
+        return None
+
+    try:
+        stdout = await asyncio.wait_for(_communicate_curl(process, body), timeout + 5)
+    except BaseException as e:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        if isinstance(e, Exception):
+            return None
+        raise
+
+    if process.returncode != 0:
+        return None
+    output = io.BytesIO(stdout)
+    try:
+        status_code, reason, response_headers = _read_curl_head(output)
+    except ConnectionError:
+        return None
+    return {
+        'status_code': status_code,
+        'reason': reason,
+        'headers': response_headers,
+        'content': output.read()
+    }
+
+
+async def _communicate_curl(process: asyncio.subprocess.Process, body: Any) -> bytes:
+    """Передает тело в stdin curl и возвращает его вывод"""
+    if not is_stream_body(body):
+        stdout, _ = await process.communicate(body)
+        return stdout
+
+    async def feed() -> None:
+        # curl может начать выводить ответ до того, как прочитает все тело запроса
+        try:
+            async for chunk in _aiter_body(body):
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            process.stdin.close()
+
+    _, stdout = await asyncio.gather(feed(), process.stdout.read())
+    await process.wait()
+    return stdout
+
+
+class AsyncGOSTHTTPClient:
+    """
+    Асинхронный HTTP клиент для работы с GOST сайтами
+
+    Уровни подключения:
+    1. pyOpenSSL через memory BIO поверх asyncio (HTTPS, keep-alive пул)
+    2. curl через asyncio.create_subprocess_exec (fallback)
+
+    Рабочий уровень для хоста запоминается так же, как в GOSTHTTPClient
+    (см. TierRoutingCache). Методы возвращают GOSTResponse или None при ошибке.
+    """
+
+    def __init__(self, verify: Union[bool, str] = False, timeout: float = 10,
+                 route_ttl: float = 300.0, route_negative_ttl: float = 60.0,
+                 pool_maxsize: int = 10, limit_per_host: Optional[int] = None,
+                 cert: Optional[Union[str, Tuple[str, str]]] = None,
+                 tiers: Optional[Sequence[str]] = None):
+        """
+        Инициализирует клиент
+
+        Args:
+            verify: Проверять ли SSL сертификаты (по умолчанию False); строка - путь к CA bundle
+            timeout: Таймаут запросов в секундах
+            route_ttl: Сколько секунд помнить рабочий уровень для хоста (0 - не кешировать)
+            route_negative_ttl: Сколько секунд не пробовать уровень, завершившийся ошибкой
+            pool_maxsize: Максимум keep-alive соединений в пуле одного хоста
+            limit_per_host: Максимум одновременных запросов к одному хосту (None - без ограничения)
+            cert: Клиентский сертификат: путь к PEM или кортеж (cert, key)
+            tiers: Уровни, которые пробуются для всех запросов, в заданном порядке
+                (например, ['curl']); None - цепочка по схеме URL
+
+        Raises:
+            ValueError: Если в tiers указан неизвестный уровень
+        """
+        if tiers is not None and not set(tiers) <= {TIER_PYOPENSSL, TIER_CURL}:
+            raise ValueError(f'Неизвестные уровни: {sorted(set(tiers) - {TIER_PYOPENSSL, TIER_CURL})}')
+        self.verify = verify
+        self.timeout = timeout
+        self.cert = cert
+        self.tiers = list(tiers) if tiers is not None else None
+        # SSL.Context для pyOpenSSL уровня (создается при первом подключении)
+        self._ctx = None
+        self.routes = TierRoutingCache(route_ttl, route_negative_ttl) if route_ttl else None
+        self.pool = AsyncTLSPool(self._open_connection, maxsize=pool_maxsize,
+                                 limit_per_host=limit_per_host)
+
+    async def close(self) -> None:
+        """Закрывает все соединения в пуле"""
+        self.pool.close()
+        # Даем транспортам завершить закрытие сокетов
+        await asyncio.sleep(0)
+
+    async def __aenter__(self) -> 'AsyncGOSTHTTPClient':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def _open_connection(self, hostname: str, port: int) -> AsyncTLSConnection:
+        """Создает TLS соединение для пула"""
+        if self._ctx is None:
+            # Загрузка engine и CA bundle блокирует: выполняется в пуле потоков loop
+            loop = asyncio.get_running_loop()
+            self._ctx = await loop.run_in_executor(None, self._load_ssl_context)
+        return await AsyncTLSConnection.open(hostname, port, self._ctx)
+
+    def _load_ssl_context(self):
+        """Загружает GOST engine и возвращает SSL.Context клиента"""
+        if not load_gost_engine():
+            raise ConnectionError('GOST engine недоступен')
+        return get_ssl_context(verify=self.verify, client_cert=self.cert)._ctx
+
+    def _tier_chain(self, url: str) -> List[str]:
+        """Возвращает полную цепочку уровней для URL"""
+        if self.tiers is not None:
+            return list(self.tiers)
+        if PYOPENSSL_AVAILABLE and urlparse(url).scheme == 'https':
+            return [TIER_PYOPENSSL, TIER_CURL]
+        return [TIER_CURL]
+
+    async def _request(self, method: str, url: str, **kwargs) -> Optional[GOSTResponse]:
+        """
+        Универсальный метод для выполнения HTTP запросов
+
+        Args:
+            method: HTTP метод (GET, POST, PUT, DELETE, PATCH, HEAD, OPTIONS)
+            url: URL для запроса
+            **kwargs: params, headers, data, json, timeout (как в requests)
+
+        Returns:
+            GOSTResponse или None при ошибке
+        """
+        method = method.upper()
+        chain = self._tier_chain(url)
+
+        parsed = urlparse(url)
+        key = (parsed.hostname or '', parsed.port or (443 if parsed.scheme == 'https' else 80))
+        order = self.routes.plan(key, chain) if self.routes else chain
+
+        headers = dict(kwargs.get('headers') or {})
+        body, content_type = encode_body(kwargs.get('data'), kwargs.get('json'))
+        if body is None and method in BODY_METHODS:
+            body = b''
+        if content_type and not any(name.lower() == 'content-type' for name in headers):
+            headers['Content-Type'] = content_type
+
+        rewind = body_rewinder(body)
+        for index, tier in enumerate(order):
+            if index:
+                if rewind is None:
+                    # Тело-итератор уже прочитано предыдущим уровнем
+                    break
+                rewind()
+            started = time.monotonic()
+            response = await self._request_via_tier(tier, method, url, parsed, headers, body, kwargs)
+            if response is not None:
+                if self.routes:
+                    self.routes.record_success(key, tier)
+                return response
+            if self.routes:
+                self.routes.record_failure(key, tier, time.monotonic() - started)
+
+        return None
+
+    async def _request_via_tier(self, tier: str, method: str, url: str, parsed,
+                                headers: Dict[str, str], body: Any,
+                                kwargs: Dict[str, Any]) -> Optional[GOSTResponse]:
+        """Выполняет запрос через указанный уровень, возвращает None при ошибке"""
+        timeout = _total_timeout(kwargs.get('timeout', self.timeout))
+
+        if tier == TIER_PYOPENSSL:
+            request_headers = list(headers.items())
+            try:
+                result = await self.pool.request(
+                    method, parsed.hostname, parsed.port or 443,
+                    _request_target(parsed, kwargs.get('params')),
+                    request_headers, body, timeout
+                )
+            except Exception:
+                return None
+            return GOSTResponse(
+                result.status_code,
+                _response_headers(result.headers),
+                content=result.content,
+                url=url,
+                reason=result.reason,
+                tier=TIER_PYOPENSSL
+            )
+
+        if tier == TIER_CURL:
+            if kwargs.get('params'):
+                url = f"{parsed.scheme}://{parsed.netloc}{_request_target(parsed, kwargs['params'])}"
+            result = await _request_via_curl_async(method, url, headers, body, timeout)
+            if result:
+                return GOSTResponse(
+                    result['status_code'],
+                    _response_headers(result['headers']),
+                    content=result['content'],
+                    url=url,
+                    reason=result['reason'],
+                    tier=TIER_CURL
+                )
+        return None
+
+    async def get(self, url: str, **kwargs) -> Optional[GOSTResponse]:
+        """Выполняет GET запрос"""
+        return await self._request('GET', url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> Optional[GOSTResponse]:
+        """Выполняет POST запрос"""
+        return await self._request('POST', url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> Optional[GOSTResponse]:
+        """Выполняет PUT запрос"""
+        return await self._request('PUT', url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> Optional[GOSTResponse]:
+        """Выполняет DELETE запрос"""
+        return await self._request('DELETE', url, **kwargs)
+
+    async def patch(self, url: str, **kwargs) -> Optional[GOSTResponse]:
+        """Выполняет PATCH запрос"""
+        return await self._request('PATCH', url, **kwargs)
+
+    async def head(self, url: str, **kwargs) -> Optional[GOSTResponse]:
+        """Выполняет HEAD запрос"""
+        return await self._request('HEAD', url, **kwargs)
+
+    async def options(self, url: str, **kwargs) -> Optional[GOSTResponse]:
+        """Выполняет OPTIONS запрос"""
+        return await self._request('OPTIONS', url, **kwargs)
@@ -0,0 +1,141 @@
+"""
+body - потоковые тела запросов для всех уровней
+
+Тело запроса может быть bytes, буфером (bytearray, memoryview, mmap),
+файловым объектом или итератором фрагментов. Буферы отправляются срезами
+memoryview без копирования, файлы и итераторы читаются фрагментами по мере
+отправки, поэтому тело не загружается в память целиком. Если длина тела
+неизвестна (итератор, pipe), HTTP/1.1 использует Transfer-Encoding: chunked.
+"""
+
+import mmap
+import os
+import stat
+from typing import Any, Callable, Iterator, Optional
+
+# Размер фрагмента при чтении тела из файла
+BODY_CHUNK_SIZE = 64 * 1024
+
+# Буферы, которые отправляются срезами memoryview без копирования
+_BUFFER_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+
+
+def is_stream_body(body: Any) -> bool:
+    """Проверяет, читается ли тело по мере отправки (файл или итератор)"""
+    if body is None or isinstance(body, _BUFFER_TYPES + (str, dict, list, tuple)):
+        return False
+    return hasattr(body, 'read') or hasattr(body, '__iter__')
+
+
+def as_buffer(body: Any) -> Any:
+    """Возвращает bytes как есть, остальные буферы - как memoryview байтов"""
+    if isinstance(body, bytes):
+        return body
+    return memoryview(body).cast('B')
+
+
+def body_length(body: Any) -> Optional[int]:
+    """
+    Возвращает длину тела в байтах
+
+    Для файлов - размер от текущей позиции до конца. None - длина заранее
+    неизвестна (итератор, pipe, сокет).
+    """
+    if body is None:
+        return 0
+    if isinstance(body, _BUFFER_TYPES):
+        return memoryview(body).nbytes
+    if hasattr(body, 'read'):
+        try:
+            info = os.fstat(body.fileno())
+            if stat.S_ISREG(info.st_mode):
+                return max(0, info.st_size - body.tell())
+        except (AttributeError, OSError, ValueError):
+            pass
+        try:
+            position = body.tell()
+            end = body.seek(0, os.SEEK_END)
+            body.seek(position)
+            return max(0, end - position)
+        except (AttributeError, OSError, ValueError):
+            return None
+    return None
+
+
+def iter_body(body: Any, chunk_size: int = BODY_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Итерирует тело фрагментами не больше ``chunk_size`` байтов для буферов и файлов
+
+    Фрагменты буферов - срезы memoryview (без копирования); строки кодируются в UTF-8.
+    """
+    if body is None:
+        return
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    if isinstance(body, _BUFFER_TYPES):
+        view = memoryview(body).cast('B')
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size]
+        return
+    if hasattr(body, 'read'):
+        while True:
+            chunk = body.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+    for chunk in body:
+        if chunk:
+            yield chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+
+
+def body_rewinder(body: Any) -> Optional[Callable[[], None]]:
+    """
+    Возвращает функцию, которая готовит тело к повторной отправке
+
+    Буферы отправляются повторно как есть, файл с произвольным доступом
+    возвращается к текущей позиции. None - тело можно прочитать только один
+    раз (итератор, pipe), и запрос нельзя повторить после начала отправки.
+    """
+    if not is_stream_body(body):
+        return lambda: None
+    if not hasattr(body, 'seek'):
+        return None
+    try:
+        if hasattr(body, 'seekable') and not body.seekable():
+            return None
+        position = body.tell()
+    except (AttributeError, OSError, ValueError):
+        return None
+    return lambda: body.seek(position)
+
+
+class BufferReader:
+    """
+    Файловый объект поверх буфера (memoryview, bytearray)
+
+    requests отправляет файловые объекты фрагментами, а memoryview и
+    bytearray принимает за итератор чисел; обертка передает буфер уровню
+    requests без копирования целиком, длина берется из __len__.
+    """
+
+    def __init__(self, buffer: Any):
+        self._view = memoryview(buffer).cast('B')
+        self._position = 0
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = len(self._view) - self._position
+        data = self._view[self._position:self._position + size].tobytes()
+        self._position += len(data)
+        return data
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._position, os.SEEK_END: len(self._view)}[whence]
+        self._position = max(0, min(len(self._view), base + offset))
+        return self._position
@@ -0,0 +1,491 @@
+"""
+cache - кеш HTTP ответов для GOSTHTTPClient по RFC 9111
+
+Справочные данные (списки сертификатов, классификаторы, реестры) запрашивает
+каждый поток и процесс, а каждый промах стоит GOST handshake и полного тела.
+HTTPCache хранит ответы GET в памяти (LRU с ограничением суммарного размера)
+и, если задан каталог, на диске - такой кеш общий для процессов. Свежий
+ответ отдается без запроса. Устаревший проверяется условным запросом
+(If-None-Match по ETag, If-Modified-Since по Last-Modified): ответ 304 без
+тела идет по соединению из пула и только обновляет срок жизни записи.
+
+Учитываются Cache-Control ответа (max-age, no-store, no-cache,
+must-revalidate) и запроса (max-age, min-fresh, max-stale, no-cache,
+no-store), Expires, Date, Age и Vary. Кеш частный: ответы с
+Cache-Control: private сохраняются, s-maxage не учитывается.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from email.utils import mktime_tz, parsedate_tz
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urldefrag, urlencode
+
+from .response import GOSTResponse
+
+try:
+    from requests.structures import CaseInsensitiveDict
+except ImportError:
+    CaseInsensitiveDict = dict
+
+# Уровень, указываемый в ответах из кеша (response.tier)
+TIER_CACHE = 'cache'
+
+# Максимальный суммарный размер записей в памяти по умолчанию
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+# Эвристический срок жизни без Cache-Control и Expires: доля возраста
+# документа по Last-Modified (RFC 9111, 4.2.2), но не больше суток
+HEURISTIC_FRACTION = 0.1
+HEURISTIC_MAX_LIFETIME = 24 * 3600
+
+# Статусы, ответы с которыми можно сохранять (кешируемые по умолчанию, RFC 9110)
+_CACHEABLE_STATUSES = (200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501)
+
+# Запросы с этими заголовками выполняются мимо кеша: условия и диапазоны задал вызывающий
+_BYPASS_HEADERS = ('if-none-match', 'if-modified-since', 'if-match', 'if-unmodified-since',
+                   'if-range', 'range', 'authorization')
+
+# Успешный ответ на эти методы делает запись URL недействительной (RFC 9111, 4.4)
+_UNSAFE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+# Кодирования тела, которые распаковывают все уровни клиента: content ответа
+# уже распакован, и Content-Encoding к сохраненному телу не относится
+_DECODED_CODINGS = ('gzip', 'x-gzip', 'deflate', 'br', 'zstd', 'identity')
+
+# Заголовки ответа 304, которые не переносятся в сохраненную запись
+_NOT_UPDATED_HEADERS = ('content-length', 'content-encoding', 'content-range', 'transfer-encoding',
+                        'connection', 'keep-alive')
+
+# Суффикс файлов записей в каталоге кеша
+_FILE_SUFFIX = '.cache'
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Разбирает Cache-Control в словарь директив (имена в нижнем регистре)"""
+    directives: Dict[str, Optional[str]] = {}
+    for item in (value or '').split(','):
+        name, _, argument = item.strip().partition('=')
+        if name:
+            directives[name.strip().lower()] = argument.strip().strip('"') if argument else None
+    return directives
+
+
+def cache_key(url: str, params=None) -> str:
+    """Ключ записи: URL без фрагмента с параметрами запроса"""
+    url = urldefrag(url)[0]
+    if params:
+        extra = params if isinstance(params, str) else urlencode(params, doseq=True)
+        url = f'{url}&{extra}' if '?' in url else f'{url}?{extra}'
+    return url
+
+
+def _seconds(value: Optional[str]) -> Optional[int]:
+    """Значение delta-seconds директивы или None, если оно некорректно"""
+    return int(value) if value is not None and value.isdigit() else None
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    """Время из HTTP даты (Date, Expires, Last-Modified) или None"""
+    if not value:
+        return None
+    parsed = parsedate_tz(value)
+    if parsed is None:
+        return None
+    try:
+        return float(mktime_tz(parsed))
+    except (OverflowError, ValueError):
+        return None
+
+
+def _stored_headers(headers: Iterable[Tuple[str, str]], content: bytes) -> List[Tuple[str, str]]:
+    """
+    Заголовки для записи с распакованным телом
+
+    Content-Encoding удаляется, а Content-Length пересчитывается по
+    распакованному телу. Неизвестное кодирование уровни не распаковывают -
+    такие заголовки сохраняются как есть.
+    """
+    headers = list(headers)
+    encoding = next((value for name, value in headers if name.lower() == 'content-encoding'), None)
+    codings = [coding.strip().lower() for coding in (encoding or '').split(',') if coding.strip()]
+    if not codings or not all(coding in _DECODED_CODINGS for coding in codings):
+        return headers
+    stored = [(name, value) for name, value in headers
+              if name.lower() not in ('content-encoding', 'content-length')]
+    stored.append(('Content-Length', str(len(content))))
+    return stored
+
+
+def _request_headers(headers) -> Dict[str, str]:
+    """Заголовки запроса с именами в нижнем регистре"""
+    return {str(name).lower(): str(value) for name, value in (headers or {}).items()}
+
+
+class CacheEntry:
+    """
+    Сохраненный ответ
+
+    Запись не изменяется после создания: ответ 304 создает новую запись
+    (revalidated), поэтому потоки могут читать ее без блокировки.
+    """
+
+    def __init__(self, url: str, status_code: int, reason: str, headers: List[Tuple[str, str]],
+                 content: bytes, request_time: float, response_time: float,
+                 vary: Optional[Dict[str, Optional[str]]] = None):
+        """
+        Args:
+            url: Ключ записи (см. cache_key)
+            status_code: HTTP статус
+            reason: Текстовое описание статуса
+            headers: Заголовки ответа (список пар)
+            content: Тело ответа
+            request_time: Время отправки запроса (time.time())
+            response_time: Время получения ответа (time.time())
+            vary: Значения заголовков запроса, перечисленных в Vary
+        """
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.request_time = request_time
+        self.response_time = response_time
+        self.vary = vary or {}
+        self.cache_control = parse_cache_control(self.header('Cache-Control'))
+        self.size = len(content) + sum(len(name) + len(value) for name, value in headers)
+
+    def header(self, name: str) -> Optional[str]:
+        """Значение заголовка ответа (повторы объединяются через ', ')"""
+        name = name.lower()
+        values = [value for key, value in self.headers if key.lower() == name]
+        return ', '.join(values) if values else None
+
+    def freshness_lifetime(self) -> float:
+        """Срок жизни ответа в секундах (RFC 9111, 4.2.1)"""
+        max_age = _seconds(self.cache_control.get('max-age'))
+        if max_age is not None:
+            return float(max_age)
+        date = _http_date(self.header('Date')) or self.response_time
+        expires = self.header('Expires')
+        if expires is not None:
+            # Некорректный Expires означает, что ответ уже устарел
+            expires_at = _http_date(expires)
+            return max(0.0, expires_at - date) if expires_at is not None else 0.0
+        last_modified = _http_date(self.header('Last-Modified'))
+        if last_modified is not None:
+            return min(HEURISTIC_MAX_LIFETIME, max(0.0, (date - last_modified) * HEURISTIC_FRACTION))
+        return 0.0
+
+    def current_age(self, now: float) -> float:
+        """Возраст ответа в секундах с учетом Age и задержки ответа (RFC 9111, 4.2.3)"""
+        date = _http_date(self.header('Date'))
+        apparent_age = max(0.0, self.response_time - date) if date is not None else 0.0
+        age_value = _seconds((self.header('Age') or '').split(',')[0].strip()) or 0
+        corrected_age = age_value + (self.response_time - self.request_time)
+        return max(apparent_age, corrected_age) + (now - self.response_time)
+
+    def validators(self) -> Dict[str, str]:
+        """Заголовки условного запроса для проверки записи"""
+        validators = {}
+        etag = self.header('ETag')
+        if etag:
+            validators['If-None-Match'] = etag
+        last_modified = self.header('Last-Modified')
+        if last_modified:
+            validators['If-Modified-Since'] = last_modified
+        return validators
+
+    def matches(self, request_headers: Dict[str, str]) -> bool:
+        """Подходит ли запись запросу по заголовкам из Vary"""
+        return all(request_headers.get(name) == value for name, value in self.vary.items())
+
+    def revalidated(self, headers: Iterable[Tuple[str, str]], request_time: float,
+                    response_time: float) -> 'CacheEntry':
+        """Новая запись после ответа 304: заголовки обновлены, тело прежнее (RFC 9111, 4.3.4)"""
+        updated = [(name, value) for name, value in headers if name.lower() not in _NOT_UPDATED_HEADERS]
+        names = {name.lower() for name, _ in updated}
+        merged = [(name, value) for name, value in self.headers if name.lower() not in names] + updated
+        return CacheEntry(self.url, self.status_code, self.reason, merged, self.content,
+                          request_time, response_time, self.vary)
+
+    def response(self, now: float) -> GOSTResponse:
+        """Ответ из записи с заголовком Age"""
+        headers = CaseInsensitiveDict()
+        for name, value in self.headers:
+            if name.lower() == 'age':
+                continue
+            headers[name] = f'{headers[name]}, {value}' if name in headers else value
+        headers['Age'] = str(int(self.current_age(now)))
+        return GOSTResponse(self.status_code, headers, content=self.content, url=self.url,
+                            reason=self.reason, tier=TIER_CACHE)
+
+    def metadata(self) -> Dict[str, Any]:
+        """Все поля, кроме тела (для записи на диск)"""
+        return {
+            'url': self.url,
+            'status_code': self.status_code,
+            'reason': self.reason,
+            'headers': self.headers,
+            'request_time': self.request_time,
+            'response_time': self.response_time,
+            'vary': self.vary,
+        }
+
+
+class HTTPCache:
+    """
+    Кеш ответов GET для GOSTHTTPClient (параметр cache)
+
+    В памяти хранятся последние использованные записи, пока их суммарный
+    размер не больше max_size. Если задан directory, записи сохраняются и на
+    диск: процессы с одним каталогом используют ответы друг друга, а после
+    перезапуска ответы не загружаются заново. Для каждого URL хранится один
+    вариант ответа (последний полученный).
+
+    Example:
+        >>> cache = HTTPCache(max_size=32 * 1024 * 1024, directory='/var/cache/gost_http')
+        >>> client = GOSTHTTPClient(cache=cache)
+        >>> client.get('https://dss.uc-em.ru/reestr.xml')  # запрос к серверу
+        >>> client.get('https://dss.uc-em.ru/reestr.xml').tier  # 'cache' или проверка 304
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, directory: Optional[str] = None):
+        """
+        Args:
+            max_size: Максимальный суммарный размер записей в памяти в байтах
+                (запись больше max_size хранится только на диске)
+            directory: Каталог для записей на диске (None - только память);
+                создается при необходимости
+        """
+        self.max_size = max_size
+        self.directory = directory
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._entries: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def handle(self, method: str, url: str, kwargs: Dict[str, Any],
+               send: Callable[[str, str, Dict[str, Any]], Any]) -> Any:
+        """
+        Выполняет запрос через кеш
+
+        Args:
+            method: HTTP метод (в верхнем регистре)
+            url: URL запроса
+            kwargs: Аргументы запроса (headers, params, stream и т.д.)
+            send: Функция, выполняющая запрос по сети: send(method, url, kwargs)
+
+        Returns:
+            Ответ из кеша (tier == 'cache'), ответ send или None при ошибке
+        """
+        if method != 'GET':
+            response = send(method, url, kwargs)
+            if method in _UNSAFE_METHODS and response is not None and response.status_code < 400:
+                self.invalidate(url, kwargs.get('params'))
+            return response
+
+        headers = _request_headers(kwargs.get('headers'))
+        request_cc = parse_cache_control(headers.get('cache-control'))
+        if 'no-store' in request_cc or any(name in headers for name in _BYPASS_HEADERS):
+            return send(method, url, kwargs)
+
+        key = cache_key(url, kwargs.get('params'))
+        entry = self._lookup(key, headers)
+        now = time.time()
+        if entry is not None and self._is_fresh(entry, request_cc, now):
+            with self._lock:
+                self.hits += 1
+            return entry.response(now)
+
+        validators = entry.validators() if entry is not None else {}
+        if entry is not None and not validators and (
+                'no-cache' in entry.cache_control or entry.freshness_lifetime() <= entry.current_age(now)):
+            # Устаревшую запись без ETag и Last-Modified нельзя проверить условным запросом
+            self.invalidate(url, kwargs.get('params'))
+        if validators:
+            kwargs = dict(kwargs, headers=dict(kwargs.get('headers') or {}, **validators))
+        request_time = time.time()
+        response = send(method, url, kwargs)
+        response_time = time.time()
+        if response is None:
+            return None
+
+        if response.status_code == 304 and validators:
+            response.close()
+            entry = entry.revalidated(response.headers.items(), request_time, response_time)
+            self._store(key, entry)
+            with self._lock:
+                self.revalidated += 1
+            cached = entry.response(response_time)
+            cached.timing = getattr(response, 'timing', None)
+            return cached
+
+        with self._lock:
+            self.misses += 1
+        if kwargs.get('stream'):
+            # Тело потокового ответа читает вызывающий, сохранить его нельзя
+            return response
+        entry = self._entry_from_response(key, headers, request_cc, response, request_time, response_time)
+        if entry is not None:
+            self._store(key, entry)
+        elif validators:
+            self.invalidate(url, kwargs.get('params'))
+        return response
+
+    def _is_fresh(self, entry: CacheEntry, request_cc: Dict[str, Optional[str]], now: float) -> bool:
+        """Можно ли отдать запись без проверки на сервере (RFC 9111, 4.2 и 5.2.1)"""
+        if 'no-cache' in entry.cache_control or 'no-cache' in request_cc:
+            return False
+        age = entry.current_age(now)
+        lifetime = entry.freshness_lifetime()
+        max_age = _seconds(request_cc.get('max-age'))
+        if max_age is not None and age > max_age:
+            return False
+        min_fresh = _seconds(request_cc.get('min-fresh'))
+        if min_fresh is not None:
+            lifetime -= min_fresh
+        if lifetime > age:
+            return True
+        if 'max-stale' in request_cc and 'must-revalidate' not in entry.cache_control:
+            # max-stale без значения - подходит ответ любого возраста
+            max_stale = request_cc['max-stale']
+            allowed = float('inf') if max_stale is None else _seconds(max_stale)
+            return allowed is not None and age - lifetime <= allowed
+        return False
+
+    def _entry_from_response(self, key: str, request_headers: Dict[str, str],
+                             request_cc: Dict[str, Optional[str]], response,
+                             request_time: float, response_time: float) -> Optional[CacheEntry]:
+        """Создает запись, если ответ можно сохранить (RFC 9111, 3)"""
+        if response.status_code not in _CACHEABLE_STATUSES or 'no-store' in request_cc:
+            return None
+        response_cc = parse_cache_control(response.headers.get('Cache-Control'))
+        vary = response.headers.get('Vary') or ''
+        if 'no-store' in response_cc or '*' in vary or response.headers.get('Content-Range'):
+            return None
+        names = [name.strip().lower() for name in vary.split(',') if name.strip()]
+        content = response.content
+        entry = CacheEntry(key, response.status_code, response.reason or '',
+                           _stored_headers(response.headers.items(), content), content, request_time, response_time,
+                           {name: request_headers.get(name) for name in names})
+        # Запись без срока жизни полезна, только если ее можно проверить условным запросом
+        if entry.freshness_lifetime() <= 0 and not entry.validators():
+            return None
+        return entry
+
+    def _lookup(self, key: str, request_headers: Dict[str, str]) -> Optional[CacheEntry]:
+        """Запись для ключа из памяти или с диска, если она подходит запросу по Vary"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None and self.directory:
+            entry = self._read(key)
+            if entry is not None:
+                self._remember(key, entry)
+        if entry is None or not entry.matches(request_headers):
+            return None
+        return entry
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        """Помещает запись в память, вытесняя давно не использованные записи"""
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous.size
+            if entry.size > self.max_size:
+                return
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+                self.evictions += 1
+
+    def _store(self, key: str, entry: CacheEntry) -> None:
+        self._remember(key, entry)
+        if self.directory:
+            self._write(key, entry)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode('utf-8')).hexdigest() + _FILE_SUFFIX)
+
+    def _read(self, key: str) -> Optional[CacheEntry]:
+        """Читает запись с диска: первая строка - JSON с полями, далее тело"""
+        try:
+            with open(self._path(key), 'rb') as f:
+                metadata = json.loads(f.readline())
+                content = f.read()
+            if metadata.get('url') != key:
+                return None
+            return CacheEntry(metadata['url'], metadata['status_code'], metadata['reason'],
+                              [tuple(pair) for pair in metadata['headers']], content,
+                              metadata['request_time'], metadata['response_time'], metadata['vary'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write(self, key: str, entry: CacheEntry) -> None:
+        """Записывает запись на диск (заменой файла: читатели видят старую или новую запись)"""
+        path = self._path(key)
+        temporary = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(temporary, 'wb') as f:
+                f.write(json.dumps(entry.metadata()).encode('utf-8') + b'\n')
+                f.write(entry.content)
+            os.replace(temporary, path)
+        except OSError:
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+
+    def invalidate(self, url: str, params=None) -> None:
+        """Удаляет запись URL из памяти и с диска"""
+        key = cache_key(url, params)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._size -= entry.size
+        if self.directory:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Удаляет все записи (в памяти и на диске) и сбрасывает статистику"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = self.revalidated = self.misses = self.evictions = 0
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(_FILE_SUFFIX):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except OSError:
+                        pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Возвращает статистику кеша"""
+        with self._lock:
+            total = self.hits + self.revalidated + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'hits': self.hits,
+                'revalidated': self.revalidated,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': (self.hits + self.revalidated) / total if total else 0.0,
+            }
@@ -0,0 +1,295 @@
+"""
+compression - сжатие тела ответа (Content-Encoding) для прямого и curl уровней
+
+Прямой pyOpenSSL уровень (HTTP/1.1 и HTTP/2) и асинхронный клиент отправляют
+Accept-Encoding и распаковывают ответ сами: тело, прочитанное целиком,
+распаковывается сразу, а в потоковом режиме DecodingReader распаковывает
+каждый фрагмент по мере чтения, не загружая тело в память. Поддерживаются
+gzip, deflate и, если установлен пакет brotli (или brotlicffi), br. Уровень
+curl запускается с --compressed и распаковывает ответ сам, тоже потоково.
+
+Распаковщики принимают max_length: за один вызов возвращается не больше
+max_length байтов, а непрочитанный сжатый остаток (unconsumed) хранится до
+следующего вызова. Поэтому сжатая "бомба" не разворачивается в памяти за
+одно чтение DecodingReader.
+"""
+
+import zlib
+from typing import List, Optional
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi as brotli
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        brotli = None
+        BROTLI_AVAILABLE = False
+
+# Значение Accept-Encoding по умолчанию
+ACCEPT_ENCODING = 'gzip, deflate, br' if BROTLI_AVAILABLE else 'gzip, deflate'
+
+
+class ContentDecodingError(ValueError):
+    """Тело ответа не удалось распаковать согласно Content-Encoding"""
+
+
+class _GzipDecoder:
+    """gzip, в том числе из нескольких подряд идущих членов"""
+
+    def __init__(self):
+        self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self.unconsumed = b''
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        data = self.unconsumed + data if self.unconsumed else data
+        self.unconsumed = b''
+        output = []
+        size = 0
+        while data:
+            chunk = self._obj.decompress(data, max_length - size if max_length else 0)
+            output.append(chunk)
+            size += len(chunk)
+            if self._obj.unconsumed_tail:
+                self.unconsumed = self._obj.unconsumed_tail
+                break
+            data = self._obj.unused_data
+            if not data:
+                break
+            # Следующий член gzip начинается сразу после предыдущего
+            self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            if max_length and size >= max_length:
+                self.unconsumed = data
+                break
+        return b''.join(output)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+
+class _DeflateDecoder:
+    """deflate: zlib поток или, у части серверов, deflate без заголовка zlib"""
+
+    def __init__(self):
+        self._obj = zlib.decompressobj()
+        # Полученные данные хранятся, пока формат не определен
+        self._first: Optional[bytes] = b''
+        self.unconsumed = b''
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        if self._first is not None:
+            self._first += data
+        data = self.unconsumed + data if self.unconsumed else data
+        try:
+            output = self._obj.decompress(data, max_length)
+        except zlib.error:
+            if self._first is None:
+                raise
+            self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+            data, self._first = self._first, None
+            output = self._obj.decompress(data, max_length)
+        if output:
+            self._first = None
+        self.unconsumed = self._obj.unconsumed_tail
+        return output
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+
+class _BrotliDecoder:
+    """
+    br (требуется пакет brotli или brotlicffi)
+
+    Ограничение max_length поддерживает brotli с output_buffer_limit
+    (can_accept_more_data); с остальными версиями фрагмент распаковывается
+    целиком.
+    """
+
+    def __init__(self):
+        self._obj = brotli.Decompressor()
+        self._limited = hasattr(self._obj, 'can_accept_more_data')
+        self.unconsumed = b''
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        if hasattr(self._obj, 'decompress'):
+            return self._obj.decompress(data)
+        if not self._limited:
+            return self._obj.process(data)
+        data = self.unconsumed + data if self.unconsumed else data
+        self.unconsumed = b''
+        if data and not self._obj.can_accept_more_data():
+            # Сначала нужно выдать уже распакованные данные
+            self.unconsumed, data = data, b''
+        if max_length:
+            return self._obj.process(data, output_buffer_limit=max_length)
+        return self._obj.process(data)
+
+    def flush(self) -> bytes:
+        if hasattr(self._obj, 'flush'):
+            return self._obj.flush()
+        return b''
+
+
+class _MultiDecoder:
+    """Несколько кодировок подряд: распаковываются в обратном порядке"""
+
+    def __init__(self, decoders: List):
+        self._decoders = decoders
+        self._input = b''
+
+    @property
+    def unconsumed(self) -> bytes:
+        return self._input or b''.join(decoder.unconsumed for decoder in self._decoders)
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        self._input += data
+        return self._pull(len(self._decoders) - 1, max_length)
+
+    def _pull(self, index: int, max_length: int) -> bytes:
+        """Распаковывает уровнем index, запрашивая у предыдущего не больше max_length байтов"""
+        decoder = self._decoders[index]
+        if not index:
+            data, self._input = self._input, b''
+            return decoder.decompress(data, max_length)
+        while True:
+            # Пока у уровня есть остаток, новые данные от предыдущего не запрашиваются
+            data = b'' if decoder.unconsumed else self._pull(index - 1, max_length)
+            output = decoder.decompress(data, max_length)
+            if output or not (data or decoder.unconsumed):
+                return output
+
+    def flush(self) -> bytes:
+        data = b''
+        for decoder in self._decoders:
+            data = decoder.decompress(data) + decoder.flush()
+        return data
+
+
+_DECODERS = {'gzip': _GzipDecoder, 'x-gzip': _GzipDecoder, 'deflate': _DeflateDecoder}
+if BROTLI_AVAILABLE:
+    _DECODERS['br'] = _BrotliDecoder
+
+
+def get_decoder(content_encoding: Optional[str]):
+    """
+    Создает распаковщик для значения заголовка Content-Encoding
+
+    Returns:
+        Объект с методами decompress(data) и flush() или None, если тело не
+        сжато или кодировка не поддерживается (тогда тело отдается как есть)
+    """
+    if not content_encoding:
+        return None
+    names = [name.strip().lower() for name in content_encoding.split(',')]
+    names = [name for name in names if name and name != 'identity']
+    if not names or any(name not in _DECODERS for name in names):
+        return None
+    decoders = [_DECODERS[name]() for name in reversed(names)]
+    return decoders[0] if len(decoders) == 1 else _MultiDecoder(decoders)
+
+
+def decode_content(data: bytes, content_encoding: Optional[str]) -> bytes:
+    """
+    Распаковывает тело, прочитанное целиком
+
+    Raises:
+        ContentDecodingError: Если данные не соответствуют Content-Encoding
+    """
+    decoder = get_decoder(content_encoding)
+    if decoder is None or not data:
+        return data
+    try:
+        return decoder.decompress(data) + decoder.flush()
+    except Exception as e:
+        raise ContentDecodingError(f'Не удалось распаковать тело ({content_encoding}): {e}') from e
+
+
+class DecodingReader:
+    """
+    Потоковая распаковка тела ответа
+
+    Обертка над raw объектом уровня (read/readinto/close): каждый прочитанный
+    из сети фрагмент сразу распаковывается, но не больше запрошенного
+    количества байтов за чтение; остаток распаковывается при следующих
+    чтениях. wire_bytes и decoded_bytes считают сжатые и распакованные байты.
+    """
+
+    def __init__(self, raw, decoder, content_encoding: str = ''):
+        self._raw = raw
+        self._decoder = decoder
+        self._content_encoding = content_encoding
+        self._pending = b''
+        self._eof = False
+        self._finished = False
+        # Последняя распаковка уперлась в лимит - распаковщик может выдать еще без новых данных
+        self._more = False
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+
+    def _decode(self, data: bytes, max_length: int, final: bool = False) -> bytes:
+        try:
+            if final:
+                output = self._decoder.flush()
+            else:
+                output = self._decoder.decompress(data, max_length)
+        except Exception as e:
+            raise ContentDecodingError(
+                f'Не удалось распаковать тело ({self._content_encoding}): {e}') from e
+        self.decoded_bytes += len(output)
+        return output
+
+    def _next_chunk(self, amt: int) -> bytes:
+        while not self._finished:
+            if self._eof or self._more:
+                output = self._decode(b'', amt)
+                if not output and self._eof and not self._decoder.unconsumed:
+                    self._finished = True
+                    return self._decode(b'', amt, final=True)
+            else:
+                data = self._raw.read(amt)
+                self.wire_bytes += len(data)
+                if not data:
+                    self._eof = True
+                    continue
+                output = self._decode(data, amt)
+            self._more = bool(output) and len(output) >= amt or bool(self._decoder.unconsumed)
+            if output:
+                return output
+        return b''
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        """
+        Читает до ``amt`` распакованных байтов (None - все оставшееся тело)
+
+        Returns:
+            Очередной фрагмент; b'' - тело прочитано полностью
+        """
+        if amt is None:
+            chunks = [self._pending]
+            self._pending = b''
+            while True:
+                chunk = self._next_chunk(64 * 1024)
+                if not chunk:
+                    return b''.join(chunks)
+                chunks.append(chunk)
+
+        data = self._pending or self._next_chunk(amt)
+        if len(data) > amt:
+            self._pending = data[amt:]
+            return data[:amt]
+        self._pending = b''
+        return data
+
+    def readinto(self, buffer) -> int:
+        """Читает очередной распакованный фрагмент в буфер, возвращает количество байтов"""
+        view = memoryview(buffer).cast('B')
+        data = self.read(len(view))
+        view[:len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        """Прекращает чтение и закрывает исходный raw объект"""
+        self._raw.close()
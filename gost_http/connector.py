@@ -0,0 +1,280 @@
+"""
+connector - кеш DNS и установка TCP соединений по алгоритму Happy Eyeballs
+
+Используется уровнем прямого pyOpenSSL и GOSTAdapter. DNSCache хранит
+результаты getaddrinfo в памяти процесса, поэтому повторные соединения с
+хостом не ждут DNS. create_connection перебирает адреса хоста по RFC 8305:
+семейства адресов (IPv6/IPv4) чередуются, следующая попытка запускается, если
+предыдущая не завершилась за CONNECTION_ATTEMPT_DELAY, и побеждает первое
+установленное соединение. Хост только с IPv6 или с недоступным первым адресом
+не ждет таймаута подключения.
+"""
+
+import errno
+import os
+import selectors
+import socket
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .metrics import record
+
+# Задержка перед следующей попыткой подключения (RFC 8305, раздел 5)
+CONNECTION_ATTEMPT_DELAY = 0.25
+
+# Коды connect_ex неблокирующего сокета, означающие "подключение в процессе"
+_CONNECT_IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN,
+                        getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK)}
+
+# Результат getaddrinfo: (family, type, proto, canonname, sockaddr)
+AddrInfo = Tuple[int, int, int, str, Tuple[Any, ...]]
+
+
+def _is_ip_address(host: str) -> bool:
+    """Проверяет, является ли host IPv4 или IPv6 адресом"""
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, host.strip('[]'))
+            return True
+        except (OSError, ValueError):
+            pass
+    return False
+
+
+def interleave_addresses(addresses: Iterable[AddrInfo]) -> List[AddrInfo]:
+    """
+    Чередует семейства адресов (RFC 8305, раздел 4)
+
+    Первым остается адрес, который getaddrinfo вернул первым (порядок
+    RFC 6724), дальше адреса разных семейств идут поочередно.
+    """
+    by_family: Dict[int, List[AddrInfo]] = OrderedDict()
+    for address in addresses:
+        by_family.setdefault(address[0], []).append(address)
+    result = []
+    queues = list(by_family.values())
+    while queues:
+        for queue in queues:
+            result.append(queue.pop(0))
+        queues = [queue for queue in queues if queue]
+    return result
+
+
+class DNSCache:
+    """
+    Кеш результатов getaddrinfo в памяти процесса
+
+    getaddrinfo не сообщает TTL записей, поэтому адреса хранятся ``ttl``
+    секунд. Запись удаляется раньше, если не удалось подключиться ни к одному
+    из ее адресов. Адрес, к которому удалось подключиться, переносится в
+    начало списка, и следующие соединения не ждут медленный первый адрес.
+    """
+
+    def __init__(self, ttl: float = 60.0, maxsize: int = 1024):
+        """
+        Args:
+            ttl: Сколько секунд хранить адреса хоста (0 - не кешировать)
+            maxsize: Максимальное количество хостов в кеше
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[Tuple[str, int], Tuple[List[AddrInfo], float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, host: str, port: int) -> List[AddrInfo]:
+        """
+        Возвращает адреса хоста для TCP подключения
+
+        Raises:
+            socket.gaierror: Если имя не удалось разрешить
+        """
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(entry[0])
+            self.misses += 1
+
+        addresses = interleave_addresses(
+            socket.getaddrinfo(host, port, socket.AF_UNSPEC, socket.SOCK_STREAM)
+        )
+        # IP адреса не требуют DNS запроса, кешировать их незачем
+        if self.ttl > 0 and addresses and not _is_ip_address(host):
+            with self._lock:
+                self._entries[key] = (addresses, now + self.ttl)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return list(addresses)
+
+    def prefer(self, host: str, port: int, sockaddr: Tuple[Any, ...]) -> None:
+        """Переносит адрес, к которому удалось подключиться, в начало списка"""
+        with self._lock:
+            entry = self._entries.get((host, port))
+            if entry is None or entry[0][0][4] == sockaddr:
+                return
+            addresses = sorted(entry[0], key=lambda address: address[4] != sockaddr)
+            self._entries[(host, port)] = (addresses, entry[1])
+
+    def invalidate(self, host: str, port: int) -> None:
+        """Удаляет адреса хоста из кеша"""
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+    def clear(self) -> None:
+        """Очищает кеш и статистику"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Возвращает статистику кеша"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0,
+            }
+
+
+# Общий кеш DNS для всех клиентов процесса
+dns_cache = DNSCache()
+
+
+def happy_eyeballs_connect(addresses: List[AddrInfo], timeout: Optional[float],
+                           delay: float = CONNECTION_ATTEMPT_DELAY,
+                           source_address: Optional[Tuple[str, int]] = None,
+                           socket_options: Optional[Iterable[Tuple[int, int, Any]]] = None) -> socket.socket:
+    """
+    Подключается к первому ответившему адресу из списка (RFC 8305)
+
+    Попытки запускаются по очереди с интервалом ``delay`` секунд или сразу
+    после неудачи предыдущей; все попытки ждут в одном selector без потоков.
+    Проигравшие сокеты закрываются.
+
+    Args:
+        addresses: Адреса в порядке попыток (см. interleave_addresses)
+        timeout: Общий таймаут подключения в секундах (None - без таймаута);
+            устанавливается и на возвращаемый сокет
+        delay: Задержка перед запуском следующей попытки
+        source_address: Локальный адрес для bind
+        socket_options: Опции setsockopt, применяемые до подключения
+
+    Returns:
+        Подключенный сокет
+
+    Raises:
+        socket.timeout: Если ни одна попытка не завершилась за timeout
+        OSError: Ошибка последней попытки, если все адреса недоступны
+    """
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    pending = list(addresses)
+    attempts: Dict[socket.socket, AddrInfo] = {}
+    selector = selectors.DefaultSelector()
+    next_attempt = 0.0
+    last_error: Optional[OSError] = None
+
+    try:
+        while True:
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                raise socket.timeout('timed out')
+
+            if pending and (not attempts or now >= next_attempt):
+                family, type_, proto, _, sockaddr = pending.pop(0)
+                sock = None
+                try:
+                    sock = socket.socket(family, type_, proto)
+                    for option in socket_options or ():
+                        sock.setsockopt(*option)
+                    if source_address:
+                        sock.bind(source_address)
+                    sock.setblocking(False)
+                    code = sock.connect_ex(sockaddr)
+                except OSError as e:
+                    if sock is not None:
+                        sock.close()
+                    last_error = e
+                    continue
+                if code == 0:
+                    sock.settimeout(timeout)
+                    return sock
+                if code not in _CONNECT_IN_PROGRESS:
+                    sock.close()
+                    last_error = OSError(code, os.strerror(code))
+                    continue
+                attempts[sock] = (family, type_, proto, '', sockaddr)
+                selector.register(sock, selectors.EVENT_WRITE)
+                next_attempt = now + delay
+                continue
+
+            if not attempts:
+                raise last_error or OSError('нет адресов для подключения')
+
+            wait = None if deadline is None else deadline - now
+            if pending:
+                wait = next_attempt - now if wait is None else min(wait, next_attempt - now)
+            for key, _ in selector.select(max(wait, 0) if wait is not None else None):
+                sock = key.fileobj
+                selector.unregister(sock)
+                attempts.pop(sock)
+                code = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if code == 0:
+                    sock.settimeout(timeout)
+                    return sock
+                sock.close()
+                last_error = OSError(code, os.strerror(code))
+                # Неудачная попытка - следующий адрес пробуется сразу
+                next_attempt = now
+    finally:
+        for sock in attempts:
+            sock.close()
+        selector.close()
+
+
+def create_connection(address: Tuple[str, int], timeout: Optional[float] = None,
+                      source_address: Optional[Tuple[str, int]] = None,
+                      socket_options: Optional[Iterable[Tuple[int, int, Any]]] = None,
+                      cache: Optional[DNSCache] = None) -> socket.socket:
+    """
+    Аналог socket.create_connection с кешем DNS и Happy Eyeballs
+
+    Args:
+        address: Кортеж (host, port)
+        timeout: Таймаут подключения в секундах (None - без таймаута)
+        source_address: Локальный адрес для bind
+        socket_options: Опции setsockopt, применяемые до подключения
+        cache: Кеш DNS (по умолчанию общий dns_cache)
+
+    Returns:
+        Подключенный сокет
+    """
+    host, port = address
+    cache = cache if cache is not None else dns_cache
+    started = time.perf_counter()
+    addresses = cache.resolve(host, port)
+    resolved = time.perf_counter()
+    record('dns', resolved - started)
+    try:
+        sock = happy_eyeballs_connect(addresses, timeout, source_address=source_address,
+                                      socket_options=socket_options)
+    except OSError:
+        # Адреса могли устареть: следующая попытка заново обратится к DNS
+        cache.invalidate(host, port)
+        raise
+    record('connect', time.perf_counter() - resolved)
+    try:
+        cache.prefer(host, port, sock.getpeername())
+    except OSError:
+        pass
+    return sock
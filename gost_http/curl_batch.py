@@ -0,0 +1,308 @@
+"""
+curl_batch - объединение запросов уровня curl в один процесс curl
+
+Когда несколько потоков одновременно доходят до curl fallback, каждый запрос
+стоил бы отдельного процесса, DNS запроса, TCP соединения и GOST handshake.
+CurlBatcher собирает запросы, пришедшие в течение короткого окна, и выполняет
+их одним вызовом ``curl --parallel --config -``: curl переиспользует
+соединения между передачами, а стоимость запуска процесса делится на весь пакет.
+
+Для каждой передачи curl пишет тело и заголовки в отдельные файлы, а статус,
+код ошибки и замеры времени - строкой ``--write-out`` с номером передачи
+(переменные %{urlnum} и %{exitcode} появились в curl 7.75, на более старых
+версиях пакеты не собираются). Каждая передача ограничена своим --max-time,
+поэтому медленный запрос не задерживает остальные запросы пакета.
+"""
+
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Формат строки --write-out: номер передачи, HTTP статус, код ошибки curl и
+# накопленные от начала передачи моменты DNS, TCP, TLS, первого байта и конца
+WRITE_OUT = ('%{urlnum} %{http_code} %{exitcode} %{time_namelookup} %{time_connect} '
+             '%{time_appconnect} %{time_starttransfer} %{time_total}\\n')
+
+# Минимальная версия curl для пакетов: --parallel (7.66) и %{urlnum}/%{exitcode} (7.75)
+MIN_BATCH_CURL_VERSION = (7, 75)
+
+_batch_supported: Optional[bool] = None
+
+logger = logging.getLogger(__name__)
+
+
+class CurlBatchError(RuntimeError):
+    """Пакет не выполнен целиком (curl не поддерживает пакеты или процесс завершился ошибкой)"""
+
+
+def curl_phase_timings(namelookup: float, connect: float, appconnect: float,
+                       starttransfer: float, total: float) -> Dict[str, float]:
+    """
+    Переводит накопленные замеры curl --write-out в длительности фаз
+
+    Для переиспользованного соединения curl сообщает нулевые моменты
+    подключения - тогда фазы dns/connect/tls не возвращаются.
+    """
+    timings = {}
+    if connect > 0:
+        timings['dns'] = namelookup
+        timings['connect'] = max(0.0, connect - namelookup)
+        if appconnect > 0:
+            timings['tls'] = max(0.0, appconnect - connect)
+    timings['ttfb'] = max(0.0, starttransfer - max(connect, appconnect))
+    timings['transfer'] = max(0.0, total - starttransfer)
+    return timings
+
+
+def curl_supports_batch() -> bool:
+    """Проверяет, поддерживает ли установленный curl пакеты (curl 7.75+, см. MIN_BATCH_CURL_VERSION)"""
+    global _batch_supported
+    if _batch_supported is None:
+        try:
+            result = subprocess.run(['curl', '--version'], capture_output=True, text=True, timeout=5)
+            version = result.stdout.split()[1]
+            _batch_supported = tuple(int(part) for part in version.split('.')[:2]) >= MIN_BATCH_CURL_VERSION
+        except Exception:
+            _batch_supported = False
+    return _batch_supported
+
+
+def parse_write_out(output: bytes) -> Dict[int, Tuple[int, Dict[str, float]]]:
+    """
+    Разбирает строки --write-out пакета (формат WRITE_OUT)
+
+    Returns:
+        Номер передачи -> (код ошибки curl, замеры фаз). Передачи без
+        строки или с некорректной строкой в результат не попадают и
+        считаются неудачными.
+    """
+    reports: Dict[int, Tuple[int, Dict[str, float]]] = {}
+    for line in output.decode('latin-1').splitlines():
+        parts = line.split()
+        if len(parts) != 8:
+            continue
+        try:
+            index, exit_code = int(parts[0]), int(parts[2])
+            reports[index] = (exit_code, curl_phase_timings(*map(float, parts[3:])))
+        except ValueError:
+            continue
+    return reports
+
+
+def _quote(value: str) -> str:
+    """Экранирует строку для конфигурационного файла curl"""
+    value = value.replace('\\', '\\\\').replace('"', '\\"')
+    return '"' + value.replace('\r', '\\r').replace('\n', '\\n') + '"'
+
+
+def parse_header_dump(data: bytes) -> Tuple[Optional[int], str, List[Tuple[str, str]]]:
+    """
+    Разбирает файл --dump-header
+
+    При редиректах (-L) и ответах 1xx файл содержит несколько блоков
+    заголовков; используется последний.
+
+    Returns:
+        Кортеж (статус или None, reason, список пар заголовков)
+    """
+    status_code = None
+    reason = ''
+    headers: List[Tuple[str, str]] = []
+    for line in data.decode('latin-1').splitlines():
+        if line.startswith('HTTP/'):
+            parts = line.split(' ', 2)
+            try:
+                status_code = int(parts[1])
+            except (IndexError, ValueError):
+                continue
+            reason = parts[2].strip() if len(parts) > 2 else ''
+            headers = []
+        elif ':' in line and status_code is not None:
+            name, _, value = line.partition(':')
+            headers.append((name.strip(), value.strip()))
+    return status_code, reason, headers
+
+
+class _CurlTransfer:
+    """Запрос, ожидающий выполнения в пакете"""
+
+    def __init__(self, method: str, url: str, headers: Optional[Dict[str, str]], body: Optional[bytes]):
+        self.method = method
+        self.url = url
+        self.headers = headers or {}
+        self.body = body
+        self.result: Optional[Dict[str, Any]] = None
+        # Ошибка выполнения всего пакета
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+
+class CurlBatcher:
+    """
+    Собирает одновременные запросы уровня curl в пакеты
+
+    Первый поток, отправивший запрос, ждет до ``window`` секунд (или пока пакет
+    не наберет ``max_batch`` запросов), после чего запускает один процесс curl
+    для всего пакета. Остальные потоки ждут результата своего запроса.
+    """
+
+    def __init__(self, window: float = 0.005, max_batch: int = 64, timeout: int = 10):
+        """
+        Args:
+            window: Сколько секунд ждать другие запросы перед запуском пакета
+            max_batch: Максимальный размер пакета
+            timeout: Таймаут соединения в секундах (--connect-timeout)
+        """
+        self.window = window
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self._cond = threading.Condition()
+        self._pending: List[_CurlTransfer] = []
+        self._collecting = False
+        self.batches = 0
+        self.transfers = 0
+
+    def submit(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+               body: Optional[bytes] = None) -> Optional[Dict[str, Any]]:
+        """
+        Выполняет запрос в составе пакета (блокирует поток до результата)
+
+        Args:
+            method: HTTP метод
+            url: URL запроса
+            headers: Заголовки запроса
+            body: Тело запроса
+
+        Returns:
+            Словарь с 'status_code', 'reason', 'headers' (список пар) и 'content'
+            (bytes) или None при ошибке
+
+        Raises:
+            CurlBatchError: Если пакет не выполнен целиком - запрос нужно
+                выполнить отдельным процессом curl
+        """
+        if not curl_supports_batch():
+            raise CurlBatchError('curl не поддерживает пакеты (нужен curl 7.75+)')
+        transfer = _CurlTransfer(method.upper(), url, headers, body)
+        with self._cond:
+            self._pending.append(transfer)
+            leader = not self._collecting
+            if leader:
+                self._collecting = True
+            elif len(self._pending) >= self.max_batch:
+                self._cond.notify_all()
+
+        if leader:
+            with self._cond:
+                deadline = time.monotonic() + self.window
+                while len(self._pending) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending
+                self._pending = []
+                self._collecting = False
+            self._run(batch)
+
+        transfer.done.wait()
+        if transfer.error is not None:
+            raise CurlBatchError(f'Пакет curl не выполнен: {transfer.error}') from transfer.error
+        return transfer.result
+
+    def stats(self) -> Dict[str, Any]:
+        """Возвращает количество пакетов и передач"""
+        with self._cond:
+            return {
+                'batches': self.batches,
+                'transfers': self.transfers,
+                'transfers_per_batch': self.transfers / self.batches if self.batches else 0.0,
+            }
+
+    def _run(self, batch: List[_CurlTransfer]) -> None:
+        """Выполняет пакет одним процессом curl и раздает результаты"""
+        try:
+            with tempfile.TemporaryDirectory(prefix='gost_curl_') as workdir:
+                self._execute(batch, workdir)
+        except Exception as e:
+            logger.warning('Пакет curl из %d запросов не выполнен, запросы выполняются отдельно: %r',
+                           len(batch), e)
+            for transfer in batch:
+                transfer.error = e
+        finally:
+            with self._cond:
+                self.batches += 1
+                self.transfers += len(batch)
+            for transfer in batch:
+                transfer.done.set()
+
+    def _execute(self, batch: List[_CurlTransfer], workdir: str) -> None:
+        config = []
+        for index, transfer in enumerate(batch):
+            if index:
+                config.append('next')
+            base = os.path.join(workdir, str(index))
+            config.append(f'url = {_quote(transfer.url)}')
+            config.append(f'output = {_quote(base + ".body")}')
+            config.append(f'dump-header = {_quote(base + ".head")}')
+            config.append(f'write-out = "{WRITE_OUT}"')
+            config.append(f'connect-timeout = {self.timeout}')
+            # Как у одиночного curl: своя граница времени у каждой передачи
+            config.append(f'max-time = {self.timeout + 5}')
+            config.append('insecure')
+            config.append('location')
+            config.append('silent')
+            config.append('compressed')
+            if transfer.method == 'HEAD':
+                config.append('head')
+            elif transfer.method != 'GET':
+                config.append(f'request = {_quote(transfer.method)}')
+            for name, value in transfer.headers.items():
+                config.append(f'header = {_quote(f"{name}: {value}")}')
+            if transfer.body is not None:
+                with open(base + '.req', 'wb') as f:
+                    f.write(transfer.body)
+                config.append(f'data-binary = {_quote("@" + base + ".req")}')
+
+        # --parallel-immediate: не ждать возможности мультиплексирования (HTTP/1.1).
+        # Все передачи идут одновременно, поэтому общий таймаут процесса - только
+        # страховка сверх max-time передач
+        cmd = ['curl', '--parallel', '--parallel-immediate', '--parallel-max', str(len(batch)),
+               '--config', '-']
+        result = subprocess.run(
+            cmd,
+            input='\n'.join(config).encode('utf-8'),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=self.timeout + 15
+        )
+
+        # Код ошибки и замеры каждой передачи из строк --write-out
+        reports = parse_write_out(result.stdout)
+        for index, transfer in enumerate(batch):
+            report = reports.get(index)
+            if report is None or report[0] != 0:
+                continue
+            base = os.path.join(workdir, str(index))
+            try:
+                with open(base + '.head', 'rb') as f:
+                    status_code, reason, headers = parse_header_dump(f.read())
+                if status_code is None:
+                    continue
+                content = b''
+                if os.path.exists(base + '.body') and transfer.method != 'HEAD':
+                    with open(base + '.body', 'rb') as f:
+                        content = f.read()
+            except OSError:
+                continue
+            transfer.result = {
+                'status_code': status_code,
+                'reason': reason,
+                'headers': headers,
+                'content': content,
+                'timings': report[1]
+            }
@@ -0,0 +1,326 @@
+"""
+download - параллельная загрузка файла диапазонами (HTTP Range)
+
+Используется GOSTHTTPClient.download. Размер ресурса и поддержка диапазонов
+определяются запросом HEAD (или GET с Range: bytes=0-0, если HEAD не прошел),
+файл заранее выделяется на диске, а части загружаются одновременно по
+отдельным соединениям пула и записываются сразу по своему смещению
+(os.pwrite), без сборки в памяти. Скорость одного GOST соединения часто
+ограничена сервером и ядром, на котором идет шифрование Кузнечик/Магма,
+поэтому несколько соединений загружают большой файл быстрее.
+
+Прогресс частей сохраняется рядом с файлом (``<path>.gostdownload``):
+после сбоя повторный вызов с тем же URL и путем докачивает только
+недостающие диапазоны, если ресурс не изменился (размер, ETag или
+Last-Modified).
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+# Файл меньше этого размера на части не делится
+MIN_PART_SIZE = 1024 * 1024
+
+# Размер фрагмента при чтении тела части
+READ_CHUNK_SIZE = 256 * 1024
+
+# Как часто (в секундах) сохранять прогресс частей во время загрузки
+STATE_SAVE_INTERVAL = 1.0
+
+# Суффикс файла с прогрессом загрузки
+STATE_SUFFIX = '.gostdownload'
+
+
+class _Part:
+    """Диапазон байтов [start, end] и смещение следующего незагруженного байта"""
+
+    def __init__(self, start: int, end: int, offset: Optional[int] = None):
+        self.start = start
+        self.end = end
+        self.offset = start if offset is None else offset
+
+    @property
+    def done(self) -> bool:
+        return self.offset > self.end
+
+
+def split_ranges(size: int, parts: int, min_part_size: int = MIN_PART_SIZE) -> List[Tuple[int, int]]:
+    """
+    Делит ``size`` байтов на не больше ``parts`` диапазонов [start, end]
+
+    Части не меньше min_part_size (кроме единственной), поэтому небольшой
+    файл загружается одним запросом.
+    """
+    if size <= 0:
+        return []
+    count = max(1, min(parts, size // max(1, min_part_size)))
+    step = -(-size // count)
+    return [(start, min(size, start + step) - 1) for start in range(0, size, step)]
+
+
+# Без os.pwrite (Windows) запись по смещению - lseek и write под блокировкой
+_seek_lock = threading.Lock()
+
+
+def write_at(fd: int, data, offset: int) -> None:
+    """Записывает все данные по смещению (pwrite), потоки пишут в файл одновременно"""
+    view = memoryview(data).cast('B')
+    while view:
+        if hasattr(os, 'pwrite'):
+            written = os.pwrite(fd, view, offset)
+        else:
+            with _seek_lock:
+                os.lseek(fd, offset, os.SEEK_SET)
+                written = os.write(fd, view)
+        view = view[written:]
+        offset += written
+
+
+class RangeDownloader:
+    """
+    Загрузка одного ресурса в файл параллельными диапазонами
+
+    Example:
+        >>> result = RangeDownloader(client, url, 'dump.xml.gz', parts=8).run()
+    """
+
+    def __init__(self, client, url: str, path: str, parts: int = 4,
+                 headers: Optional[Dict[str, str]] = None, retries: int = 3,
+                 min_part_size: int = MIN_PART_SIZE):
+        """
+        Args:
+            client: GOSTHTTPClient (нужны методы head и get)
+            url: URL ресурса
+            path: Путь к файлу результата
+            parts: Сколько частей загружать одновременно
+            headers: Дополнительные заголовки запросов
+            retries: Сколько раз повторять часть после ошибки (докачка с места обрыва)
+            min_part_size: Минимальный размер части в байтах
+        """
+        if parts < 1:
+            raise ValueError('parts должен быть не меньше 1')
+        self.client = client
+        self.url = url
+        self.path = path
+        self.parts = parts
+        self.headers = dict(headers or {})
+        # Content-Length и диапазоны относятся к несжатому представлению
+        self.headers['Accept-Encoding'] = 'identity'
+        self.retries = retries
+        self.min_part_size = min_part_size
+        self.state_path = path + STATE_SUFFIX
+        self._lock = threading.Lock()
+        self._saved = 0.0
+        self._failed = False
+        self._downloaded = 0
+
+    def run(self) -> Optional[Dict[str, Any]]:
+        """
+        Загружает ресурс
+
+        Returns:
+            Словарь с 'path', 'size', 'parts', 'resumed' (байтов уже было
+            загружено ранее), 'downloaded' (байтов загружено сейчас), 'ranges'
+            (загрузка диапазонами) и 'elapsed', либо None при ошибке - тогда
+            повторный вызов докачает недостающие части
+        """
+        started = time.monotonic()
+        size, validator, probe = self._probe()
+        if size is None or probe is not None:
+            # Диапазоны не поддерживаются: тело ответа записывается по порядку
+            result = self._download_whole(probe)
+            if result is not None:
+                result['elapsed'] = time.monotonic() - started
+            return result
+
+        parts, resumed = self._load_state(size, validator)
+        if parts is None:
+            parts = [_Part(start, end) for start, end in split_ranges(size, self.parts, self.min_part_size)]
+            resumed = 0
+        self._parts = parts
+        self._size = size
+        self._validator = validator
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            if not resumed:
+                os.ftruncate(fd, 0)
+                _preallocate(fd, size)
+            pending = [part for part in parts if not part.done]
+            if pending:
+                with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix='gost-download') as executor:
+                    list(executor.map(lambda part: self._fetch_part(fd, part), pending))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        if self._failed or not all(part.done for part in parts):
+            self._save_state(force=True)
+            return None
+        self._remove_state()
+        return {
+            'path': self.path,
+            'size': size,
+            'parts': len(parts),
+            'resumed': resumed,
+            'downloaded': self._downloaded,
+            'ranges': True,
+            'elapsed': time.monotonic() - started,
+        }
+
+    def _probe(self) -> Tuple[Optional[int], Optional[str], Any]:
+        """
+        Определяет размер ресурса и поддержку диапазонов
+
+        Returns:
+            Кортеж (размер или None, валидатор для If-Range или None, ответ
+            GET без поддержки диапазонов для загрузки целиком или None)
+        """
+        response = self.client.head(self.url, headers=self.headers, allow_redirects=True)
+        if (response is not None and response.status_code == 200
+                and response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+                and (response.headers.get('Content-Length') or '').isdigit()):
+            return int(response.headers['Content-Length']), _validator(response.headers), None
+
+        # HEAD не прошел (на части уровней он недоступен) - пробный диапазон из одного байта
+        response = self.client.get(self.url, headers=dict(self.headers, Range='bytes=0-0'), stream=True)
+        if response is None:
+            raise ConnectionError(f'Не удалось получить {self.url}')
+        if response.status_code == 206:
+            total = response.headers.get('Content-Range', '').rpartition('/')[2]
+            response.close()
+            if total.isdigit():
+                return int(total), _validator(response.headers), None
+            raise ConnectionError(f'Некорректный Content-Range: {response.headers.get("Content-Range")!r}')
+        if response.status_code != 200:
+            response.close()
+            raise ConnectionError(f'HTTP {response.status_code}')
+        return None, None, response
+
+    def _download_whole(self, response) -> Optional[Dict[str, Any]]:
+        """Записывает тело ответа без диапазонов в файл по порядку"""
+        size = 0
+        try:
+            with open(self.path, 'wb') as f:
+                for chunk in response.iter_content(READ_CHUNK_SIZE):
+                    f.write(chunk)
+                    size += len(chunk)
+        finally:
+            response.close()
+        self._remove_state()
+        return {'path': self.path, 'size': size, 'parts': 1, 'resumed': 0,
+                'downloaded': size, 'ranges': False}
+
+    def _fetch_part(self, fd: int, part: _Part) -> None:
+        """Загружает часть, после обрыва продолжает с последнего записанного байта"""
+        for _ in range(self.retries + 1):
+            if part.done or self._failed:
+                return
+            headers = dict(self.headers, Range=f'bytes={part.offset}-{part.end}')
+            if self._validator:
+                headers['If-Range'] = self._validator
+            response = self.client.get(self.url, headers=headers, stream=True)
+            if response is None:
+                continue
+            try:
+                if response.status_code != 206:
+                    # 200 на запрос с If-Range - ресурс изменился, части несовместимы
+                    if response.status_code == 200:
+                        self._failed = True
+                        self._remove_state()
+                    continue
+                content_range = response.headers.get('Content-Range', '')
+                if not content_range.startswith(f'bytes {part.offset}-'):
+                    continue
+                for chunk in response.iter_content(READ_CHUNK_SIZE):
+                    chunk = chunk[:part.end + 1 - part.offset]
+                    if not chunk:
+                        break
+                    write_at(fd, chunk, part.offset)
+                    with self._lock:
+                        part.offset += len(chunk)
+                        self._downloaded += len(chunk)
+                    self._save_state(fd=fd)
+            except Exception:
+                # Обрыв соединения: следующая попытка продолжит с part.offset
+                continue
+            finally:
+                response.close()
+
+    def _load_state(self, size: int, validator: Optional[str]) -> Tuple[Optional[List[_Part]], int]:
+        """Читает прогресс прошлой загрузки, если он относится к тому же ресурсу"""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if (state.get('url') != self.url or state.get('size') != size
+                    or state.get('validator') != validator or os.path.getsize(self.path) != size):
+                return None, 0
+            parts = [_Part(start, end, offset) for start, end, offset in state['parts']]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None, 0
+        return parts, sum(part.offset - part.start for part in parts)
+
+    def _save_state(self, force: bool = False, fd: Optional[int] = None) -> None:
+        """
+        Сохраняет прогресс частей (не чаще STATE_SAVE_INTERVAL, если не force)
+
+        Args:
+            force: Сохранить независимо от интервала
+            fd: Дескриптор файла результата: его данные сбрасываются на диск
+                до записи прогресса, чтобы прогресс не опережал данные
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._failed or (not force and now - self._saved < STATE_SAVE_INTERVAL):
+                return
+            self._saved = now
+            state = {
+                'url': self.url,
+                'size': self._size,
+                'validator': self._validator,
+                'parts': [[part.start, part.end, part.offset] for part in self._parts],
+            }
+            # Файл заменяется целиком после fsync: после сбоя остается старый или новый прогресс
+            temporary = self.state_path + '.tmp'
+            try:
+                if fd is not None:
+                    os.fsync(fd)
+                with open(temporary, 'w', encoding='utf-8') as f:
+                    json.dump(state, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temporary, self.state_path)
+            except OSError:
+                try:
+                    os.remove(temporary)
+                except OSError:
+                    pass
+
+    def _remove_state(self) -> None:
+        try:
+            os.remove(self.state_path)
+        except OSError:
+            pass
+
+
+def _validator(headers) -> Optional[str]:
+    """Сильный ETag или Last-Modified для If-Range (слабый ETag для If-Range не подходит)"""
+    etag = headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return headers.get('Last-Modified')
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """Выделяет место под файл заранее: нехватка места обнаруживается до загрузки"""
+    if hasattr(os, 'posix_fallocate'):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError:
+            pass
+    os.ftruncate(fd, size)
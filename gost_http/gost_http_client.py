@@ -12,105 +12,184 @@ import os
 import sys
 import socket
 import subprocess
-from typing import Optional, Dict, Any, Union
-from urllib.parse import urlparse
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Union, List, Tuple, Iterable, Iterator, Callable, Sequence
+from urllib.parse import urlparse, urlencode
+
+from .body import BufferReader, body_length, body_rewinder, is_stream_body, iter_body
+from .transport import DirectTLSPool, encode_body, tls_connection_dropped
+from .http2 import ALPN_PROTOCOLS, H2_AVAILABLE
+from .http11 import MAX_HEAD_SIZE
+from .response import GOSTResponse
+from .curl_batch import CurlBatcher, CurlBatchError
+from .download import RangeDownloader
+from .cache import HTTPCache, TIER_CACHE
+from .connector import create_connection
+from . import metrics
 
 try:
     import requests
     from requests.adapters import HTTPAdapter
     from requests import Response, Session
+    from requests.structures import CaseInsensitiveDict
+    from urllib3.connection import HTTPSConnection
+    from urllib3.connectionpool import HTTPSConnectionPool
+    from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
     Response = None
     Session = None
+    CaseInsensitiveDict = dict
 
 try:
     from OpenSSL import SSL
-    from urllib3.contrib.pyopenssl import PyOpenSSLContext
+    from urllib3.contrib.pyopenssl import PyOpenSSLContext, WrappedSocket
+    from urllib3.util import wait_for_read
+    from urllib3.util.ssl_ import is_ipaddress
     import ssl as std_ssl
     PYOPENSSL_AVAILABLE = True
 except ImportError:
     PYOPENSSL_AVAILABLE = False
     SSL = None
     PyOpenSSLContext = None
+    WrappedSocket = None
     std_ssl = None
 
 # Глобальная переменная для отслеживания загрузки GOST engine
 _gost_engine_loaded = False
 
+# Загрузка engine выполняется одним потоком: одновременные первые вызовы
+# load_gost_engine ждут ее завершения, а не повторяют ENGINE_init
+_gost_engine_lock = threading.Lock()
+
+# Объект с функциями ENGINE API (привязки pyOpenSSL или libcrypto через ctypes),
+# создается один раз
+_engine_api = None
+
+# Способ регистрации GOST engine (параметр load_gost_engine или переменная
+# окружения GOST_ENGINE_REGISTRATION):
+# 'scoped'  - engine регистрируется только для своих алгоритмов (ГОСТ шифры,
+#             хеши и методы ключей); AES, SHA-2 и другие алгоритмы остаются
+#             на оптимизированных реализациях OpenSSL
+# 'default' - engine становится реализацией по умолчанию для всех классов
+#             алгоритмов (ENGINE_set_default с ENGINE_METHOD_ALL)
+ENGINE_REGISTRATION_SCOPED = 'scoped'
+ENGINE_REGISTRATION_DEFAULT = 'default'
+ENGINE_METHOD_ALL = 0xFFFF
+
+# Функции, регистрирующие алгоритмы engine без назначения его реализацией по умолчанию
+_SCOPED_ENGINE_REGISTRATIONS = (
+    'ENGINE_register_ciphers',
+    'ENGINE_register_digests',
+    'ENGINE_register_pkey_meths',
+    'ENGINE_register_pkey_asn1_meths',
+)
+
+# Способ, которым был зарегистрирован загруженный engine
+_gost_engine_registration: Optional[str] = None
+
+
+def _engine_library():
+    """
+    Возвращает объект с функциями ENGINE API
+    
+    Используются привязки pyOpenSSL, если в них есть все нужные функции,
+    иначе функции libcrypto через ctypes. Результат кешируется, libcrypto
+    открывается не более одного раза.
+    """
+    global _engine_api
+    if _engine_api is not None:
+        return _engine_api
+    
+    required = ('ENGINE_load_builtin_engines', 'ENGINE_by_id', 'ENGINE_init',
+                'ENGINE_set_default') + _SCOPED_ENGINE_REGISTRATIONS
+    if all(hasattr(SSL._lib, name) for name in required):
+        _engine_api = SSL._lib
+        return _engine_api
+    
+    import ctypes
+    libcrypto = ctypes.CDLL('libcrypto.so.3')
+    libcrypto.ENGINE_load_builtin_engines.restype = None
+    libcrypto.ENGINE_by_id.argtypes = [ctypes.c_char_p]
+    libcrypto.ENGINE_by_id.restype = ctypes.c_void_p
+    libcrypto.ENGINE_init.argtypes = [ctypes.c_void_p]
+    libcrypto.ENGINE_init.restype = ctypes.c_int
+    libcrypto.ENGINE_set_default.argtypes = [ctypes.c_void_p, ctypes.c_uint]
+    libcrypto.ENGINE_set_default.restype = ctypes.c_int
+    for name in _SCOPED_ENGINE_REGISTRATIONS:
+        function = getattr(libcrypto, name)
+        function.argtypes = [ctypes.c_void_p]
+        function.restype = ctypes.c_int
+    _engine_api = libcrypto
+    return _engine_api
+
 
-def load_gost_engine() -> bool:
+def load_gost_engine(registration: Optional[str] = None) -> bool:
     """
     Загружает GOST engine через pyOpenSSL
     
+    Безопасна для вызова из нескольких потоков: engine инициализируется
+    один раз, остальные потоки ждут завершения загрузки.
+    
+    Args:
+        registration: Способ регистрации engine: 'scoped' (по умолчанию) или
+            'default'; если не задан, берется из GOST_ENGINE_REGISTRATION.
+            Учитывается только при первой успешной загрузке.
+    
     Returns:
         bool: True если engine успешно загружен, False в противном случае
     """
-    global _gost_engine_loaded
-    
     if _gost_engine_loaded:
         return True
     
     if not PYOPENSSL_AVAILABLE:
         return False
     
+    with _gost_engine_lock:
+        # Повторная проверка: engine мог загрузить другой поток, пока этот ждал
+        if _gost_engine_loaded:
+            return True
+        return _load_gost_engine_locked(registration)
+
+
+def _load_gost_engine_locked(registration: Optional[str]) -> bool:
+    """Загружает engine; вызывается под _gost_engine_lock"""
+    global _gost_engine_loaded, _gost_engine_registration
+    
+    if registration is None:
+        registration = os.environ.get('GOST_ENGINE_REGISTRATION', ENGINE_REGISTRATION_SCOPED)
+    
     try:
         # Устанавливаем OPENSSL_CONF для загрузки конфигурации
         if 'OPENSSL_CONF' not in os.environ:
             os.environ['OPENSSL_CONF'] = '/etc/ssl/openssl.cnf'
         
-        # Загружаем встроенные engines
-        if hasattr(SSL._lib, 'ENGINE_load_builtin_engines'):
-            SSL._lib.ENGINE_load_builtin_engines()
-        else:
-            # Альтернативный способ через ctypes
-            import ctypes
-            libcrypto = ctypes.CDLL('libcrypto.so.3')
-            ENGINE_load_builtin_engines = libcrypto.ENGINE_load_builtin_engines
-            ENGINE_load_builtin_engines.restype = ctypes.c_int
-            ENGINE_load_builtin_engines()
-        
-        # Находим GOST engine
-        if hasattr(SSL._lib, 'ENGINE_by_id'):
-            engine = SSL._lib.ENGINE_by_id(b'gost')
-        else:
-            # Альтернативный способ через ctypes
-            import ctypes
-            libcrypto = ctypes.CDLL('libcrypto.so.3')
-            ENGINE_by_id = libcrypto.ENGINE_by_id
-            ENGINE_by_id.argtypes = [ctypes.c_char_p]
-            ENGINE_by_id.restype = ctypes.c_void_p
-            engine = ENGINE_by_id(b'gost')
+        lib = _engine_library()
         
+        # Загружаем встроенные engines и находим GOST engine
+        lib.ENGINE_load_builtin_engines()
+        engine = lib.ENGINE_by_id(b'gost')
         if not engine:
             return False
         
         # Инициализируем engine
-        if hasattr(SSL._lib, 'ENGINE_init'):
-            init_result = SSL._lib.ENGINE_init(engine)
-        else:
-            import ctypes
-            libcrypto = ctypes.CDLL('libcrypto.so.3')
-            ENGINE_init = libcrypto.ENGINE_init
-            ENGINE_init.argtypes = [ctypes.c_void_p]
-            ENGINE_init.restype = ctypes.c_int
-            init_result = ENGINE_init(engine)
-        
-        if init_result != 1:
+        if lib.ENGINE_init(engine) != 1:
             return False
         
-        # Устанавливаем engine по умолчанию для всех алгоритмов
-        if hasattr(SSL._lib, 'ENGINE_set_default'):
-            SSL._lib.ENGINE_set_default(engine, 0xFFFF)  # ALL
+        if registration == ENGINE_REGISTRATION_DEFAULT:
+            # Engine по умолчанию для всех алгоритмов (прежнее поведение)
+            lib.ENGINE_set_default(engine, ENGINE_METHOD_ALL)
         else:
-            import ctypes
-            libcrypto = ctypes.CDLL('libcrypto.so.3')
-            ENGINE_set_default = libcrypto.ENGINE_set_default
-            ENGINE_set_default.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
-            ENGINE_set_default.restype = ctypes.c_int
-            ENGINE_set_default(engine, 0xFFFF)
+            # Только ГОСТ алгоритмы: шифры, хеши, методы и ASN.1 методы ключей
+            for name in _SCOPED_ENGINE_REGISTRATIONS:
+                getattr(lib, name)(engine)
         
+        _gost_engine_registration = registration
         _gost_engine_loaded = True
         return True
         
@@ -118,55 +197,467 @@ def load_gost_engine() -> bool:
         return False
 
 
+# Cipher suites с приоритетом GOST и запасной список без GOST
+GOST_CIPHER_LIST = 'GOST2012-KUZNYECHIK-KUZNYECHIKOMAC:GOST2012-GOST8912-GOST8912:GOST2001-GOST89-GOST89:ALL:!aNULL:!eNULL'
+FALLBACK_CIPHER_LIST = 'ALL:!aNULL:!eNULL'
+
+# Кеш готовых SSL контекстов: один контекст на конфигурацию
+_ssl_context_cache: Dict[Tuple[Any, ...], Any] = {}
+_ssl_context_lock = threading.Lock()
+
+
+class TLSSessionCache:
+    """
+    Клиентский кеш TLS сессий для возобновления handshake
+    
+    Хранит последнюю сессию (session ID или session ticket) для каждой
+    тройки (SSL контекст, host, port). Новое соединение к тому же хосту
+    предлагает серверу сохраненную сессию и, если сервер ее принимает,
+    обходится без полного GOST handshake (VKO и проверки сертификата).
+    """
+    
+    def __init__(self, maxsize: int = 1024):
+        """
+        Args:
+            maxsize: Максимальное количество хранимых сессий (LRU)
+        """
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._sessions: 'OrderedDict[Tuple[int, str, int], Any]' = OrderedDict()
+        self.full = 0
+        self.resumed = 0
+    
+    def get(self, ctx, host: str, port: int):
+        """Возвращает сохраненную сессию для хоста или None"""
+        key = (id(ctx), host, port)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None:
+                self._sessions.move_to_end(key)
+            return session
+    
+    def put(self, ctx, host: str, port: int, session) -> None:
+        """Сохраняет сессию для хоста"""
+        if session is None:
+            return
+        key = (id(ctx), host, port)
+        with self._lock:
+            self._sessions[key] = session
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.maxsize:
+                self._sessions.popitem(last=False)
+    
+    def invalidate(self, ctx, host: str, port: int) -> None:
+        """Удаляет сессию хоста (например, после ошибки handshake)"""
+        with self._lock:
+            self._sessions.pop((id(ctx), host, port), None)
+    
+    def record_handshake(self, resumed: bool) -> None:
+        """Учитывает выполненный handshake в статистике"""
+        with self._lock:
+            if resumed:
+                self.resumed += 1
+            else:
+                self.full += 1
+    
+    def clear(self) -> None:
+        """Очищает сохраненные сессии и счетчики"""
+        with self._lock:
+            self._sessions.clear()
+            self.full = 0
+            self.resumed = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Возвращает статистику handshake
+        
+        Returns:
+            Словарь с 'full', 'resumed', 'resumed_ratio' и 'sessions'
+        """
+        with self._lock:
+            total = self.full + self.resumed
+            return {
+                'full': self.full,
+                'resumed': self.resumed,
+                'resumed_ratio': self.resumed / total if total else 0.0,
+                'sessions': len(self._sessions),
+            }
+
+
+# Общий кеш TLS сессий для GOSTAdapter и прямого pyOpenSSL подключения
+tls_session_cache = TLSSessionCache()
+
+
+def _session_reused(ssl_sock) -> bool:
+    """Проверяет, была ли TLS сессия соединения возобновлена"""
+    try:
+        return bool(SSL._lib.SSL_session_reused(ssl_sock._ssl))
+    except Exception:
+        return False
+
+
+def _handshake_with_session(ssl_sock, sock, ctx, hostname: str, port: int) -> None:
+    """
+    Выполняет клиентский handshake, предлагая серверу сохраненную TLS сессию
+    
+    Args:
+        ssl_sock: SSL.Connection, еще не выполнивший handshake
+        sock: Нижележащий сокет (для ожидания данных при таймауте)
+        ctx: SSL.Context, которому принадлежит соединение
+        hostname: Имя хоста (ключ кеша сессий)
+        port: Порт (ключ кеша сессий)
+    """
+    session = tls_session_cache.get(ctx, hostname, port)
+    if session is not None:
+        try:
+            ssl_sock.set_session(session)
+        except Exception:
+            tls_session_cache.invalidate(ctx, hostname, port)
+    
+    ssl_sock.set_connect_state()
+    started = time.perf_counter()
+    while True:
+        try:
+            ssl_sock.do_handshake()
+        except SSL.WantReadError:
+            if not wait_for_read(sock, sock.gettimeout()):
+                raise TimeoutError("select timed out")
+            continue
+        except SSL.Error:
+            tls_session_cache.invalidate(ctx, hostname, port)
+            raise
+        break
+    
+    metrics.record('tls', time.perf_counter() - started)
+    tls_session_cache.record_handshake(_session_reused(ssl_sock))
+    # Для TLS 1.2 сессия доступна сразу; в TLS 1.3 ticket приходит после
+    # handshake, поэтому сессия дополнительно сохраняется после чтения ответа
+    tls_session_cache.put(ctx, hostname, port, ssl_sock.get_session())
+
+
+def _remember_tls_session(ssl_sock, hostname: str, port: int) -> None:
+    """Сохраняет актуальную TLS сессию соединения (в том числе TLS 1.3 ticket)"""
+    try:
+        tls_session_cache.put(ssl_sock.get_context(), hostname, port, ssl_sock.get_session())
+    except Exception:
+        pass
+
+
+class GOSTWrappedSocket(WrappedSocket):
+    """WrappedSocket, сохраняющий TLS сессию после первого чтения ответа"""
+    
+    def __init__(self, connection, socket, hostname: str, port: int, suppress_ragged_eofs: bool = True):
+        super().__init__(connection, socket, suppress_ragged_eofs)
+        self._gost_session_key = (hostname, port)
+    
+    def recv_into(self, *args, **kwargs) -> int:
+        result = super().recv_into(*args, **kwargs)
+        if self._gost_session_key is not None:
+            _remember_tls_session(self.connection, *self._gost_session_key)
+            self._gost_session_key = None
+        return result
+    
+    def _real_close(self) -> None:
+        # Без close_notify OpenSSL помечает сессию как невозобновляемую
+        try:
+            self.connection.shutdown()
+        except Exception:
+            pass
+        super()._real_close()
+
+
+class GOSTPyOpenSSLContext(PyOpenSSLContext):
+    """
+    PyOpenSSLContext для общего использования несколькими пулами соединений
+    
+    Контекст полностью настраивается при построении. urllib3 повторно задает
+    verify_mode, CA bundle, клиентский сертификат и ALPN при каждом соединении;
+    повторная установка уже примененных значений игнорируется, так как
+    pyOpenSSL запрещает изменять контекст после создания первого соединения.
+    Соединения возобновляют TLS сессии через tls_session_cache.
+    """
+    
+    def __init__(self, protocol: int):
+        super().__init__(protocol)
+        self._verify_locations = set()
+        self._cert_chains = set()
+        self._alpn_protocols = None
+    
+    @property
+    def verify_mode(self):
+        return PyOpenSSLContext.verify_mode.fget(self)
+    
+    @verify_mode.setter
+    def verify_mode(self, value) -> None:
+        if value != self.verify_mode:
+            PyOpenSSLContext.verify_mode.fset(self, value)
+    
+    def load_verify_locations(self, cafile=None, capath=None, cadata=None) -> None:
+        key = (cafile, capath, cadata)
+        if key not in self._verify_locations:
+            super().load_verify_locations(cafile, capath, cadata)
+            self._verify_locations.add(key)
+    
+    def load_cert_chain(self, certfile, keyfile=None, password=None) -> None:
+        key = (certfile, keyfile, password)
+        if key not in self._cert_chains:
+            super().load_cert_chain(certfile, keyfile, password)
+            self._cert_chains.add(key)
+    
+    def set_alpn_protocols(self, protocols) -> None:
+        if list(protocols) != self._alpn_protocols:
+            super().set_alpn_protocols(protocols)
+            self._alpn_protocols = list(protocols)
+    
+    def wrap_socket(self, sock, server_side=False, do_handshake_on_connect=True,
+                    suppress_ragged_eofs=True, server_hostname=None):
+        cnx = SSL.Connection(self._ctx, sock)
+        
+        if isinstance(server_hostname, bytes):
+            server_hostname = server_hostname.decode('utf-8')
+        
+        # Если server_hostname - IP адрес, SNI не используется (RFC 6066, раздел 3)
+        if server_hostname and not is_ipaddress(server_hostname):
+            cnx.set_tlsext_host_name(server_hostname.encode('utf-8'))
+        
+        host = server_hostname or sock.getpeername()[0]
+        port = sock.getpeername()[1]
+        try:
+            _handshake_with_session(cnx, sock, self._ctx, host, port)
+        except TimeoutError:
+            raise
+        except SSL.Error as e:
+            raise std_ssl.SSLError(f"bad handshake: {e!r}") from e
+        
+        return GOSTWrappedSocket(cnx, sock, host, port, suppress_ragged_eofs)
+
+
+def build_ssl_context(verify: Union[bool, str] = False, ciphers: str = GOST_CIPHER_LIST,
+                      client_cert: Optional[Union[str, Tuple[str, str]]] = None):
+    """
+    Создает новый pyOpenSSL контекст с поддержкой GOST
+    
+    Args:
+        verify: Проверять ли сертификаты сервера; строка - путь к CA bundle
+        ciphers: Список cipher suites в формате OpenSSL
+        client_cert: Клиентский сертификат: путь к PEM или кортеж (cert, key)
+    
+    Returns:
+        GOSTPyOpenSSLContext (нижележащий SSL.Context доступен через атрибут _ctx)
+    """
+    # Загружаем GOST engine перед созданием контекста
+    load_gost_engine()
+    
+    try:
+        ssl_context = GOSTPyOpenSSLContext(std_ssl.PROTOCOL_TLS_CLIENT)
+    except (KeyError, AttributeError):
+        ssl_context = GOSTPyOpenSSLContext(std_ssl.PROTOCOL_TLS)
+    
+    # Клиентский кеш сессий: session ID и session tickets для возобновления handshake
+    ssl_context._ctx.set_session_cache_mode(SSL.SESS_CACHE_CLIENT)
+    
+    # Системный CA bundle разбирается только если проверка действительно нужна
+    if isinstance(verify, str):
+        if os.path.isdir(verify):
+            ssl_context.load_verify_locations(capath=verify)
+        else:
+            ssl_context.load_verify_locations(cafile=verify)
+    elif verify:
+        ssl_context.set_default_verify_paths()
+    
+    ssl_context.check_hostname = False
+    ssl_context.verify_mode = std_ssl.CERT_REQUIRED if verify else std_ssl.CERT_NONE
+    
+    # Пытаемся настроить cipher suites для поддержки GOST
+    try:
+        ssl_context._ctx.set_cipher_list(ciphers)
+    except Exception:
+        try:
+            ssl_context._ctx.set_cipher_list(FALLBACK_CIPHER_LIST)
+        except Exception:
+            pass
+    
+    # ALPN задается заранее (как в urllib3), чтобы urllib3 не изменял контекст,
+    # если первым его использовало прямое pyOpenSSL подключение
+    try:
+        ssl_context.set_alpn_protocols(['http/1.1'])
+    except NotImplementedError:
+        pass
+    
+    if client_cert:
+        if isinstance(client_cert, (tuple, list)):
+            ssl_context.load_cert_chain(client_cert[0], client_cert[1])
+        else:
+            ssl_context.load_cert_chain(client_cert)
+    
+    return ssl_context
+
+
+def get_ssl_context(verify: Union[bool, str] = False, ciphers: str = GOST_CIPHER_LIST,
+                    client_cert: Optional[Union[str, Tuple[str, str]]] = None):
+    """
+    Возвращает общий pyOpenSSL контекст для конфигурации, создавая его при первом обращении
+    
+    Контекст используется и GOSTAdapter, и прямым pyOpenSSL подключением,
+    поэтому CA bundle разбирается и cipher list настраивается один раз на
+    процесс. Возвращаемый контекст нельзя изменять.
+    
+    Args:
+        verify: Проверять ли сертификаты сервера; строка - путь к CA bundle
+        ciphers: Список cipher suites в формате OpenSSL
+        client_cert: Клиентский сертификат: путь к PEM или кортеж (cert, key)
+    
+    Returns:
+        GOSTPyOpenSSLContext (нижележащий SSL.Context доступен через атрибут _ctx)
+    """
+    ca_bundle = verify if isinstance(verify, str) else None
+    if isinstance(client_cert, list):
+        client_cert = tuple(client_cert)
+    key = (bool(verify), ciphers, ca_bundle, client_cert)
+    
+    ssl_context = _ssl_context_cache.get(key)
+    if ssl_context is None:
+        with _ssl_context_lock:
+            ssl_context = _ssl_context_cache.get(key)
+            if ssl_context is None:
+                ssl_context = build_ssl_context(verify, ciphers, client_cert)
+                _ssl_context_cache[key] = ssl_context
+    return ssl_context
+
+
+class GOSTHTTPSConnection(HTTPSConnection):
+    """HTTPSConnection urllib3, подключающийся через кеш DNS и Happy Eyeballs"""
+    
+    @property
+    def is_connected(self) -> bool:
+        # urllib3 считает доступный для чтения сокет закрытым, а соединение
+        # после handshake TLS 1.3 доступно для чтения из-за NewSessionTicket
+        if self.sock is None:
+            return False
+        return not tls_connection_dropped(getattr(self.sock, 'connection', self.sock))
+    
+    def _new_conn(self):
+        # Без явного таймаута urllib3 передает объект-маркер вместо числа
+        timeout = self.timeout if isinstance(self.timeout, (int, float)) else socket.getdefaulttimeout()
+        try:
+            return create_connection((self._dns_host, self.port), timeout,
+                                     source_address=self.source_address,
+                                     socket_options=self.socket_options)
+        except socket.timeout as e:
+            raise ConnectTimeoutError(
+                self, f'Connection to {self.host} timed out. (connect timeout={self.timeout})'
+            ) from e
+        except OSError as e:
+            raise NewConnectionError(self, f'Failed to establish a new connection: {e}') from e
+
+
+class GOSTHTTPSConnectionPool(HTTPSConnectionPool):
+    """Пул HTTPS соединений urllib3 с GOSTHTTPSConnection"""
+    
+    ConnectionCls = GOSTHTTPSConnection
+
+
 class GOSTAdapter(HTTPAdapter):
     """HTTPAdapter с поддержкой GOST через pyOpenSSL"""
     
+    __attrs__ = HTTPAdapter.__attrs__ + ['gost_verify', 'gost_cert']
+    
+    def __init__(self, verify: Union[bool, str] = False,
+                 cert: Optional[Union[str, Tuple[str, str]]] = None, **kwargs):
+        """
+        Args:
+            verify: Режим проверки сертификатов для общего SSL контекста
+            cert: Клиентский сертификат для общего SSL контекста
+            **kwargs: Аргументы HTTPAdapter (pool_connections, pool_maxsize, ...)
+        """
+        self.gost_verify = verify
+        self.gost_cert = cert
+        super().__init__(**kwargs)
+    
     def init_poolmanager(self, *args, **kwargs):
         """Инициализирует pool manager с SSL контекстом, поддерживающим GOST"""
-        if not PYOPENSSL_AVAILABLE:
-            return super().init_poolmanager(*args, **kwargs)
-        
-        # Загружаем GOST engine перед созданием контекста
-        load_gost_engine()
-        
-        try:
-            # Используем pyOpenSSL контекст для urllib3
+        if PYOPENSSL_AVAILABLE:
             try:
-                ssl_context = PyOpenSSLContext(std_ssl.PROTOCOL_TLS_CLIENT)
-            except (KeyError, AttributeError):
-                ssl_context = PyOpenSSLContext(std_ssl.PROTOCOL_TLS)
-            
-            ssl_context.load_default_certs()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = std_ssl.CERT_NONE
-            
-            # Пытаемся настроить cipher suites для поддержки GOST
+                # Используем общий pyOpenSSL контекст для urllib3
+                kwargs['ssl_context'] = get_ssl_context(
+                    verify=getattr(self, 'gost_verify', False),
+                    client_cert=getattr(self, 'gost_cert', None)
+                )
+            except Exception:
+                # Fallback на стандартный контекст
+                ctx_std = std_ssl.create_default_context()
+                ctx_std.check_hostname = False
+                ctx_std.verify_mode = std_ssl.CERT_NONE
+                kwargs['ssl_context'] = ctx_std
+        
+        super().init_poolmanager(*args, **kwargs)
+        # HTTPS соединения устанавливаются через кеш DNS и Happy Eyeballs
+        self.poolmanager.pool_classes_by_scheme = dict(
+            self.poolmanager.pool_classes_by_scheme, https=GOSTHTTPSConnectionPool
+        )
+    
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        """Выбирает общий SSL контекст под verify и cert конкретного запроса"""
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(request, verify, cert)
+        if PYOPENSSL_AVAILABLE and host_params.get('scheme') == 'https':
             try:
-                if hasattr(ssl_context, '_ctx'):
-                    ctx = ssl_context._ctx
-                    try:
-                        ctx.set_cipher_list('GOST2012-KUZNYECHIK-KUZNYECHIKOMAC:GOST2012-GOST8912-GOST8912:GOST2001-GOST89-GOST89:ALL:!aNULL:!eNULL')
-                    except Exception:
-                        try:
-                            ctx.set_cipher_list('ALL:!aNULL:!eNULL')
-                        except Exception:
-                            pass
+                pool_kwargs['ssl_context'] = get_ssl_context(
+                    verify=verify,
+                    client_cert=cert or getattr(self, 'gost_cert', None)
+                )
             except Exception:
                 pass
-            
-            kwargs['ssl_context'] = ssl_context
-        except Exception:
-            # Fallback на стандартный контекст
-            import ssl as std_ssl
-            ctx_std = std_ssl.create_default_context()
-            ctx_std.check_hostname = False
-            ctx_std.verify_mode = std_ssl.CERT_NONE
-            kwargs['ssl_context'] = ctx_std
-        
-        return super().init_poolmanager(*args, **kwargs)
+        return host_params, pool_kwargs
 
 
-def _connect_via_pyopenssl(hostname: str, port: int = 443, timeout: int = 10) -> Optional[SSL.Connection]:
+def _prewarm_adapter(adapter, session, url: str, connections: int, verify: Union[bool, str],
+                     timeout: float) -> Optional[int]:
+    """
+    Открывает соединения с хостом заранее и оставляет их в пуле urllib3 адаптера
+    
+    Пул выбирается так же, как для запроса через session (verify, прокси из
+    окружения), поэтому соединения достаются следующим запросам. Простаивающие
+    соединения пула учитываются, закрытые сервером открываются заново.
+    
+    Соединения берутся из пула и возвращаются в него внутренними методами
+    urllib3 _get_conn и _put_conn (есть в urllib3 1.26 и 2.x, проверено с 2.8).
+    
+    Returns:
+        Количество готовых простаивающих соединений в пуле хоста или None,
+        если пул urllib3 не поддерживает прогрев
+    """
+    settings = session.merge_environment_settings(url, {}, None, verify, None)
+    request = requests.Request('GET', url).prepare()
+    if hasattr(adapter, 'get_connection_with_tls_context'):
+        pool = adapter.get_connection_with_tls_context(request, settings['verify'], settings['proxies'])
+    else:
+        pool = adapter.get_connection(url, settings['proxies'])
+    if not (hasattr(pool, '_get_conn') and hasattr(pool, '_put_conn')):
+        return None
+    
+    taken = []
+    try:
+        # _get_conn отдает простаивающее соединение (закрытое сервером - уже
+        # закрытым) или новое неподключенное; подключаем недостающие
+        for _ in range(min(connections, pool.pool.maxsize)):
+            conn = pool._get_conn(timeout=timeout)
+            taken.append(conn)
+            if conn.sock is None:
+                conn.timeout = timeout
+                conn.connect()
+    finally:
+        for conn in taken:
+            if conn.sock is None:
+                conn.close()
+                conn = None
+            pool._put_conn(conn)
+    return sum(1 for conn in taken if conn.sock is not None)
+
+
+def _connect_via_pyopenssl(hostname: str, port: int = 443, timeout: int = 10,
+                           verify: Union[bool, str] = False,
+                           cert: Optional[Union[str, Tuple[str, str]]] = None,
+                           alpn: Optional[List[bytes]] = None) -> Optional[SSL.Connection]:
     """
     Подключается к хосту через прямой pyOpenSSL SSL.Connection
     
@@ -174,6 +665,9 @@ def _connect_via_pyopenssl(hostname: str, port: int = 443, timeout: int = 10) ->
         hostname: Имя хоста
         port: Порт (по умолчанию 443)
         timeout: Таймаут в секундах
+        verify: Проверять ли сертификат сервера; строка - путь к CA bundle
+        cert: Клиентский сертификат: путь к PEM или кортеж (cert, key)
+        alpn: Протоколы, предлагаемые серверу в ALPN (например, ALPN_PROTOCOLS)
     
     Returns:
         SSL.Connection или None при ошибке
@@ -185,135 +679,443 @@ def _connect_via_pyopenssl(hostname: str, port: int = 443, timeout: int = 10) ->
         if not load_gost_engine():
             return None
         
-        ctx = SSL.Context(SSL.TLS_CLIENT_METHOD)
-        ctx.set_verify(SSL.VERIFY_NONE, None)
-        
-        # Устанавливаем cipher list с GOST
-        try:
-            ctx.set_cipher_list('GOST2012-KUZNYECHIK-KUZNYECHIKOMAC:GOST2012-GOST8912-GOST8912:GOST2001-GOST89-GOST89:ALL:!aNULL:!eNULL')
-        except Exception:
-            try:
-                ctx.set_cipher_list('ALL:!aNULL:!eNULL')
-            except Exception:
-                pass
+        ctx = get_ssl_context(verify=verify, client_cert=cert)._ctx
         
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(timeout)
-        sock.connect((hostname, port))
+        # IPv4 и IPv6 адреса из кеша DNS, параллельные попытки по RFC 8305
+        sock = create_connection((hostname, port), timeout,
+                                 socket_options=[(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)])
         
         ssl_sock = SSL.Connection(ctx, sock)
         ssl_sock.set_tlsext_host_name(hostname.encode())
-        ssl_sock.do_handshake()
+        if alpn:
+            # ALPN задается для соединения: общий контекст используется и urllib3 (HTTP/1.1)
+            ssl_sock.set_alpn_protos(alpn)
+        _handshake_with_session(ssl_sock, sock, ctx, hostname, port)
         
         return ssl_sock
         
-    except Exception:
+    except Exception as e:
+        metrics.record_error(e)
         return None
 
 
-def _fetch_via_curl(url: str, timeout: int = 10) -> Optional[Dict[str, Any]]:
+class CurlBodyReader:
+    """Потоковое чтение тела ответа из stdout процесса curl"""
+    
+    def __init__(self, process: subprocess.Popen, timeout: int = 10):
+        self._process = process
+        self._timeout = timeout
+        self.finished = False
+    
+    def _finish(self) -> None:
+        if self.finished:
+            return
+        self.finished = True
+        self._process.stdout.close()
+        returncode = self._process.wait(timeout=self._timeout + 5)
+        if returncode != 0:
+            raise ConnectionError(f'curl завершился с кодом {returncode}')
+    
+    def read(self, amt: Optional[int] = None) -> bytes:
+        """Читает до ``amt`` байтов тела (None - все оставшееся тело)"""
+        if self.finished:
+            return b''
+        data = self._process.stdout.read() if amt is None else self._process.stdout.read1(amt)
+        if amt is None or not data:
+            self._finish()
+        return data
+    
+    def readinto(self, buffer) -> int:
+        """Читает очередной фрагмент тела в буфер, возвращает количество байтов"""
+        if self.finished:
+            return 0
+        received = self._process.stdout.readinto1(buffer)
+        if not received:
+            self._finish()
+        return received
+    
+    def close(self) -> None:
+        """Прекращает чтение и завершает процесс curl"""
+        if self.finished:
+            return
+        self.finished = True
+        if self._process.poll() is None:
+            self._process.kill()
+        self._process.stdout.close()
+        self._process.wait()
+
+
+# Статусы, после которых curl -L выполняет следующий запрос по Location
+_CURL_REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+
+def _read_curl_head(stream) -> Tuple[int, str, List[Tuple[str, str]]]:
     """
-    Получает содержимое URL через subprocess с curl
+    Читает из вывода curl (-D -) блоки заголовков до заголовков итогового ответа
+    
+    Промежуточные ответы 1xx и редиректы, по которым curl -L выполняет
+    следующий запрос, пропускаются. После заголовков итогового ответа в
+    потоке начинается тело.
     
     Args:
-        url: URL для получения
-        timeout: Таймаут в секундах
+        stream: Бинарный поток с методом readline()
     
     Returns:
-        Словарь с 'status_code', 'content', 'headers' или None при ошибке
+        Кортеж (статус, reason, список пар заголовков)
     """
-    try:
-        result = subprocess.run(
-            ['curl', '-k', '-L', '-s', '--connect-timeout', str(timeout), url],
-            capture_output=True,
-            text=True,
-            timeout=timeout + 5
-        )
+    while True:
+        status_line = stream.readline(MAX_HEAD_SIZE).decode('latin-1').strip()
+        if not status_line:
+            raise ConnectionError('curl не вернул заголовки ответа')
+        parts = status_line.split(' ', 2)
+        if len(parts) < 2 or not parts[0].startswith('HTTP/') or not parts[1].isdigit():
+            raise ConnectionError(f'Некорректная стартовая строка от curl: {status_line!r}')
+        status_code = int(parts[1])
+        reason = parts[2] if len(parts) > 2 else ''
         
-        if result.returncode == 0:
-            return {
-                'status_code': 200,
-                'content': result.stdout,
-                'headers': {},
-                'text': result.stdout
-            }
-        return None
+        headers: List[Tuple[str, str]] = []
+        while True:
+            line = stream.readline(MAX_HEAD_SIZE).decode('latin-1').rstrip('\r\n')
+            if not line:
+                break
+            name, sep, value = line.partition(':')
+            if sep:
+                headers.append((name.strip(), value.strip()))
+        
+        if 100 <= status_code < 200:
+            continue
+        if status_code in _CURL_REDIRECT_STATUSES and any(name.lower() == 'location' for name, _ in headers):
+            continue
+        return status_code, reason, headers
+
+
+def _write_curl_stdin(process: subprocess.Popen, body: Any) -> None:
+    """Передает тело запроса фрагментами в stdin curl и закрывает pipe"""
+    pipe = process.stdin
+    try:
+        for chunk in iter_body(body):
+            pipe.write(chunk)
+    except OSError:
+        pass
     except Exception:
-        return None
+        # Источник тела сломался: неполное тело не должно уйти на сервер
+        process.kill()
+    finally:
+        try:
+            pipe.close()
+        except OSError:
+            pass
 
 
-def _post_via_curl(url: str, data: Optional[Dict[str, Any]] = None, json: Optional[Dict[str, Any]] = None, 
-                   headers: Optional[Dict[str, str]] = None, timeout: int = 10) -> Optional[Dict[str, Any]]:
+def _request_via_curl(method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                      body: Any = None, timeout: int = 10,
+                      stream: bool = False) -> Optional[Dict[str, Any]]:
     """
-    Отправляет POST запрос через subprocess с curl
+    Выполняет запрос через subprocess с curl
+    
+    curl выводит заголовки ответа в stdout перед телом (-D -), тело читается
+    из pipe блоками, поэтому размер ответа не ограничен памятью и бинарные
+    данные не искажаются. Тело запроса передается через stdin: буфер - через
+    --data-binary @-, файл или итератор - через -T - по мере чтения (с
+    Content-Length, если длина известна, иначе chunked). С --compressed curl
+    запрашивает сжатый ответ и распаковывает его сам.
     
     Args:
+        method: HTTP метод
         url: URL для запроса
-        data: Данные для отправки (form data)
-        json: JSON данные для отправки
         headers: HTTP заголовки
+        body: Тело запроса: bytes, буфер, файловый объект или итератор
         timeout: Таймаут в секундах
+        stream: Не читать тело заранее, а вернуть CurlBodyReader в 'raw'
     
     Returns:
-        Словарь с 'status_code', 'content', 'headers', 'text' или None при ошибке
+        Словарь с 'status_code', 'reason', 'headers' (список пар) и 'content'
+        (bytes) или 'raw' (в потоковом режиме), либо None при ошибке
     """
+    cmd = ['curl', '-k', '-L', '-s', '--compressed', '--connect-timeout', str(timeout),
+           '--suppress-connect-headers', '-D', '-']
+    if not stream:
+        cmd.extend(['--max-time', str(timeout + 5)])
+    if method == 'HEAD':
+        # --head выводит заголовки как тело - тело отбрасываем, заголовки берем из -D
+        cmd.extend(['--head', '-o', os.devnull])
+    elif method != 'GET':
+        cmd.extend(['-X', method])
+    for name, value in (headers or {}).items():
+        cmd.extend(['-H', f'{name}: {value}'])
+    if is_stream_body(body):
+        # --data-binary @- сначала читает stdin целиком, -T - отправляет по мере чтения
+        cmd.extend(['-T', '-', '-H', 'Expect:'])
+        if method == 'GET':
+            cmd.extend(['-X', method])
+        length = body_length(body)
+        if length is not None and not any(name.lower() == 'content-length' for name in headers or {}):
+            cmd.extend(['-H', 'Transfer-Encoding:', '-H', f'Content-Length: {length}'])
+    elif body is not None:
+        cmd.extend(['--data-binary', '@-'])
+    cmd.append(url)
+    
+    started = time.perf_counter()
     try:
-        cmd = ['curl', '-k', '-s', '--connect-timeout', str(timeout), '-X', 'POST']
-        
-        # Добавляем заголовки
-        if headers:
-            for key, value in headers.items():
-                cmd.extend(['-H', f'{key}: {value}'])
-        
-        # Обрабатываем данные
-        if json:
-            # JSON данные
-            import json as json_module
-            json_str = json_module.dumps(json)
-            cmd.extend(['-H', 'Content-Type: application/json'])
-            cmd.extend(['-d', json_str])
-        elif data:
-            # Form data
-            if isinstance(data, dict):
-                # Если Content-Type не указан, добавляем application/x-www-form-urlencoded
-                if not headers or 'Content-Type' not in headers:
-                    cmd.extend(['-H', 'Content-Type: application/x-www-form-urlencoded'])
-                # Добавляем данные как -d параметры
-                for key, value in data.items():
-                    cmd.extend(['-d', f'{key}={value}'])
-            else:
-                # Строковые данные
-                cmd.extend(['-d', str(data)])
-        
-        # Добавляем URL
-        cmd.append(url)
-        
-        result = subprocess.run(
+        process = subprocess.Popen(
             cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout + 5
+            stdin=subprocess.PIPE if body is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
         )
+    except Exception as e:
+        metrics.record_error(e)
+        return None
+    
+    if body is not None:
+        # curl может начать выводить ответ до того, как прочитает все тело запроса
+        threading.Thread(target=_write_curl_stdin, args=(process, body), daemon=True).start()
+    
+    reader = CurlBodyReader(process, timeout)
+    try:
+        status_code, reason, response_headers = _read_curl_head(process.stdout)
+        # Без -w фазы curl не разделяются: TTFB включает запуск процесса и подключение
+        received = time.perf_counter()
+        metrics.record('ttfb', received - started)
+        attempt = metrics.current_attempt()
+        if attempt is not None:
+            attempt.setup_in_ttfb = True
+        result = {
+            'status_code': status_code,
+            'reason': reason,
+            'headers': response_headers
+        }
+        if stream:
+            result['raw'] = reader
+        else:
+            result['content'] = reader.read()
+            metrics.record('transfer', time.perf_counter() - received)
+        return result
+    except Exception as e:
+        metrics.record_error(e)
+        reader.close()
+        return None
+
+
+# Транспортные уровни, через которые клиент может выполнить запрос
+TIER_SESSION = 'session'
+TIER_PYOPENSSL = 'pyopenssl'
+TIER_CURL = 'curl'
+TIERS = (TIER_SESSION, TIER_PYOPENSSL, TIER_CURL)
+
+# Статусы, при которых GET через session считается успешным
+_SUCCESS_STATUSES = (200, 201, 202, 204, 206, 301, 302, 303, 304, 307, 308)
+
+
+class TierRoutingCache:
+    """
+    Кеш маршрутизации запросов по транспортным уровням
+    
+    Для каждой пары (host, port) запоминает уровень, через который последний
+    запрос прошел успешно, и уровни, которые недавно завершились ошибкой.
+    Положительная запись живет ``ttl`` секунд, отрицательная - ``negative_ttl``,
+    после чего хост снова проходит всю цепочку fallback.
+    """
+    
+    def __init__(self, ttl: float = 300.0, negative_ttl: float = 60.0):
+        """
+        Args:
+            ttl: Время жизни записи об успешном уровне в секундах
+            negative_ttl: Время, на которое уровень с ошибкой исключается из цепочки
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, int], Tuple[str, float]] = {}
+        self._failures: Dict[Tuple[str, int, str], float] = {}
+        self._failure_cost: Dict[Tuple[str, int, str], float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self.saved_time = 0.0
+    
+    def plan(self, key: Tuple[str, int], chain: List[str]) -> List[str]:
+        """
+        Возвращает порядок уровней для запроса к хосту
         
-        if result.returncode == 0:
-            # Пытаемся извлечь статус код из stderr (curl выводит его туда с -w)
-            status_code = 200
-            if result.stderr:
-                # Ищем HTTP статус в stderr
-                import re
-                status_match = re.search(r'HTTP/\d\.\d\s+(\d+)', result.stderr)
-                if status_match:
-                    status_code = int(status_match.group(1))
+        Args:
+            key: Пара (host, port)
+            chain: Полная цепочка уровней для метода запроса
+        
+        Returns:
+            Список уровней: сначала запомненный рабочий уровень, затем остальные,
+            за исключением уровней с действующей отрицательной записью
+        """
+        now = time.monotonic()
+        with self._lock:
+            route = self._routes.get(key)
+            if route and route[1] <= now:
+                del self._routes[key]
+                route = None
             
+            blocked = set()
+            for tier in chain:
+                expires = self._failures.get(key + (tier,))
+                if expires is None:
+                    continue
+                if expires <= now:
+                    del self._failures[key + (tier,)]
+                else:
+                    blocked.add(tier)
+            
+            if route and route[0] in chain:
+                self.hits += 1
+                preferred = route[0]
+                # Уровни перед рабочим в цепочке пропускаются - это и есть экономия
+                for tier in chain[:chain.index(preferred)]:
+                    self.skipped += 1
+                    self.saved_time += self._failure_cost.get(key + (tier,), 0.0)
+                return [preferred] + [t for t in chain if t != preferred and t not in blocked]
+            
+            self.misses += 1
+            order = [t for t in chain if t not in blocked]
+            if not order:
+                # Все уровни помечены как нерабочие - пробуем цепочку целиком
+                return list(chain)
+            for tier in blocked:
+                self.skipped += 1
+                self.saved_time += self._failure_cost.get(key + (tier,), 0.0)
+            return order
+    
+    def route(self, key: Tuple[str, int]) -> Optional[str]:
+        """Возвращает запомненный рабочий уровень хоста (не учитывается в статистике)"""
+        with self._lock:
+            route = self._routes.get(key)
+            return route[0] if route and route[1] > time.monotonic() else None
+    
+    def record_success(self, key: Tuple[str, int], tier: str) -> None:
+        """Запоминает уровень, через который запрос к хосту прошел успешно"""
+        with self._lock:
+            self._routes[key] = (tier, time.monotonic() + self.ttl)
+            self._failures.pop(key + (tier,), None)
+    
+    def record_failure(self, key: Tuple[str, int], tier: str, elapsed: float = 0.0) -> None:
+        """
+        Помечает уровень как нерабочий для хоста на ``negative_ttl`` секунд
+        
+        Args:
+            key: Пара (host, port)
+            tier: Уровень, завершившийся ошибкой
+            elapsed: Время, потраченное на неудачную попытку (для статистики)
+        """
+        with self._lock:
+            self._failures[key + (tier,)] = time.monotonic() + self.negative_ttl
+            self._failure_cost[key + (tier,)] = elapsed
+            route = self._routes.get(key)
+            if route and route[0] == tier:
+                del self._routes[key]
+    
+    def clear(self) -> None:
+        """Очищает таблицу маршрутизации и счетчики"""
+        with self._lock:
+            self._routes.clear()
+            self._failures.clear()
+            self._failure_cost.clear()
+            self.hits = 0
+            self.misses = 0
+            self.skipped = 0
+            self.saved_time = 0.0
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Возвращает статистику кеша маршрутизации
+        
+        Returns:
+            Словарь с 'hits', 'misses', 'skipped' (пропущенные попытки уровней),
+            'saved_time' (оценка сэкономленного времени в секундах),
+            'routes' и 'negative' (количество действующих записей)
+        """
+        with self._lock:
             return {
-                'status_code': status_code,
-                'content': result.stdout,
-                'headers': {},
-                'text': result.stdout
+                'hits': self.hits,
+                'misses': self.misses,
+                'skipped': self.skipped,
+                'saved_time': self.saved_time,
+                'routes': len(self._routes),
+                'negative': len(self._failures),
             }
-        return None
+
+
+def _record_session_timing(response, started: float, stream: bool) -> None:
+    """Записывает TTFB и время чтения тела ответа requests в текущую попытку"""
+    attempt = metrics.current_attempt()
+    if attempt is None:
+        return
+    # response.elapsed - от отправки запроса до разбора заголовков, включая подключение
+    elapsed = response.elapsed.total_seconds()
+    setup = sum(attempt.phases.get(phase, 0.0) for phase in ('dns', 'connect', 'tls'))
+    metrics.record('ttfb', max(0.0, elapsed - setup))
+    if not stream:
+        metrics.record('transfer', max(0.0, time.perf_counter() - started - elapsed))
+
+
+def _discard_response(future) -> None:
+    """Закрывает ответ попытки, проигравшей при хеджировании"""
+    if future.cancelled():
+        return
+    try:
+        response, _ = future.result()
+        if response is not None:
+            response.close()
     except Exception:
-        return None
+        pass
+
+
+def _request_target(parsed, params=None) -> str:
+    """Формирует путь запроса с query string (params добавляются к query из URL)"""
+    target = parsed.path or '/'
+    query = parsed.query
+    if params:
+        extra = params if isinstance(params, str) else urlencode(params, doseq=True)
+        query = f'{query}&{extra}' if query else extra
+    if query:
+        target = f'{target}?{query}'
+    return target
+
+
+def _total_timeout(timeout) -> float:
+    """Приводит таймаут requests (число или кортеж (connect, read)) к одному числу"""
+    if isinstance(timeout, tuple):
+        return max(t for t in timeout if t is not None)
+    return timeout
+
+
+def _response_headers(pairs) -> CaseInsensitiveDict:
+    """Собирает список пар заголовков ответа в словарь; повторы объединяются через ', '"""
+    headers = CaseInsensitiveDict()
+    for name, value in pairs:
+        if name in headers:
+            headers[name] = f'{headers[name]}, {value}'
+        else:
+            headers[name] = value
+    return headers
+
+
+def _batch_request_spec(spec) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    Приводит описание запроса для GOSTHTTPClient.map() к (method, url, kwargs)
+    
+    Допустимые формы:
+        'https://...'                                   - GET запрос
+        ('POST', 'https://...')                         - метод и URL
+        ('POST', 'https://...', {'json': {...}})        - метод, URL и аргументы
+        {'method': 'POST', 'url': 'https://...', ...}   - словарь (method по умолчанию GET)
+    """
+    if isinstance(spec, str):
+        return 'GET', spec, {}
+    if isinstance(spec, dict):
+        kwargs = dict(spec)
+        url = kwargs.pop('url')
+        return kwargs.pop('method', 'GET').upper(), url, kwargs
+    if isinstance(spec, (tuple, list)) and len(spec) in (2, 3):
+        kwargs = dict(spec[2]) if len(spec) == 3 else {}
+        return spec[0].upper(), spec[1], kwargs
+    raise ValueError(f'Некорректное описание запроса: {spec!r}')
 
 
 class GOSTHTTPClient:
@@ -325,30 +1127,163 @@ class GOSTHTTPClient:
     2. pyOpenSSL через requests adapter (для сайтов только с GOST)
     3. Прямой pyOpenSSL SSL.Connection (для критичных случаев)
     4. subprocess с curl (fallback)
+    
+    Один экземпляр можно использовать из нескольких потоков одновременно.
+    Каждый поток получает собственный requests.Session, который разделяет
+    с self.session адаптеры (пулы соединений), cookies, заголовки и остальные
+    настройки; пул прямого pyOpenSSL уровня, кеш маршрутов и кеш TLS сессий
+    защищены блокировками.
     """
     
-    def __init__(self, verify: bool = False, timeout: int = 10):
+    # Настройки self.session, которые разделяют сессии других потоков
+    _SHARED_SESSION_ATTRIBUTES = ('headers', 'cookies', 'auth', 'proxies', 'hooks', 'params',
+                                  'verify', 'cert', 'stream', 'trust_env', 'max_redirects', 'adapters')
+    
+    def __init__(self, verify: bool = False, timeout: int = 10,
+                 route_ttl: float = 300.0, route_negative_ttl: float = 60.0,
+                 pool_connections: int = 10, pool_maxsize: int = 10,
+                 cert: Optional[Union[str, Tuple[str, str]]] = None,
+                 curl_batch_window: float = 0.0, hedge_delay: Optional[float] = None,
+                 hedge_workers: Optional[int] = None,
+                 metrics_sink: Optional[Callable[[metrics.RequestTiming], None]] = None,
+                 http2: bool = False, cache: Optional[HTTPCache] = None,
+                 tiers: Optional[Sequence[str]] = None):
         """
         Инициализирует клиент
         
         Args:
             verify: Проверять ли SSL сертификаты (по умолчанию False)
             timeout: Таймаут запросов в секундах
+            route_ttl: Сколько секунд помнить рабочий уровень для хоста (0 - не кешировать)
+            route_negative_ttl: Сколько секунд не пробовать уровень, завершившийся ошибкой
+            pool_connections: Количество хостов, для которых хранятся пулы соединений
+            pool_maxsize: Максимум keep-alive соединений в пуле одного хоста
+            cert: Клиентский сертификат: путь к PEM или кортеж (cert, key)
+            curl_batch_window: Сколько секунд собирать одновременные запросы уровня curl
+                в один процесс curl --parallel (0 - отдельный процесс на запрос)
+            hedge_delay: Хеджирование GET запросов: через сколько секунд без ответа
+                запускать следующий уровень параллельно (None - уровни по очереди,
+                0 - все уровни сразу)
+            hedge_workers: Максимум потоков для попыток хеджирования (None -
+                pool_maxsize на каждый уровень цепочки)
+            metrics_sink: Sink замеров: функция, вызываемая с RequestTiming после каждого
+                запроса (например, gost_http.metrics.MetricsCollector)
+            http2: Предлагать h2 в ALPN на уровне прямого pyOpenSSL и мультиплексировать
+                запросы к хосту по одному соединению (требует пакет h2); сервер без
+                HTTP/2 обслуживается по HTTP/1.1
+            cache: Кеш ответов GET (gost_http.cache.HTTPCache); один кеш можно
+                использовать в нескольких клиентах
+            tiers: Уровни, которые пробуются для всех запросов, в заданном порядке
+                (например, ['pyopenssl']); None - цепочка по методу и схеме URL
+        
+        Raises:
+            ValueError: Если в tiers указан неизвестный уровень
         """
+        if tiers is not None and not set(tiers) <= set(TIERS):
+            raise ValueError(f'Неизвестные уровни: {sorted(set(tiers) - set(TIERS))}')
         self.verify = verify
         self.timeout = timeout
+        self.cert = cert
+        self.tiers = list(tiers) if tiers is not None else None
         self.session = None
+        # requests.Session для потоков, кроме создавшего клиент
+        self._local = threading.local()
+        self.routes = TierRoutingCache(route_ttl, route_negative_ttl) if route_ttl else None
+        self.http2 = http2 and H2_AVAILABLE
+        # Пул постоянных соединений для уровня прямого pyOpenSSL
+        self.direct_pool = DirectTLSPool(
+            self._open_direct_connection,
+            maxsize=pool_maxsize,
+            on_first_response=lambda conn: _remember_tls_session(conn.ssl_sock, conn.host, conn.port),
+            http2=self.http2
+        )
+        self.metrics_sink = metrics_sink
+        self.cache = cache
+        # Хеджирование уровней: потоки попыток создаются при первом запросе
+        self.hedge_delay = hedge_delay
+        # Запрос занимает не больше одного потока на уровень цепочки: зависшие
+        # попытки первого уровня не задерживают в очереди попытки следующих
+        self.hedge_workers = hedge_workers or pool_maxsize * len(TIERS)
+        self._hedge_executor = None
+        self._hedge_lock = threading.Lock()
+        self._hedge_requests = 0
+        self._hedge_fired = 0
+        self._hedge_wins: Dict[str, int] = {}
+        self._hedge_fallback_wins = 0
+        # Фоновый поток prewarm(keep_warm=...): (поток, событие остановки)
+        self._keep_warm = None
+        # Объединение одновременных запросов уровня curl (включается явно)
+        self.curl_batcher = CurlBatcher(curl_batch_window, timeout=timeout) if curl_batch_window > 0 else None
         
         if REQUESTS_AVAILABLE:
             self.session = requests.Session()
             if PYOPENSSL_AVAILABLE:
                 # Используем GOST adapter для всех HTTPS соединений
-                self.session.mount('https://', GOSTAdapter())
+                self.session.mount('https://', GOSTAdapter(
+                    verify=verify,
+                    cert=cert,
+                    pool_connections=pool_connections,
+                    pool_maxsize=pool_maxsize
+                ))
+            self._local.session = self.session
+    
+    def _thread_session(self):
+        """
+        Возвращает requests.Session текущего потока
+        
+        Поток, создавший клиент, использует self.session. Для остальных потоков
+        создается отдельный Session, который ссылается на те же объекты
+        настроек и адаптеры, что и self.session: изменения self.session.headers
+        и cookies видны во всех потоках, а соединения берутся из общих пулов
+        urllib3 (они потокобезопасны).
+        """
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            for name in self._SHARED_SESSION_ATTRIBUTES:
+                setattr(session, name, getattr(self.session, name))
+            self._local.session = session
+        return session
+    
+    def close(self) -> None:
+        """Закрывает сессию и все соединения в пулах"""
+        self.stop_keep_warm()
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+        if self.session is not None:
+            self.session.close()
+        self.direct_pool.close()
+    
+    def __enter__(self) -> 'GOSTHTTPClient':
+        return self
+    
+    def __exit__(self, *args) -> None:
+        self.close()
+    
+    def _tier_chain(self, method: str, url: str) -> List[str]:
+        """Возвращает полную цепочку уровней для метода и URL"""
+        if self.tiers is not None:
+            return list(self.tiers)
+        if not REQUESTS_AVAILABLE:
+            return [TIER_CURL]
+        
+        if method in ('GET', 'POST', 'PUT', 'PATCH'):
+            chain = [TIER_SESSION]
+            if urlparse(url).scheme == 'https':
+                chain.append(TIER_PYOPENSSL)
+            chain.append(TIER_CURL)
+            return chain
+        
+        return [TIER_SESSION]
     
     def _request(self, method: str, url: str, **kwargs) -> Optional[Response]:
         """
         Универсальный метод для выполнения HTTP запросов
         
+        Уровни пробуются по цепочке session -> pyOpenSSL -> curl. Если для хоста
+        известен рабочий уровень (см. TierRoutingCache), запрос сразу идет через него.
+        С параметром cache ответы GET сначала ищутся в кеше (см. HTTPCache).
+        
         Args:
             method: HTTP метод (GET, POST, PUT, DELETE, PATCH, HEAD, OPTIONS)
             url: URL для запроса
@@ -357,94 +1292,263 @@ class GOSTHTTPClient:
         Returns:
             Response объект или None при ошибке
         """
-        if not REQUESTS_AVAILABLE:
-            # Для curl fallback поддерживаем только GET
-            if method.upper() == 'GET':
-                return self._get_via_curl(url)
-            return None
+        method = method.upper()
+        if self.cache is None:
+            return self._send(method, url, kwargs)
+        
+        parsed = urlparse(url)
+        timing = metrics.RequestTiming(method, url, parsed.hostname or '',
+                                       parsed.port or (443 if parsed.scheme == 'https' else 80))
+        response = self.cache.handle(method, url, kwargs, self._send)
+        if getattr(response, 'tier', None) == TIER_CACHE and response.timing is None:
+            # Свежий ответ отдан из кеша без запроса: в замерах уровень cache
+            with metrics.tier_attempt(TIER_CACHE) as attempt:
+                pass
+            return self._finish_request(timing, attempt, response)
+        return response
+    
+    def _send(self, method: str, url: str, kwargs: Dict[str, Any]) -> Optional[Response]:
+        """Выполняет запрос по цепочке уровней (без кеша ответов)"""
+        chain = self._tier_chain(method, url)
+        
+        parsed = urlparse(url)
+        key = (parsed.hostname or '', parsed.port or (443 if parsed.scheme == 'https' else 80))
+        order = self.routes.plan(key, chain) if self.routes else chain
         
-        # Пробуем стандартный requests через session
+        timing = metrics.RequestTiming(method, url, key[0], key[1])
+        # Потоковое тело нельзя читать из нескольких уровней одновременно
+        if (self.hedge_delay is not None and method == 'GET' and len(order) > 1
+                and not is_stream_body(kwargs.get('data'))):
+            return self._request_hedged(method, url, kwargs, key, order, timing)
+        
+        rewind = body_rewinder(kwargs.get('data'))
+        transport_ok = False
+        for index, tier in enumerate(order):
+            if index:
+                if rewind is None:
+                    # Тело-итератор уже прочитано предыдущим уровнем
+                    break
+                rewind()
+            response, attempt = self._timed_tier(tier, method, url, kwargs)
+            
+            if (tier == TIER_SESSION and method == 'GET' and response is not None
+                    and response.status_code not in _SUCCESS_STATUSES):
+                # Сервер ответил, но статус неуспешный - транспорт рабочий,
+                # однако (как и раньше) пробуем следующие уровни
+                transport_ok = True
+                response.close()
+                if self.routes:
+                    self.routes.record_success(key, tier)
+                timing.add_failure(attempt, f'HTTP {response.status_code}')
+                continue
+            
+            if response is not None:
+                if self.routes and not transport_ok:
+                    self.routes.record_success(key, tier)
+                return self._finish_request(timing, attempt, response, kwargs.get('stream', False))
+            
+            if self.routes:
+                self.routes.record_failure(key, tier, attempt.elapsed)
+            timing.add_failure(attempt)
+        
+        return self._finish_request(timing, None, None)
+    
+    def _timed_tier(self, tier: str, method: str, url: str,
+                    kwargs: Dict[str, Any]) -> Tuple[Optional[Response], metrics.TierAttempt]:
+        """Выполняет попытку уровня с замерами, возвращает (ответ или None, попытка)"""
+        with metrics.tier_attempt(tier) as attempt:
+            response = self._request_via_tier(tier, method, url, dict(kwargs))
+        return response, attempt
+    
+    def _finish_request(self, timing: metrics.RequestTiming, attempt: Optional[metrics.TierAttempt],
+                        response: Optional[Response], stream: bool = False) -> Optional[Response]:
+        """Завершает замеры запроса, прикрепляет их к ответу и передает в sink"""
+        timing.complete(attempt, response, stream)
+        if response is not None:
+            response.timing = timing
+        if self.metrics_sink is not None:
+            try:
+                self.metrics_sink(timing)
+            except Exception:
+                pass
+        return response
+    
+    def _request_hedged(self, method: str, url: str, kwargs: Dict[str, Any], key: Tuple[str, int],
+                        order: List[str], timing: metrics.RequestTiming) -> Optional[Response]:
+        """
+        Выполняет запрос с хеджированием уровней
+        
+        Следующий уровень цепочки запускается параллельно, если текущие не
+        ответили за hedge_delay секунд, или сразу после ошибки уровня.
+        Возвращается первый успешный ответ; еще не начатые попытки отменяются,
+        ответы выполняющихся закрываются по готовности.
+        """
+        if self._hedge_executor is None:
+            with self._hedge_lock:
+                if self._hedge_executor is None:
+                    self._hedge_executor = ThreadPoolExecutor(max_workers=self.hedge_workers,
+                                                              thread_name_prefix='gost-hedge')
+        
+        remaining = list(order)
+        attempts: Dict[Any, Tuple[str, float]] = {}
+        next_start = time.monotonic()
+        transport_ok = False
+        fired = 0
+        winner = None
         try:
-            response = self.session.request(
-                method,
-                url,
-                verify=self.verify if 'verify' not in kwargs else kwargs.pop('verify', self.verify),
-                timeout=kwargs.pop('timeout', self.timeout),
-                **kwargs
-            )
-            # Принимаем успешные статусы
-            if response.status_code in [200, 201, 202, 204, 301, 302, 303, 307, 308]:
-                return response
-            # Для других методов принимаем любые статусы
-            if method.upper() != 'GET':
-                return response
-        except requests.exceptions.SSLError:
-            # SSL ошибка - для методов кроме GET используем только session с GOST adapter
-            # (прямой pyOpenSSL сложен для POST/PUT с телом запроса)
-            if method.upper() != 'GET':
-                # Пробуем еще раз через session (с GOST adapter уже установлен)
+            while winner is None:
+                now = time.monotonic()
+                if remaining and (not attempts or now >= next_start):
+                    if attempts:
+                        fired += 1
+                    tier = remaining.pop(0)
+                    future = self._hedge_executor.submit(self._timed_tier, tier, method, url, kwargs)
+                    attempts[future] = (tier, now)
+                    next_start = now + self.hedge_delay
+                    continue
+                if not attempts:
+                    break
+                
+                done, _ = wait(list(attempts), timeout=max(0.0, next_start - now) if remaining else None,
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    tier, started = attempts.pop(future)
+                    response, attempt = future.result()
+                    
+                    if (tier == TIER_SESSION and response is not None
+                            and response.status_code not in _SUCCESS_STATUSES):
+                        # Как и без хеджирования: транспорт рабочий, но ждем другие уровни
+                        transport_ok = True
+                        response.close()
+                        if self.routes:
+                            self.routes.record_success(key, tier)
+                        timing.add_failure(attempt, f'HTTP {response.status_code}')
+                        next_start = time.monotonic()
+                        continue
+                    
+                    if response is not None:
+                        if self.routes and not transport_ok:
+                            self.routes.record_success(key, tier)
+                        winner = (tier, response, attempt)
+                        break
+                    
+                    if self.routes:
+                        self.routes.record_failure(key, tier, time.monotonic() - started)
+                    timing.add_failure(attempt)
+                    # Ошибка уровня - следующий запускается сразу
+                    next_start = time.monotonic()
+        finally:
+            for future in attempts:
+                future.cancel()
+                future.add_done_callback(_discard_response)
+        
+        with self._hedge_lock:
+            self._hedge_requests += 1
+            if fired:
+                self._hedge_fired += 1
+            if winner is not None:
+                self._hedge_wins[winner[0]] = self._hedge_wins.get(winner[0], 0) + 1
+                if winner[0] != order[0]:
+                    self._hedge_fallback_wins += 1
+        if winner is None:
+            return self._finish_request(timing, None, None)
+        return self._finish_request(timing, winner[2], winner[1], kwargs.get('stream', False))
+    
+    def hedge_stats(self) -> Dict[str, Any]:
+        """
+        Возвращает статистику хеджирования
+        
+        Returns:
+            Словарь с 'requests' (запросы в режиме хеджирования), 'fired'
+            (запросы, для которых запускался параллельный уровень), 'fired_ratio',
+            'wins' (победы по уровням) и 'fallback_wins' (победы не первого уровня)
+        """
+        with self._hedge_lock:
+            return {
+                'requests': self._hedge_requests,
+                'fired': self._hedge_fired,
+                'fired_ratio': self._hedge_fired / self._hedge_requests if self._hedge_requests else 0.0,
+                'wins': dict(self._hedge_wins),
+                'fallback_wins': self._hedge_fallback_wins,
+            }
+    
+    def _request_via_tier(self, tier: str, method: str, url: str, kwargs: Dict[str, Any]) -> Optional[Response]:
+        """Выполняет запрос через указанный уровень, возвращает None при ошибке"""
+        if tier == TIER_SESSION:
+            return self._request_via_session(method, url, kwargs)
+        if tier == TIER_PYOPENSSL:
+            return self._request_via_pyopenssl(method, url, kwargs)
+        if tier == TIER_CURL:
+            return self._send_via_curl(method, url, kwargs)
+        return None
+    
+    def _request_via_session(self, method: str, url: str, kwargs: Dict[str, Any]) -> Optional[Response]:
+        """Выполняет запрос через requests.Session с GOST adapter"""
+        verify = kwargs.pop('verify', self.verify)
+        timeout = kwargs.pop('timeout', self.timeout)
+        if isinstance(kwargs.get('data'), (bytearray, memoryview)):
+            # requests считает bytearray и memoryview итератором чисел
+            kwargs['data'] = BufferReader(kwargs['data'])
+        rewind = body_rewinder(kwargs.get('data'))
+        session = self._thread_session()
+        started = time.perf_counter()
+        try:
+            response = session.request(method, url, verify=verify, timeout=timeout, **kwargs)
+            _record_session_timing(response, started, kwargs.get('stream', False))
+            return response
+        except requests.exceptions.SSLError as e:
+            metrics.record_error(e)
+            # SSL ошибка - для методов кроме GET пробуем еще раз через session
+            if method != 'GET' and rewind is not None:
+                rewind()
                 try:
-                    return self.session.request(
-                        method,
-                        url,
-                        verify=False,
-                        timeout=kwargs.pop('timeout', self.timeout),
-                        **kwargs
-                    )
+                    started = time.perf_counter()
+                    response = session.request(method, url, verify=False, timeout=timeout, **kwargs)
+                    _record_session_timing(response, started, kwargs.get('stream', False))
+                    return response
                 except Exception:
-                    # Fallback на curl для POST/PUT/PATCH
-                    if method.upper() in ['POST', 'PUT', 'PATCH']:
-                        return self._post_via_curl(url, **kwargs)
                     return None
-        except Exception:
-            pass
+        except Exception as e:
+            metrics.record_error(e)
+        return None
+    
+    def _open_direct_connection(self, hostname: str, port: int, timeout: float):
+        """Создает TLS соединение для пула прямого pyOpenSSL уровня"""
+        return _connect_via_pyopenssl(hostname, port, timeout, self.verify, self.cert,
+                                      alpn=ALPN_PROTOCOLS if self.http2 else None)
+    
+    def _request_via_pyopenssl(self, method: str, url: str, kwargs: Dict[str, Any]) -> Optional[Response]:
+        """Выполняет запрос через пул прямых pyOpenSSL соединений"""
+        parsed = urlparse(url)
+        if parsed.scheme != 'https':
+            return None
         
-        # Для GET пробуем прямой pyOpenSSL (как в текущей реализации)
-        if method.upper() == 'GET':
-            parsed = urlparse(url)
-            if parsed.scheme == 'https':
-                hostname = parsed.hostname
-                port = parsed.port or 443
-                path = parsed.path or '/'
-                
-                ssl_sock = _connect_via_pyopenssl(hostname, port, self.timeout)
-                if ssl_sock:
-                    try:
-                        request = f'GET {path} HTTP/1.1\r\nHost: {hostname}\r\nConnection: close\r\n\r\n'
-                        ssl_sock.send(request.encode())
-                        
-                        response_data = b''
-                        while True:
-                            try:
-                                data = ssl_sock.recv(4096)
-                                if not data:
-                                    break
-                                response_data += data
-                            except Exception:
-                                break
-                        
-                        ssl_sock.close()
-                        
-                        if b'HTTP' in response_data:
-                            class MockResponse:
-                                def __init__(self, content, status_code=200):
-                                    self.content = content
-                                    self.text = content.decode('utf-8', errors='ignore')
-                                    self.status_code = status_code
-                                    self.headers = {}
-                            
-                            return MockResponse(response_data, 200)
-                    except Exception:
-                        pass
-            
-            # Fallback на curl для GET
-            return self._get_via_curl(url)
+        target = _request_target(parsed, kwargs.get('params'))
+        headers = dict(kwargs.get('headers') or {})
+        timeout = _total_timeout(kwargs.get('timeout', self.timeout))
+        body, content_type = encode_body(kwargs.get('data'), kwargs.get('json'))
+        if body is None and method in ('POST', 'PUT', 'PATCH'):
+            body = b''
+        if content_type and not any(name.lower() == 'content-type' for name in headers):
+            headers['Content-Type'] = content_type
         
-        # Fallback на curl для POST/PUT/PATCH
-        if method.upper() in ['POST', 'PUT', 'PATCH']:
-            return self._post_via_curl(url, **kwargs)
+        try:
+            result = self.direct_pool.request(method, parsed.hostname, parsed.port or 443, target,
+                                              headers.items(), timeout, stream=kwargs.get('stream', False),
+                                              body=body)
+        except Exception as e:
+            metrics.record_error(e)
+            return None
         
-        return None
+        return GOSTResponse(
+            result.status_code,
+            _response_headers(result.headers),
+            content=result.content,
+            raw=result.raw,
+            url=url,
+            reason=result.reason,
+            tier=TIER_PYOPENSSL
+        )
     
     def get(self, url: str, **kwargs) -> Optional[Response]:
         """Выполняет GET запрос"""
@@ -474,77 +1578,410 @@ class GOSTHTTPClient:
         """Выполняет OPTIONS запрос"""
         return self._request('OPTIONS', url, **kwargs)
     
-    def _get_via_curl(self, url: str) -> Optional[Response]:
-        """Получает содержимое через curl"""
-        result = _fetch_via_curl(url, self.timeout)
-        if result:
-            class MockResponse:
-                def __init__(self, content, status_code, text):
-                    self.content = content.encode() if isinstance(content, str) else content
-                    self.text = text
-                    self.status_code = status_code
-                    self.headers = {}
-            
-            return MockResponse(result['content'], result['status_code'], result['text'])
-        return None
+    def _batch_request(self, method: str, url: str, kwargs: Dict[str, Any]) -> Optional[Response]:
+        """Выполняет один запрос пакета; исключения превращаются в None"""
+        try:
+            return self._request(method, url, **kwargs)
+        except Exception:
+            return None
     
-    def _post_via_curl(self, url: str, **kwargs) -> Optional[Response]:
-        """Отправляет POST запрос через curl"""
-        data = kwargs.get('data')
-        json_data = kwargs.get('json')
-        headers = kwargs.get('headers')
+    def map(self, specs: Iterable[Any], max_workers: int = 10, per_host: Optional[int] = None,
+            ordered: bool = True) -> Iterator:
+        """
+        Выполняет пакет запросов параллельно в ограниченном пуле потоков
         
-        result = _post_via_curl(url, data=data, json=json_data, headers=headers, timeout=self.timeout)
-        if result:
-            class MockResponse:
-                def __init__(self, content, status_code, text):
-                    self.content = content.encode() if isinstance(content, str) else content
-                    self.text = text
-                    self.status_code = status_code
-                    self.headers = {}
+        Запросы используют пулы соединений и кеш маршрутизации этого клиента.
+        Описания запросов читаются из specs по мере освобождения потоков, поэтому
+        specs может быть генератором на десятки тысяч запросов. Для полного
+        использования потоков pool_maxsize клиента должен быть не меньше max_workers.
+        
+        Args:
+            specs: Описания запросов (URL, кортеж (method, url[, kwargs]) или словарь,
+                см. _batch_request_spec)
+            max_workers: Количество потоков
+            per_host: Максимум одновременных запросов к одному (host, port) (None - без ограничения)
+            ordered: True - ответы в порядке specs; False - пары (индекс, ответ) по мере готовности
+        
+        Returns:
+            Генератор ответов (Response или None при ошибке) либо пар (индекс, ответ)
+        """
+        if per_host is not None and per_host < 1:
+            raise ValueError('per_host должен быть не меньше 1')
+        
+        pending_specs = enumerate(specs)
+        # Сколько запросов может ожидать выдачи: в работе, отложенные и готовые
+        window = max_workers * 4
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        running: Dict[Any, Tuple[int, Tuple[str, int]]] = {}
+        deferred: Dict[Tuple[str, int], deque] = {}
+        active: Dict[Tuple[str, int], int] = {}
+        results: Dict[int, Any] = {}
+        deferred_count = 0
+        next_index = 0
+        exhausted = False
+        
+        def submit(index: int, key: Tuple[str, int], request: Tuple[str, str, Dict[str, Any]]) -> None:
+            active[key] = active.get(key, 0) + 1
+            running[executor.submit(self._batch_request, *request)] = (index, key)
+        
+        try:
+            while True:
+                while not exhausted and len(running) + deferred_count + len(results) < window:
+                    try:
+                        index, spec = next(pending_specs)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    request = _batch_request_spec(spec)
+                    parsed = urlparse(request[1])
+                    key = (parsed.hostname or '', parsed.port or (443 if parsed.scheme == 'https' else 80))
+                    if per_host is not None and active.get(key, 0) >= per_host:
+                        deferred.setdefault(key, deque()).append((index, request))
+                        deferred_count += 1
+                    else:
+                        submit(index, key, request)
                 
-                def json(self):
-                    import json
-                    return json.loads(self.text)
+                if not running:
+                    break
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, key = running.pop(future)
+                    active[key] -= 1
+                    queue = deferred.get(key)
+                    if queue:
+                        # Освободилось место для хоста - запускаем отложенный запрос
+                        deferred_index, request = queue.popleft()
+                        deferred_count -= 1
+                        submit(deferred_index, key, request)
+                    if ordered:
+                        results[index] = future.result()
+                    else:
+                        yield index, future.result()
+                
+                while next_index in results:
+                    yield results.pop(next_index)
+                    next_index += 1
+        finally:
+            for future in running:
+                future.cancel()
+            executor.shutdown(wait=True)
+    
+    def fetch_all(self, specs: Iterable[Any], max_workers: int = 10,
+                  per_host: Optional[int] = None) -> List[Optional[Response]]:
+        """
+        Выполняет пакет запросов параллельно и возвращает ответы в порядке specs
+        
+        Аргументы такие же, как у map().
+        """
+        return list(self.map(specs, max_workers=max_workers, per_host=per_host))
+    
+    def download(self, url: str, path: str, parts: int = 4, headers: Optional[Dict[str, str]] = None,
+                 retries: int = 3) -> Optional[Dict[str, Any]]:
+        """
+        Загружает файл параллельными диапазонами (HTTP Range) по нескольким соединениям
+        
+        Части записываются сразу по своему смещению в заранее выделенный файл.
+        Если сервер не поддерживает диапазоны, файл загружается одним запросом.
+        После ошибки повторный вызов докачивает только недостающие части
+        (прогресс хранится в ``<path>.gostdownload``). Для полного использования
+        частей pool_maxsize клиента должен быть не меньше parts; с http2=True
+        части идут потоками одного соединения.
+        
+        Args:
+            url: URL файла
+            path: Путь к файлу результата
+            parts: Сколько диапазонов загружать одновременно
+            headers: Дополнительные заголовки запросов
+            retries: Сколько раз продолжать часть после обрыва
+        
+        Returns:
+            Словарь с 'path', 'size', 'parts', 'resumed', 'downloaded', 'ranges'
+            и 'elapsed' (см. RangeDownloader.run) или None при ошибке
+        
+        Example:
+            >>> client = GOSTHTTPClient(pool_maxsize=8)
+            >>> client.download('https://dss.uc-em.ru/dump.xml.gz', 'dump.xml.gz', parts=8)
+        """
+        try:
+            return RangeDownloader(self, url, path, parts, headers, retries).run()
+        except Exception:
+            return None
+    
+    def prewarm(self, hosts: Iterable[str], connections_per_host: int = 1,
+                keep_warm: float = 0.0, max_workers: int = 10) -> Dict[str, Dict[str, Any]]:
+        """
+        Заранее открывает соединения с хостами
+        
+        Для каждого хоста определяет рабочий уровень (handshake через
+        GOSTAdapter, затем через прямой pyOpenSSL), запоминает его в кеше
+        маршрутизации и оставляет ``connections_per_host`` готовых соединений в
+        пуле этого уровня. Первые запросы после запуска приложения не тратят
+        время на GOST handshake и перебор уровней. Уровень curl заранее не
+        прогревается.
+        
+        Args:
+            hosts: Хосты: 'host', 'host:port' или URL ('https://host:port/...')
+            connections_per_host: Сколько соединений держать готовыми
+                (не больше pool_maxsize)
+            keep_warm: Интервал в секундах, с которым фоновый поток повторяет
+                прогрев и заменяет закрытые сервером соединения
+                (0 - только однократный прогрев)
+            max_workers: Сколько хостов прогревается одновременно
+        
+        Returns:
+            Словарь 'host:port' -> {'tier': уровень или None, 'connections': готовых соединений}
+        
+        Example:
+            >>> client = GOSTHTTPClient(pool_maxsize=8)
+            >>> client.prewarm(['dss.uc-em.ru'], connections_per_host=4, keep_warm=30)
+        """
+        urls = [host if '://' in host else f'https://{host}' for host in hosts]
+        results: Dict[str, Dict[str, Any]] = {}
+        if urls:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls)))) as executor:
+                for name, result in executor.map(
+                        lambda url: self._prewarm_host(url, connections_per_host), urls):
+                    results[name] = result
+        
+        if keep_warm > 0:
+            self.stop_keep_warm()
+            stop = threading.Event()
             
-            return MockResponse(result['content'], result['status_code'], result['text'])
+            def keep_warm_loop():
+                while not stop.wait(keep_warm):
+                    try:
+                        self.prewarm(urls, connections_per_host, max_workers=max_workers)
+                    except Exception:
+                        pass
+            
+            thread = threading.Thread(target=keep_warm_loop, name='gost-keep-warm', daemon=True)
+            self._keep_warm = (thread, stop)
+            thread.start()
+        return results
+    
+    def stop_keep_warm(self) -> None:
+        """Останавливает фоновый поток, запущенный prewarm(keep_warm=...)"""
+        keep_warm, self._keep_warm = self._keep_warm, None
+        if keep_warm is not None:
+            thread, stop = keep_warm
+            stop.set()
+            if thread is not threading.current_thread():
+                thread.join()
+    
+    def _prewarm_host(self, url: str, count: int) -> Tuple[str, Dict[str, Any]]:
+        """Прогревает один хост, возвращает ('host:port', результат)"""
+        parsed = urlparse(url)
+        scheme = parsed.scheme or 'https'
+        port = parsed.port or (443 if scheme == 'https' else 80)
+        key = (parsed.hostname or '', port)
+        base_url = f'{scheme}://{parsed.netloc}/'
+        timeout = _total_timeout(self.timeout)
+        
+        # Уровни, соединения которых можно открыть заранее; известный рабочий уровень - первым
+        tiers = [tier for tier in self._tier_chain('GET', base_url) if tier != TIER_CURL]
+        known = self.routes.route(key) if self.routes else None
+        if known in tiers:
+            tiers.remove(known)
+            tiers.insert(0, known)
+        
+        for tier in tiers:
+            started = time.monotonic()
+            try:
+                if tier == TIER_SESSION:
+                    ready = _prewarm_adapter(self.session.get_adapter(base_url), self.session,
+                                             base_url, count, self.verify, timeout)
+                else:
+                    ready = self.direct_pool.prewarm(key[0], key[1], count, timeout)
+            except Exception:
+                ready = 0
+            if ready is None:
+                # Уровень нельзя прогреть: он не проверялся и в маршрутизации не учитывается
+                continue
+            if ready:
+                if self.routes:
+                    self.routes.record_success(key, tier)
+                return f'{key[0]}:{key[1]}', {'tier': tier, 'connections': ready}
+            if self.routes:
+                self.routes.record_failure(key, tier, time.monotonic() - started)
+        return f'{key[0]}:{key[1]}', {'tier': None, 'connections': 0}
+    
+    def _send_via_curl(self, method: str, url: str, kwargs: Dict[str, Any]) -> Optional[Response]:
+        """Выполняет запрос через curl: отдельным процессом или в пакете CurlBatcher"""
+        headers = dict(kwargs.get('headers') or {})
+        body, content_type = encode_body(kwargs.get('data'), kwargs.get('json'))
+        if body is None and method in ('POST', 'PUT', 'PATCH'):
+            body = b''
+        if content_type and not any(name.lower() == 'content-type' for name in headers):
+            headers['Content-Type'] = content_type
+        if kwargs.get('params'):
+            parsed = urlparse(url)
+            url = f"{parsed.scheme}://{parsed.netloc}{_request_target(parsed, kwargs['params'])}"
+        
+        stream = kwargs.get('stream', False)
+        # Потоковое тело отправляется отдельным процессом, без копии во временный файл
+        result = None
+        batched = self.curl_batcher is not None and not stream and not is_stream_body(body)
+        if batched:
+            try:
+                result = self.curl_batcher.submit(method, url, headers, body)
+                # Фазы передачи по данным curl --write-out
+                for phase, seconds in (result or {}).get('timings', {}).items():
+                    metrics.record(phase, seconds)
+            except CurlBatchError:
+                # Пакет не выполнен (старый curl, сбой процесса) - отдельный процесс curl
+                batched = False
+        if not batched:
+            result = _request_via_curl(method, url, headers, body, self.timeout, stream)
+        
+        if result:
+            return GOSTResponse(
+                result['status_code'],
+                _response_headers(result['headers']),
+                content=result.get('content'),
+                raw=result.get('raw'),
+                url=url,
+                reason=result['reason'],
+                tier=TIER_CURL
+            )
         return None
 
 
+# Общие клиенты для функций gost_get/gost_post/...: один клиент (и один пул
+# соединений) на каждую пару (verify, timeout)
+_default_clients: Dict[Tuple[Any, Any], GOSTHTTPClient] = {}
+_default_client_options: Dict[str, Any] = {}
+_default_clients_lock = threading.Lock()
+# Количество выполняющихся вызовов gost_get/gost_post/... для каждого клиента
+_default_client_users: Dict[GOSTHTTPClient, int] = {}
+# Клиенты, замененные configure_default_client и ожидающие завершения вызовов
+_retired_default_clients: set = set()
+
+
+def _default_client_locked(verify: bool, timeout: int) -> GOSTHTTPClient:
+    """Общий клиент для (verify, timeout); вызывается под _default_clients_lock"""
+    key = (verify, timeout)
+    client = _default_clients.get(key)
+    if client is None:
+        client = GOSTHTTPClient(verify=verify, timeout=timeout, **_default_client_options)
+        _default_clients[key] = client
+    return client
+
+
+def get_default_client(verify: bool = False, timeout: int = 10) -> GOSTHTTPClient:
+    """
+    Возвращает общий клиент процесса для заданных verify и timeout
+    
+    Клиент создается при первом обращении и переиспользуется всеми вызовами
+    gost_get/gost_post/..., поэтому соединения к хосту остаются открытыми
+    между вызовами (keep-alive) и GOST handshake не повторяется.
+    
+    Args:
+        verify: Проверять ли SSL сертификаты
+        timeout: Таймаут в секундах (число или кортеж (connect, read))
+    
+    Returns:
+        GOSTHTTPClient объект (закрывается configure_default_client, поэтому
+        после смены параметров клиент нужно получить заново)
+    """
+    client = _default_clients.get((verify, timeout))
+    if client is None:
+        with _default_clients_lock:
+            client = _default_client_locked(verify, timeout)
+    return client
+
+
+@contextmanager
+def _using_default_client(verify: bool, timeout: int) -> Iterator[GOSTHTTPClient]:
+    """
+    Общий клиент на время вызова gost_get/gost_post/...
+    
+    Клиент, замененный configure_default_client во время вызова, закрывается
+    после завершения последнего вызова, который его использует.
+    """
+    with _default_clients_lock:
+        client = _default_client_locked(verify, timeout)
+        _default_client_users[client] = _default_client_users.get(client, 0) + 1
+    try:
+        yield client
+    finally:
+        with _default_clients_lock:
+            users = _default_client_users.pop(client) - 1
+            if users:
+                _default_client_users[client] = users
+            retired = not users and client in _retired_default_clients
+            if retired:
+                _retired_default_clients.discard(client)
+        if retired:
+            client.close()
+
+
+def configure_default_client(**options) -> None:
+    """
+    Задает параметры общих клиентов
+    
+    Следующие вызовы get_default_client (и gost_get/gost_post/...) создают
+    новые клиенты с этими параметрами. Прежние клиенты закрываются (пулы
+    соединений, поток keep_warm, потоки хеджирования): свободные - сразу,
+    а используемые выполняющимися вызовами gost_get/gost_post/... - после
+    завершения последнего такого вызова.
+    
+    Args:
+        **options: Аргументы GOSTHTTPClient кроме verify и timeout
+            (например, pool_maxsize или route_ttl). Вызов без аргументов
+            сбрасывает параметры по умолчанию.
+    
+    Example:
+        >>> configure_default_client(pool_maxsize=32)
+        >>> response = gost_get('https://dss.uc-em.ru/')
+    """
+    global _default_clients, _default_client_options
+    with _default_clients_lock:
+        previous = list(_default_clients.values())
+        # Словари заменяются целиком: get_default_client без блокировки читает
+        # либо старый, либо новый словарь
+        _default_client_options = dict(options)
+        _default_clients = {}
+        idle = [client for client in previous if client not in _default_client_users]
+        _retired_default_clients.update(client for client in previous if client in _default_client_users)
+    for client in idle:
+        client.close()
+
+
 def gost_get(url: str, verify: bool = False, timeout: int = 10, **kwargs) -> Optional[Response]:
     """GET запрос с поддержкой GOST"""
-    client = GOSTHTTPClient(verify=verify, timeout=timeout)
-    return client.get(url, **kwargs)
+    with _using_default_client(verify, timeout) as client:
+        return client.get(url, **kwargs)
 
 def gost_post(url: str, verify: bool = False, timeout: int = 10, **kwargs) -> Optional[Response]:
     """POST запрос с поддержкой GOST"""
-    client = GOSTHTTPClient(verify=verify, timeout=timeout)
-    return client.post(url, **kwargs)
+    with _using_default_client(verify, timeout) as client:
+        return client.post(url, **kwargs)
 
 def gost_put(url: str, verify: bool = False, timeout: int = 10, **kwargs) -> Optional[Response]:
     """PUT запрос с поддержкой GOST"""
-    client = GOSTHTTPClient(verify=verify, timeout=timeout)
-    return client.put(url, **kwargs)
+    with _using_default_client(verify, timeout) as client:
+        return client.put(url, **kwargs)
 
 def gost_delete(url: str, verify: bool = False, timeout: int = 10, **kwargs) -> Optional[Response]:
     """DELETE запрос с поддержкой GOST"""
-    client = GOSTHTTPClient(verify=verify, timeout=timeout)
-    return client.delete(url, **kwargs)
+    with _using_default_client(verify, timeout) as client:
+        return client.delete(url, **kwargs)
 
 def gost_patch(url: str, verify: bool = False, timeout: int = 10, **kwargs) -> Optional[Response]:
     """PATCH запрос с поддержкой GOST"""
-    client = GOSTHTTPClient(verify=verify, timeout=timeout)
-    return client.patch(url, **kwargs)
+    with _using_default_client(verify, timeout) as client:
+        return client.patch(url, **kwargs)
 
 def gost_head(url: str, verify: bool = False, timeout: int = 10, **kwargs) -> Optional[Response]:
     """HEAD запрос с поддержкой GOST"""
-    client = GOSTHTTPClient(verify=verify, timeout=timeout)
-    return client.head(url, **kwargs)
+    with _using_default_client(verify, timeout) as client:
+        return client.head(url, **kwargs)
 
 def gost_options(url: str, verify: bool = False, timeout: int = 10, **kwargs) -> Optional[Response]:
     """OPTIONS запрос с поддержкой GOST"""
-    client = GOSTHTTPClient(verify=verify, timeout=timeout)
-    return client.options(url, **kwargs)
+    with _using_default_client(verify, timeout) as client:
+        return client.options(url, **kwargs)
 
 def gost_session(verify: bool = False, timeout: int = 10) -> GOSTHTTPClient:
     """
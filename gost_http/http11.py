@@ -0,0 +1,312 @@
+"""
+http11 - инкрементальный парсер ответов HTTP/1.1
+
+Парсер не выполняет ввод-вывод: байты из сокета передаются через feed(),
+а события (заголовок ответа, фрагменты тела, конец сообщения) извлекаются
+через next_event(). Это позволяет использовать один и тот же парсер для
+синхронного pyOpenSSL транспорта и для других транспортов.
+
+Пример:
+    parser = HTTP11ResponseParser('GET')
+    parser.feed(data)
+    while True:
+        event = parser.next_event()
+        if event is NEED_DATA:
+            break  # нужно прочитать еще данные из сокета
+        ...
+"""
+
+from typing import List, Optional, Tuple
+
+# Максимальный размер блока заголовков ответа
+MAX_HEAD_SIZE = 64 * 1024
+
+
+class HTTPParseError(ValueError):
+    """Некорректный или оборванный HTTP ответ"""
+
+
+class _Sentinel:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+# Парсеру нужны дополнительные данные из сокета
+NEED_DATA = _Sentinel('NEED_DATA')
+# Ответ полностью разобран
+END_OF_MESSAGE = _Sentinel('END_OF_MESSAGE')
+
+
+class ResponseHead:
+    """Стартовая строка и заголовки HTTP ответа"""
+
+    def __init__(self, version: str, status_code: int, reason: str, headers: List[Tuple[str, str]]):
+        self.version = version
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Возвращает значение заголовка (без учета регистра); повторы объединяются через ', '"""
+        name = name.lower()
+        values = [value for key, value in self.headers if key.lower() == name]
+        if not values:
+            return default
+        return ', '.join(values)
+
+    def __repr__(self) -> str:
+        return f'<ResponseHead {self.version} {self.status_code} {self.reason}>'
+
+
+class HTTP11ResponseParser:
+    """
+    Инкрементальный парсер одного HTTP/1.1 ответа
+
+    Поддерживает Content-Length, chunked transfer encoding, тело до закрытия
+    соединения, промежуточные ответы 1xx и ответы без тела (HEAD, 204, 304).
+
+    События next_event():
+        NEED_DATA - нужно передать еще данные через feed() или feed_eof()
+        ResponseHead - разобраны стартовая строка и заголовки
+        bytes - очередной фрагмент тела
+        END_OF_MESSAGE - ответ завершен
+    """
+
+    def __init__(self, method: str = 'GET'):
+        """
+        Args:
+            method: Метод запроса (для HEAD ответ не содержит тела)
+        """
+        self.method = method.upper()
+        self.head: Optional[ResponseHead] = None
+        self._buf = bytearray()
+        self._eof = False
+        self._state = 'head'
+        self._remaining = 0
+        self._scan_from = 0
+        self._close_delimited = False
+
+    @property
+    def complete(self) -> bool:
+        """Ответ разобран полностью"""
+        return self._state == 'done'
+
+    @property
+    def keep_alive(self) -> bool:
+        """Соединение можно переиспользовать после завершения ответа"""
+        if self.head is None or self._state != 'done' or self._buf or self._close_delimited:
+            return False
+        connection = (self.head.get('connection') or '').lower()
+        if self.head.version == 'HTTP/1.0':
+            return 'keep-alive' in connection
+        return 'close' not in connection
+
+    @property
+    def received_any(self) -> bool:
+        """Получен хотя бы один байт ответа"""
+        return bool(self._buf) or self.head is not None or self._state != 'head'
+
+    def feed(self, data) -> None:
+        """Передает парсеру очередную порцию байтов из соединения"""
+        if data:
+            self._buf += data
+
+    def feed_eof(self) -> None:
+        """Сообщает парсеру, что соединение закрыто"""
+        self._eof = True
+
+    def next_event(self):
+        """Возвращает следующее событие разбора (см. описание класса)"""
+        if self._state == 'head':
+            return self._parse_head()
+        if self._state == 'length':
+            return self._parse_length_body()
+        if self._state == 'chunk_size':
+            return self._parse_chunk_size()
+        if self._state == 'chunk_data':
+            return self._parse_chunk_data()
+        if self._state == 'chunk_crlf':
+            return self._parse_chunk_crlf()
+        if self._state == 'trailers':
+            return self._parse_trailers()
+        if self._state == 'close':
+            return self._parse_close_body()
+        return END_OF_MESSAGE
+
+    def _finish(self):
+        self._state = 'done'
+        return END_OF_MESSAGE
+
+    def _need_data(self):
+        if self._eof:
+            raise HTTPParseError('Соединение закрыто до завершения ответа')
+        return NEED_DATA
+
+    def _find_line_end(self, start: int = 0) -> int:
+        return self._buf.find(b'\n', start)
+
+    def _parse_head(self):
+        # Ищем конец блока заголовков, не сканируя уже просмотренные байты повторно
+        end = -1
+        pos = self._scan_from
+        while True:
+            nl = self._buf.find(b'\n', pos)
+            if nl < 0:
+                break
+            # Пустая строка: '\n\n' или '\n\r\n'
+            if self._buf[nl + 1:nl + 2] == b'\n':
+                end = nl + 2
+                break
+            if self._buf[nl + 1:nl + 3] == b'\r\n':
+                end = nl + 3
+                break
+            if nl + 2 >= len(self._buf):
+                break
+            pos = nl + 1
+
+        if end < 0:
+            self._scan_from = max(0, len(self._buf) - 3)
+            if len(self._buf) > MAX_HEAD_SIZE:
+                raise HTTPParseError('Слишком большой блок заголовков ответа')
+            return self._need_data()
+
+        block = bytes(self._buf[:end])
+        del self._buf[:end]
+        self._scan_from = 0
+
+        lines = block.decode('latin-1').split('\n')
+        status_line = lines[0].rstrip('\r')
+        parts = status_line.split(' ', 2)
+        if len(parts) < 2 or not parts[0].startswith('HTTP/'):
+            raise HTTPParseError(f'Некорректная стартовая строка: {status_line!r}')
+        try:
+            status_code = int(parts[1])
+        except ValueError:
+            raise HTTPParseError(f'Некорректный статус: {status_line!r}')
+        reason = parts[2] if len(parts) > 2 else ''
+
+        headers: List[Tuple[str, str]] = []
+        for line in lines[1:]:
+            line = line.rstrip('\r')
+            if not line:
+                continue
+            if line[0] in ' \t' and headers:
+                # Устаревший перенос значения заголовка на следующую строку
+                name, value = headers[-1]
+                headers[-1] = (name, value + ' ' + line.strip())
+                continue
+            name, sep, value = line.partition(':')
+            if not sep:
+                raise HTTPParseError(f'Некорректный заголовок: {line!r}')
+            headers.append((name.strip(), value.strip()))
+
+        head = ResponseHead(parts[0], status_code, reason, headers)
+
+        # Промежуточные ответы 1xx пропускаем (кроме 101 Switching Protocols)
+        if 100 <= status_code < 200 and status_code != 101:
+            return self._parse_head()
+
+        self.head = head
+        self._select_body_mode(head)
+        return head
+
+    def _select_body_mode(self, head: ResponseHead) -> None:
+        status_code = head.status_code
+        if self.method == 'HEAD' or status_code in (204, 304) or 100 <= status_code < 200:
+            self._state = 'done'
+            return
+
+        transfer_encoding = (head.get('transfer-encoding') or '').lower()
+        if 'chunked' in transfer_encoding:
+            self._state = 'chunk_size'
+            return
+
+        content_length = head.get('content-length')
+        if content_length is not None:
+            try:
+                # Повторяющиеся одинаковые значения допустимы (RFC 9112, 6.3)
+                values = {int(v.strip()) for v in content_length.split(',')}
+            except ValueError:
+                raise HTTPParseError(f'Некорректный Content-Length: {content_length!r}')
+            if len(values) != 1 or min(values) < 0:
+                raise HTTPParseError(f'Некорректный Content-Length: {content_length!r}')
+            self._remaining = values.pop()
+            self._state = 'length' if self._remaining else 'done'
+            return
+
+        # Тело до закрытия соединения
+        self._close_delimited = True
+        self._state = 'close'
+
+    def _parse_length_body(self):
+        if self._remaining == 0:
+            return self._finish()
+        if not self._buf:
+            return self._need_data()
+        size = min(self._remaining, len(self._buf))
+        data = bytes(self._buf[:size])
+        del self._buf[:size]
+        self._remaining -= size
+        if self._remaining == 0:
+            self._state = 'done'
+        return data
+
+    def _parse_chunk_size(self):
+        nl = self._find_line_end()
+        if nl < 0:
+            if len(self._buf) > MAX_HEAD_SIZE:
+                raise HTTPParseError('Слишком длинная строка размера chunk')
+            return self._need_data()
+        line = bytes(self._buf[:nl]).split(b';', 1)[0].strip()
+        del self._buf[:nl + 1]
+        try:
+            size = int(line, 16)
+        except ValueError:
+            raise HTTPParseError(f'Некорректный размер chunk: {line!r}')
+        if size == 0:
+            self._state = 'trailers'
+            return self._parse_trailers()
+        self._remaining = size
+        self._state = 'chunk_data'
+        return self._parse_chunk_data()
+
+    def _parse_chunk_data(self):
+        if not self._buf:
+            return self._need_data()
+        size = min(self._remaining, len(self._buf))
+        data = bytes(self._buf[:size])
+        del self._buf[:size]
+        self._remaining -= size
+        if self._remaining == 0:
+            self._state = 'chunk_crlf'
+        return data
+
+    def _parse_chunk_crlf(self):
+        nl = self._find_line_end()
+        if nl < 0:
+            return self._need_data()
+        del self._buf[:nl + 1]
+        self._state = 'chunk_size'
+        return self._parse_chunk_size()
+
+    def _parse_trailers(self):
+        while True:
+            nl = self._find_line_end()
+            if nl < 0:
+                return self._need_data()
+            line = bytes(self._buf[:nl]).strip()
+            del self._buf[:nl + 1]
+            if not line:
+                return self._finish()
+
+    def _parse_close_body(self):
+        if self._buf:
+            data = bytes(self._buf)
+            self._buf.clear()
+            return data
+        if self._eof:
+            return self._finish()
+        return NEED_DATA
@@ -0,0 +1,420 @@
+"""
+http2 - HTTP/2 поверх GOST TLS соединения (ALPN h2)
+
+Используется пулом DirectTLSPool, когда сервер согласовал протокол ``h2`` в
+ALPN. Одно TLS соединение обслуживает запросы всех потоков параллельно
+(мультиплексирование потоков HTTP/2), поэтому дорогой GOST handshake
+выполняется один раз на хост. Фоновых потоков нет: данные из сокета читает
+тот поток, который первым начал ждать ответ, и раздает события остальным.
+
+Требует пакет ``h2`` (pip install h2); без него клиент предлагает в ALPN
+только HTTP/1.1.
+"""
+
+import threading
+import time
+from http.client import responses
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .body import iter_body
+from .compression import ACCEPT_ENCODING
+from .http11 import ResponseHead
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+    import h2.exceptions
+    import h2.settings
+    from h2.errors import ErrorCodes
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
+try:
+    from OpenSSL import SSL
+    from urllib3.util import wait_for_read
+except ImportError:
+    SSL = None
+
+# Протоколы ALPN: HTTP/2, если сервер поддерживает, иначе HTTP/1.1
+ALPN_H2 = b'h2'
+ALPN_PROTOCOLS = [b'h2', b'http/1.1']
+
+# Окна приема: соединение и каждый поток
+CONNECTION_WINDOW_SIZE = 16 * 1024 * 1024
+STREAM_WINDOW_SIZE = 1024 * 1024
+
+# Заголовки HTTP/1.1, запрещенные в HTTP/2 (RFC 9113, раздел 8.2.2)
+_CONNECTION_HEADERS = {'connection', 'keep-alive', 'proxy-connection', 'transfer-encoding', 'upgrade', 'host'}
+
+
+class HTTP2StreamError(ConnectionError):
+    """
+    Ошибка потока HTTP/2
+
+    Attributes:
+        retryable: Сервер гарантированно не обработал запрос (поток отклонен,
+            не вошел в GOAWAY или соединение закрылось до ответа) - запрос
+            можно повторить на новом соединении
+    """
+
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def build_h2_headers(method: str, host: str, port: int, target: str,
+                     headers: Optional[Iterable[Tuple[str, str]]] = None) -> List[Tuple[bytes, bytes]]:
+    """Формирует псевдозаголовки и заголовки HTTP/2 запроса"""
+    authority = host if port == 443 else f'{host}:{port}'
+    result = [(b':method', method.encode('ascii')), (b':scheme', b'https'),
+              (b':authority', authority.encode('idna')), (b':path', target.encode('latin-1'))]
+    names = set()
+    for name, value in headers or ():
+        name = name.lower()
+        if name in _CONNECTION_HEADERS:
+            continue
+        names.add(name)
+        result.append((name.encode('latin-1'), str(value).encode('latin-1')))
+    if 'accept' not in names:
+        result.append((b'accept', b'*/*'))
+    if 'accept-encoding' not in names:
+        result.append((b'accept-encoding', ACCEPT_ENCODING.encode('ascii')))
+    return result
+
+
+class _H2Stream:
+    """Состояние одного потока HTTP/2"""
+
+    def __init__(self, stream_id: int):
+        self.stream_id = stream_id
+        self.head: Optional[ResponseHead] = None
+        # Принятые фрагменты тела: (данные, размер для управления потоком)
+        self.chunks: List[Tuple[bytes, int]] = []
+        self.ended = False
+        self.error: Optional[HTTP2StreamError] = None
+
+
+class HTTP2Connection:
+    """
+    Клиентское HTTP/2 соединение поверх DirectConnection
+
+    Потокобезопасно: request() можно вызывать из нескольких потоков, запросы
+    идут параллельными потоками HTTP/2 одного TLS соединения. Количество
+    одновременных потоков ограничено SETTINGS_MAX_CONCURRENT_STREAMS сервера.
+    """
+
+    def __init__(self, conn):
+        """
+        Args:
+            conn: DirectConnection, для которого в ALPN согласован h2
+        """
+        self.conn = conn
+        self.host = conn.host
+        self.port = conn.port
+        self.created = conn.created
+        self.last_used = time.monotonic()
+        self.requests = 0
+        # Новые потоки не открываются (GOAWAY или ошибка соединения)
+        self.closed = False
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._reading = False
+        self._streams: Dict[int, _H2Stream] = {}
+        self._h2 = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=True, header_encoding=None)
+        )
+        with self._lock:
+            self._h2.initiate_connection()
+            self._h2.update_settings({
+                h2.settings.SettingCodes.ENABLE_PUSH: 0,
+                h2.settings.SettingCodes.INITIAL_WINDOW_SIZE: STREAM_WINDOW_SIZE,
+            })
+            self._h2.increment_flow_control_window(CONNECTION_WINDOW_SIZE - self._h2.inbound_flow_control_window)
+            self._flush()
+
+    @property
+    def active_streams(self) -> int:
+        """Количество незавершенных потоков"""
+        return len(self._streams)
+
+    def has_capacity(self) -> bool:
+        """Можно ли открыть еще один поток без ожидания"""
+        return not self.closed and self._h2.open_outbound_streams < self._h2.remote_settings.max_concurrent_streams
+
+    def request(self, method: str, target: str, headers: Optional[Iterable[Tuple[str, str]]] = None,
+                body: Any = None, timeout: float = 10) -> Tuple[ResponseHead, 'HTTP2BodyReader']:
+        """
+        Отправляет запрос новым потоком и ждет заголовки ответа
+
+        Тело (bytes, буфер, файловый объект или итератор) отправляется
+        фрагментами; пока фрагмент читается из источника, соединение свободно
+        для других потоков.
+
+        Returns:
+            Кортеж (заголовки ответа, читатель тела)
+
+        Raises:
+            HTTP2StreamError: поток сброшен или соединение закрыто
+            TimeoutError: ответ не получен за timeout
+        """
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while not self.closed and not self.has_capacity():
+                self._pump(deadline)
+            if self.closed:
+                raise HTTP2StreamError('HTTP/2 соединение закрыто', retryable=True)
+            stream_id = self._h2.get_next_available_stream_id()
+            stream = self._streams[stream_id] = _H2Stream(stream_id)
+            self.requests += 1
+            self.last_used = time.monotonic()
+            try:
+                self._h2.send_headers(stream_id, build_h2_headers(method, self.host, self.port, target, headers),
+                                      end_stream=body is None)
+                self._flush()
+            except (OSError, SSL.Error, h2.exceptions.ProtocolError) as e:
+                self._fail(HTTP2StreamError(f'Ошибка HTTP/2 соединения: {e}', retryable=True))
+
+        try:
+            if body is not None and stream.error is None:
+                self._send_body(stream, body, deadline)
+            with self._lock:
+                while stream.head is None and stream.error is None:
+                    self._pump(deadline)
+        except (OSError, SSL.Error, h2.exceptions.ProtocolError) as e:
+            with self._lock:
+                self._fail(HTTP2StreamError(f'Ошибка HTTP/2 соединения: {e}', retryable=True))
+        except BaseException:
+            # Таймаут или ошибка источника тела: поток больше не нужен
+            with self._lock:
+                self._cancel(stream)
+            raise
+        if stream.head is None:
+            with self._lock:
+                self._streams.pop(stream_id, None)
+            raise stream.error
+        return stream.head, HTTP2BodyReader(self, stream, timeout)
+
+    def _send_body(self, stream: _H2Stream, body: Any, deadline: float) -> None:
+        """Отправляет тело запроса с учетом окна управления потоком сервера"""
+        for chunk in iter_body(body):
+            view = memoryview(chunk).cast('B')
+            with self._lock:
+                while view:
+                    if stream.error is not None or stream.ended:
+                        break
+                    window = min(self._h2.local_flow_control_window(stream.stream_id),
+                                 self._h2.max_outbound_frame_size)
+                    if window <= 0:
+                        # Ждем WINDOW_UPDATE от сервера
+                        self._pump(deadline)
+                        continue
+                    self._h2.send_data(stream.stream_id, view[:window].tobytes())
+                    view = view[window:]
+                    self._flush()
+            if stream.error is not None or stream.ended:
+                break
+        with self._lock:
+            if stream.error is not None:
+                return
+            try:
+                if stream.ended:
+                    # Сервер ответил, не дочитав тело: остаток не отправляется
+                    self._h2.reset_stream(stream.stream_id, ErrorCodes.NO_ERROR)
+                else:
+                    self._h2.end_stream(stream.stream_id)
+                self._flush()
+            except h2.exceptions.StreamClosedError:
+                pass
+
+    def _flush(self) -> None:
+        """Отправляет накопленные кадры (вызывается под блокировкой)"""
+        data = self._h2.data_to_send()
+        if data:
+            self.conn.sendall(data)
+
+    def _pump(self, deadline: float) -> None:
+        """
+        Обрабатывает очередную порцию данных соединения (вызывается под блокировкой)
+
+        Если данные уже читает другой поток, ждет его событий. Сокет ожидается
+        без блокировки, чтобы остальные потоки могли отправлять запросы.
+        """
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError('Таймаут ожидания ответа HTTP/2')
+        if self._reading:
+            self._changed.wait(remaining)
+            return
+
+        self._reading = True
+        try:
+            ssl_sock = self.conn.ssl_sock
+            if not ssl_sock.pending():
+                self._lock.release()
+                try:
+                    ready = wait_for_read(ssl_sock, remaining)
+                finally:
+                    self._lock.acquire()
+                if not ready:
+                    return
+            try:
+                received = ssl_sock.recv_into(self.conn._buffer)
+            except (SSL.WantReadError, SSL.WantWriteError):
+                # Запись TLS получена не полностью
+                return
+            except (SSL.ZeroReturnError, SSL.SysCallError):
+                received = 0
+            if not received:
+                self._fail(HTTP2StreamError('Сервер закрыл HTTP/2 соединение', retryable=True))
+                return
+            self._handle(self._h2.receive_data(self.conn._buffer[:received].tobytes()))
+            self._flush()
+        finally:
+            self._reading = False
+            self._changed.notify_all()
+
+    def _handle(self, events) -> None:
+        for event in events:
+            stream = self._streams.get(getattr(event, 'stream_id', None))
+            if isinstance(event, h2.events.ResponseReceived) and stream is not None:
+                stream.head = _response_head(event.headers)
+            elif isinstance(event, h2.events.DataReceived) and stream is not None:
+                stream.chunks.append((event.data, event.flow_controlled_length))
+            elif isinstance(event, h2.events.StreamEnded) and stream is not None:
+                stream.ended = True
+            elif isinstance(event, h2.events.StreamReset) and stream is not None:
+                stream.error = HTTP2StreamError(
+                    f'Сервер сбросил поток HTTP/2 (код {event.error_code})',
+                    retryable=event.error_code == ErrorCodes.REFUSED_STREAM
+                )
+            elif isinstance(event, h2.events.ConnectionTerminated):
+                self.closed = True
+                last_stream_id = event.last_stream_id or 0
+                for stream in self._streams.values():
+                    # Потоки после last_stream_id сервер не обрабатывал
+                    if stream.stream_id > last_stream_id or event.error_code:
+                        stream.error = stream.error or HTTP2StreamError(
+                            f'Сервер закрыл HTTP/2 соединение (GOAWAY, код {event.error_code})',
+                            retryable=stream.stream_id > last_stream_id
+                        )
+
+    def _fail(self, error: HTTP2StreamError) -> None:
+        """Закрывает соединение и завершает ошибкой все незавершенные потоки"""
+        self.closed = True
+        for stream in self._streams.values():
+            if not stream.ended and stream.error is None:
+                stream.error = HTTP2StreamError(str(error), retryable=error.retryable and stream.head is None)
+        self._changed.notify_all()
+
+    def _cancel(self, stream: _H2Stream) -> None:
+        """Сбрасывает поток, ответ которого больше не нужен (вызывается под блокировкой)"""
+        self._streams.pop(stream.stream_id, None)
+        if stream.ended or self.closed:
+            return
+        try:
+            self._h2.reset_stream(stream.stream_id, ErrorCodes.CANCEL)
+            self._flush()
+        except Exception:
+            pass
+
+    def _read_chunk(self, stream: _H2Stream, deadline: float) -> bytes:
+        """Возвращает очередной фрагмент тела потока; b'' - тело закончилось"""
+        with self._lock:
+            while not stream.chunks and not stream.ended and stream.error is None:
+                self._pump(deadline)
+            if stream.chunks:
+                data, length = stream.chunks.pop(0)
+                # Окно приема освобождается по мере чтения тела
+                if not self.closed and length:
+                    try:
+                        self._h2.acknowledge_received_data(length, stream.stream_id)
+                        self._flush()
+                    except Exception:
+                        pass
+                return data
+            self._streams.pop(stream.stream_id, None)
+            self.last_used = time.monotonic()
+            if stream.error is not None and not stream.ended:
+                raise stream.error
+            return b''
+
+    def is_dropped(self) -> bool:
+        return self.closed
+
+    def close(self) -> None:
+        """Отправляет GOAWAY и закрывает TLS соединение"""
+        with self._lock:
+            if not self.closed:
+                self.closed = True
+                try:
+                    self._h2.close_connection()
+                    self._flush()
+                except Exception:
+                    pass
+            self._fail(HTTP2StreamError('HTTP/2 соединение закрыто'))
+        self.conn.close()
+
+
+class HTTP2BodyReader:
+    """Потоковое чтение тела ответа HTTP/2 (интерфейс как у DirectBodyReader)"""
+
+    def __init__(self, connection: HTTP2Connection, stream: _H2Stream, timeout: float):
+        self._connection = connection
+        self._stream = stream
+        self._timeout = timeout
+        self._pending = b''
+        self.finished = False
+
+    def _next_chunk(self) -> bytes:
+        while not self.finished:
+            chunk = self._connection._read_chunk(self._stream, time.monotonic() + self._timeout)
+            if chunk:
+                return chunk
+            self.finished = True
+        return b''
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        """Читает до ``amt`` байтов тела (None - все оставшееся тело)"""
+        if amt is None:
+            chunks = [self._pending]
+            self._pending = b''
+            while True:
+                chunk = self._next_chunk()
+                if not chunk:
+                    return b''.join(chunks)
+                chunks.append(chunk)
+
+        data = self._pending or self._next_chunk()
+        if len(data) > amt:
+            self._pending = data[amt:]
+            return data[:amt]
+        self._pending = b''
+        return data
+
+    def readinto(self, buffer) -> int:
+        """Читает очередной фрагмент тела в буфер, возвращает количество байтов"""
+        view = memoryview(buffer).cast('B')
+        data = self.read(len(view))
+        view[:len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        """Прекращает чтение; недочитанный поток сбрасывается (соединение остается)"""
+        if not self.finished:
+            self.finished = True
+            with self._connection._lock:
+                self._connection._cancel(self._stream)
+
+
+def _response_head(headers: List[Tuple[bytes, bytes]]) -> ResponseHead:
+    """Заголовки ответа HTTP/2 в виде ResponseHead"""
+    status_code = 0
+    result = []
+    for name, value in headers:
+        if name == b':status':
+            status_code = int(value)
+        elif not name.startswith(b':'):
+            result.append((name.decode('latin-1'), value.decode('latin-1')))
+    return ResponseHead('HTTP/2', status_code, responses.get(status_code, ''), result)
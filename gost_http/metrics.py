@@ -0,0 +1,351 @@
+"""
+metrics - замеры времени запросов и экспорт метрик
+
+Каждый ответ GOSTHTTPClient несет RequestTiming (атрибут ``timing``): время
+DNS, TCP подключения, TLS handshake, ожидания первого байта (TTFB) и
+передачи тела, размер тела, уровень, через который получен ответ, и время,
+потраченное на уровни, завершившиеся ошибкой.
+
+Клиент начинает попытку каждого уровня контекстным менеджером tier_attempt(),
+а код подключения (connector, TLS handshake, пул прямых соединений, curl)
+записывает в нее фазы функцией record().
+
+Готовые замеры передаются в sink - любую функцию, принимающую RequestTiming
+(параметр ``metrics_sink`` у GOSTHTTPClient). Встроенные sink:
+- MetricsCollector - гистограммы по хосту и уровню в текстовом формате Prometheus;
+- StatsDSink - отправка замеров по UDP в формате StatsD (теги DogStatsD).
+"""
+
+import bisect
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Фазы запроса в порядке выполнения
+PHASES = ('dns', 'connect', 'tls', 'ttfb', 'transfer')
+
+# Границы корзин гистограмм в секундах (как у клиентских библиотек Prometheus)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_local = threading.local()
+
+
+class TierAttempt:
+    """Замеры одной попытки выполнить запрос через транспортный уровень"""
+
+    def __init__(self, tier: str):
+        self.tier = tier
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+        self.phases: Dict[str, float] = {}
+        self.error: Optional[str] = None
+        # True, если установление соединения не отделено от ttfb (curl без -w)
+        self.setup_in_ttfb = False
+
+
+@contextmanager
+def tier_attempt(tier: str) -> Iterator[TierAttempt]:
+    """Делает попытку уровня текущей для потока на время блока with"""
+    attempt = TierAttempt(tier)
+    previous = getattr(_local, 'attempt', None)
+    _local.attempt = attempt
+    try:
+        yield attempt
+    finally:
+        attempt.elapsed = time.perf_counter() - attempt.started
+        _local.attempt = previous
+
+
+def current_attempt() -> Optional[TierAttempt]:
+    """Возвращает попытку, выполняющуюся в текущем потоке, или None"""
+    return getattr(_local, 'attempt', None)
+
+
+def record(phase: str, seconds: float) -> None:
+    """Добавляет длительность фазы к текущей попытке (вне попытки ничего не делает)"""
+    attempt = getattr(_local, 'attempt', None)
+    if attempt is not None:
+        attempt.phases[phase] = attempt.phases.get(phase, 0.0) + seconds
+
+
+def record_error(error: BaseException) -> None:
+    """Запоминает первую ошибку текущей попытки"""
+    attempt = getattr(_local, 'attempt', None)
+    if attempt is not None and attempt.error is None:
+        attempt.error = f'{type(error).__name__}: {error}'
+
+
+class RequestTiming:
+    """
+    Замеры одного запроса GOSTHTTPClient
+
+    Фазы в секундах (None - фаза не выполнялась или неизвестна):
+        dns, connect, tls - установление соединения; None, если соединение
+            взято из пула
+        ttfb - от отправки запроса до заголовков ответа; для curl без пакетной
+            обработки включает запуск процесса и установление соединения
+        transfer - чтение тела; None в потоковом режиме
+
+    Attributes:
+        tier: Уровень, через который получен ответ (None - все уровни с ошибкой)
+        total: Полное время запроса, включая неудачные уровни
+        bytes: Размер тела ответа (None в потоковом режиме)
+        connection_reused: Взято ли соединение из пула (None - неизвестно)
+        failed_tiers: Неудачные попытки: словари 'tier', 'elapsed', 'error'
+        wasted: Время, потраченное на неудачные уровни
+    """
+
+    def __init__(self, method: str, url: str, host: str, port: int):
+        self.method = method
+        self.url = url
+        self.host = host
+        self.port = port
+        self.tier: Optional[str] = None
+        self.status_code: Optional[int] = None
+        self.dns: Optional[float] = None
+        self.connect: Optional[float] = None
+        self.tls: Optional[float] = None
+        self.ttfb: Optional[float] = None
+        self.transfer: Optional[float] = None
+        self.total = 0.0
+        self.bytes: Optional[int] = None
+        self.connection_reused: Optional[bool] = None
+        self.failed_tiers: List[Dict[str, Any]] = []
+        self.wasted = 0.0
+        self._started = time.perf_counter()
+
+    def add_failure(self, attempt: TierAttempt, error: Optional[str] = None) -> None:
+        """Учитывает попытку уровня, не давшую ответа"""
+        self.failed_tiers.append({
+            'tier': attempt.tier,
+            'elapsed': attempt.elapsed,
+            'error': error or attempt.error,
+        })
+        self.wasted += attempt.elapsed
+
+    def complete(self, attempt: Optional[TierAttempt] = None, response=None, stream: bool = False) -> None:
+        """Заполняет замеры по успешной попытке и ответу"""
+        self.total = time.perf_counter() - self._started
+        if attempt is None:
+            return
+        self.tier = attempt.tier
+        for phase in PHASES:
+            setattr(self, phase, attempt.phases.get(phase))
+        if not attempt.setup_in_ttfb:
+            self.connection_reused = 'connect' not in attempt.phases
+        if response is not None:
+            self.status_code = response.status_code
+            if not stream:
+                self.bytes = len(response.content)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Возвращает замеры словарем (для логов и JSON)"""
+        result = {name: getattr(self, name) for name in (
+            'method', 'url', 'host', 'port', 'tier', 'status_code', 'total', 'bytes', 'connection_reused', 'wasted'
+        )}
+        result.update({phase: getattr(self, phase) for phase in PHASES})
+        result['failed_tiers'] = list(self.failed_tiers)
+        return result
+
+    def __repr__(self) -> str:
+        phases = ' '.join(
+            f'{phase}={getattr(self, phase) * 1000:.1f}ms' for phase in PHASES if getattr(self, phase) is not None
+        )
+        return (f'<RequestTiming {self.method} {self.host}:{self.port} tier={self.tier} '
+                f'total={self.total * 1000:.1f}ms {phases} wasted={self.wasted * 1000:.1f}ms>')
+
+
+class Histogram:
+    """Гистограмма с фиксированными корзинами"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Возвращает пары (граница le, накопленное количество), включая +Inf"""
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append(('+Inf' if bound == float('inf') else repr(bound), total))
+        return result
+
+
+def _label_value(value: Any) -> str:
+    """Экранирует значение метки для текстового формата Prometheus"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels: Any) -> str:
+    return ','.join(f'{name}="{_label_value(value)}"' for name, value in labels.items())
+
+
+class MetricsCollector:
+    """
+    Sink, собирающий гистограммы и счетчики по хосту и уровню
+
+    Example:
+        >>> collector = MetricsCollector()
+        >>> client = GOSTHTTPClient(metrics_sink=collector)
+        >>> client.get('https://dss.uc-em.ru/')
+        >>> print(collector.prometheus_text())
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, namespace: str = 'gost_http'):
+        """
+        Args:
+            buckets: Границы корзин гистограмм в секундах
+            namespace: Префикс имен метрик
+        """
+        self.buckets = tuple(buckets)
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._durations: Dict[Tuple[str, str], Histogram] = {}
+        self._phases: Dict[Tuple[str, str, str], Histogram] = {}
+        self._requests: Dict[Tuple[str, str, str], int] = {}
+        self._failures: Dict[Tuple[str, str], int] = {}
+        self._wasted: Dict[str, float] = {}
+        self._bytes: Dict[Tuple[str, str], int] = {}
+
+    def __call__(self, timing: RequestTiming) -> None:
+        host = f'{timing.host}:{timing.port}'
+        tier = timing.tier or 'none'
+        with self._lock:
+            self._histogram(self._durations, (host, tier)).observe(timing.total)
+            for phase in PHASES:
+                value = getattr(timing, phase)
+                if value is not None:
+                    self._histogram(self._phases, (host, tier, phase)).observe(value)
+            status = str(timing.status_code) if timing.status_code is not None else 'error'
+            key = (host, tier, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            for failure in timing.failed_tiers:
+                key = (host, failure['tier'])
+                self._failures[key] = self._failures.get(key, 0) + 1
+            if timing.wasted:
+                self._wasted[host] = self._wasted.get(host, 0.0) + timing.wasted
+            if timing.bytes:
+                self._bytes[(host, tier)] = self._bytes.get((host, tier), 0) + timing.bytes
+
+    def _histogram(self, histograms: Dict, key: Tuple) -> Histogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(self.buckets)
+        return histogram
+
+    def prometheus_text(self) -> str:
+        """Возвращает метрики в текстовом формате Prometheus (exposition format 0.0.4)"""
+        ns = self.namespace
+        lines: List[str] = []
+        with self._lock:
+            lines.append(f'# HELP {ns}_request_duration_seconds Полное время запроса, включая неудачные уровни')
+            lines.append(f'# TYPE {ns}_request_duration_seconds histogram')
+            for (host, tier), histogram in sorted(self._durations.items()):
+                self._histogram_lines(lines, f'{ns}_request_duration_seconds', histogram, host=host, tier=tier)
+
+            lines.append(f'# HELP {ns}_phase_duration_seconds Время фаз запроса: dns, connect, tls, ttfb, transfer')
+            lines.append(f'# TYPE {ns}_phase_duration_seconds histogram')
+            for (host, tier, phase), histogram in sorted(self._phases.items()):
+                self._histogram_lines(lines, f'{ns}_phase_duration_seconds', histogram,
+                                      host=host, tier=tier, phase=phase)
+
+            lines.append(f'# HELP {ns}_requests_total Запросы по хосту, уровню и статусу')
+            lines.append(f'# TYPE {ns}_requests_total counter')
+            for (host, tier, status), count in sorted(self._requests.items()):
+                lines.append(f'{ns}_requests_total{{{_labels(host=host, tier=tier, status=status)}}} {count}')
+
+            lines.append(f'# HELP {ns}_tier_failures_total Попытки уровней, завершившиеся ошибкой')
+            lines.append(f'# TYPE {ns}_tier_failures_total counter')
+            for (host, tier), count in sorted(self._failures.items()):
+                lines.append(f'{ns}_tier_failures_total{{{_labels(host=host, tier=tier)}}} {count}')
+
+            lines.append(f'# HELP {ns}_wasted_seconds_total Время, потраченное на неудачные уровни')
+            lines.append(f'# TYPE {ns}_wasted_seconds_total counter')
+            for host, seconds in sorted(self._wasted.items()):
+                lines.append(f'{ns}_wasted_seconds_total{{{_labels(host=host)}}} {seconds!r}')
+
+            lines.append(f'# HELP {ns}_response_bytes_total Прочитанные байты тел ответов')
+            lines.append(f'# TYPE {ns}_response_bytes_total counter')
+            for (host, tier), count in sorted(self._bytes.items()):
+                lines.append(f'{ns}_response_bytes_total{{{_labels(host=host, tier=tier)}}} {count}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _histogram_lines(lines: List[str], name: str, histogram: Histogram, **labels: Any) -> None:
+        for bound, count in histogram.cumulative():
+            lines.append(f'{name}_bucket{{{_labels(**labels, le=bound)}}} {count}')
+        lines.append(f'{name}_sum{{{_labels(**labels)}}} {histogram.sum!r}')
+        lines.append(f'{name}_count{{{_labels(**labels)}}} {histogram.count}')
+
+    def clear(self) -> None:
+        """Сбрасывает все метрики"""
+        with self._lock:
+            for values in (self._durations, self._phases, self._requests,
+                           self._failures, self._wasted, self._bytes):
+                values.clear()
+
+
+def _tag_value(value: Any) -> str:
+    """Заменяет символы, недопустимые в тегах StatsD"""
+    return str(value).translate(str.maketrans({':': '_', ',': '_', '|': '_', '#': '_', '\n': '_'}))
+
+
+class StatsDSink:
+    """
+    Sink, отправляющий замеры каждого запроса по UDP в формате StatsD
+
+    Времена отправляются как таймеры в миллисекундах (``|ms``), количество
+    запросов и неудачных уровней - как счетчики (``|c``); хост, уровень и
+    статус передаются тегами DogStatsD (``|#host:...,tier:...``). Ошибки
+    отправки игнорируются.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8125, prefix: str = 'gost_http'):
+        """
+        Args:
+            host: Адрес StatsD агента
+            port: UDP порт агента
+            prefix: Префикс имен метрик
+        """
+        self.address = (host, port)
+        self.prefix = prefix
+        self._sock = socket.socket(socket.AF_INET6 if ':' in host else socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+
+    def lines(self, timing: RequestTiming) -> List[str]:
+        """Строки StatsD для одного запроса"""
+        p = self.prefix
+        tags = f'host:{_tag_value(timing.host)},tier:{_tag_value(timing.tier or "none")}'
+        status = timing.status_code if timing.status_code is not None else 'error'
+        lines = [
+            f'{p}.request.count:1|c|#{tags},status:{status}',
+            f'{p}.request.total:{timing.total * 1000:.3f}|ms|#{tags}',
+        ]
+        for phase in PHASES:
+            value = getattr(timing, phase)
+            if value is not None:
+                lines.append(f'{p}.request.{phase}:{value * 1000:.3f}|ms|#{tags}')
+        for failure in timing.failed_tiers:
+            lines.append(f'{p}.tier.failure:1|c|#host:{_tag_value(timing.host)},tier:{_tag_value(failure["tier"])}')
+        if timing.wasted:
+            lines.append(f'{p}.request.wasted:{timing.wasted * 1000:.3f}|ms|#host:{_tag_value(timing.host)}')
+        return lines
+
+    def __call__(self, timing: RequestTiming) -> None:
+        try:
+            self._sock.sendto('\n'.join(self.lines(timing)).encode('utf-8'), self.address)
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        self._sock.close()
@@ -8,10 +8,16 @@ requests_gost - полная замена requests с поддержкой GOST
     # Теперь все методы requests автоматически поддерживают GOST
     response = requests.get('https://dss.uc-em.ru/')
     response = requests.post('https://dss.uc-em.ru/api', json={'key': 'value'})
+
+Экземпляр requests и клиент GOSTHTTPClient создаются при первом
+обращении, а не при импорте модуля.
 """
 
-from gost_http.gost_http_client import GOSTHTTPClient
-import requests as _original_requests
+import threading
+
+# Атрибуты, которые берутся из оригинального requests
+_REQUESTS_ATTRIBUTES = ('Session', 'Response', 'exceptions', 'codes', 'status_codes')
+
 
 class RequestsGOST:
     """
@@ -22,46 +28,79 @@ class RequestsGOST:
     """
     
     def __init__(self):
-        self._client = GOSTHTTPClient()
-        # Сохраняем оригинальные классы и функции для совместимости
-        self.Session = _original_requests.Session
-        self.Response = _original_requests.Response
-        self.exceptions = _original_requests.exceptions
-        self.codes = _original_requests.codes
-        self.status_codes = _original_requests.status_codes
+        # Клиент создается при первом запросе
+        self._client = None
+        self._lock = threading.Lock()
+    
+    def _get_client(self):
+        """Возвращает клиент, создавая его при первом обращении"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from gost_http.gost_http_client import GOSTHTTPClient
+                    self._client = GOSTHTTPClient()
+        return self._client
+    
+    def __getattr__(self, name):
+        # Оригинальные классы и модули requests для совместимости
+        if name in _REQUESTS_ATTRIBUTES:
+            import requests as _original_requests
+            value = getattr(_original_requests, name)
+            setattr(self, name, value)
+            return value
+        raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
     
     def get(self, url, **kwargs):
         """GET запрос с поддержкой GOST"""
-        return self._client.get(url, **kwargs)
+        return self._get_client().get(url, **kwargs)
     
     def post(self, url, **kwargs):
         """POST запрос с поддержкой GOST"""
-        return self._client.post(url, **kwargs)
+        return self._get_client().post(url, **kwargs)
     
     def put(self, url, **kwargs):
         """PUT запрос с поддержкой GOST"""
-        return self._client.put(url, **kwargs)
+        return self._get_client().put(url, **kwargs)
     
     def delete(self, url, **kwargs):
         """DELETE запрос с поддержкой GOST"""
-        return self._client.delete(url, **kwargs)
+        return self._get_client().delete(url, **kwargs)
     
     def patch(self, url, **kwargs):
         """PATCH запрос с поддержкой GOST"""
-        return self._client.patch(url, **kwargs)
+        return self._get_client().patch(url, **kwargs)
     
     def head(self, url, **kwargs):
         """HEAD запрос с поддержкой GOST"""
-        return self._client.head(url, **kwargs)
+        return self._get_client().head(url, **kwargs)
     
     def options(self, url, **kwargs):
         """OPTIONS запрос с поддержкой GOST"""
-        return self._client.options(url, **kwargs)
+        return self._get_client().options(url, **kwargs)
     
     def request(self, method, url, **kwargs):
         """Универсальный метод request с поддержкой GOST"""
-        return self._client._request(method, url, **kwargs)
+        return self._get_client()._request(method, url, **kwargs)
+
+
+_instance = None
+_instance_lock = threading.Lock()
 
-# Создаем экземпляр для удобного использования
-requests = RequestsGOST()
 
+def __getattr__(name):
+    # requests_gost.requests - экземпляр RequestsGOST; requests_gost.get(...) и
+    # другие атрибуты экземпляра доступны и напрямую из модуля
+    global _instance
+    if name.startswith('_'):
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = RequestsGOST()
+    if name == 'requests':
+        globals()['requests'] = _instance
+        return _instance
+    try:
+        return getattr(_instance, name)
+    except AttributeError:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
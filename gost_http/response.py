@@ -0,0 +1,278 @@
+"""
+response - объект ответа для уровней прямого pyOpenSSL и curl
+
+GOSTResponse повторяет интерфейс requests.Response (status_code, headers,
+content, text, encoding, json(), ok, raise_for_status(), iter_content(),
+iter_lines(), raw), поэтому ответы всех уровней GOSTHTTPClient можно
+использовать одинаково. Класс с __slots__: ответ не создает __dict__, а
+text и json() вычисляются при первом обращении и запоминаются.
+"""
+
+import codecs
+import json as json_module
+from datetime import timedelta
+from typing import Any, Iterator, Optional
+
+# Размер блока при чтении всего тела ответа
+CONTENT_CHUNK_SIZE = 64 * 1024
+
+# Значение encoding или json() еще не вычислено
+_UNSET = object()
+
+
+def encoding_from_headers(headers) -> Optional[str]:
+    """
+    Кодировка тела из Content-Type
+
+    Returns:
+        Параметр charset, 'utf-8' для JSON (RFC 8259) или None - кодировка
+        не указана и определяется по содержимому (apparent_encoding)
+    """
+    content_type = _header(headers, 'Content-Type')
+    if not content_type:
+        return None
+    media_type, _, parameters = content_type.partition(';')
+    for parameter in parameters.split(';'):
+        name, _, value = parameter.strip().partition('=')
+        if name.strip().lower() == 'charset' and value.strip():
+            return value.strip().strip('"\'')
+    media_type = media_type.strip().lower()
+    if media_type == 'application/json' or media_type.endswith('+json'):
+        return 'utf-8'
+    return None
+
+
+def _header(headers, name: str) -> Optional[str]:
+    """Заголовок без учета регистра имени (headers может быть обычным dict)"""
+    value = headers.get(name)
+    if value is None and type(headers) is dict:
+        name = name.lower()
+        value = next((v for key, v in headers.items() if key.lower() == name), None)
+    return value
+
+
+class GOSTResponse:
+    """
+    Ответ, полученный через прямой pyOpenSSL или curl
+
+    В потоковом режиме (stream=True) тело не читается заранее: оно доступно
+    через iter_content(), iter_lines() и raw.read()/raw.readinto(). Обращение
+    к content читает оставшееся тело целиком.
+    """
+
+    __slots__ = ('status_code', 'headers', 'raw', 'url', 'reason', 'tier', 'timing', 'request',
+                 '_content', '_content_consumed', '_encoding', '_text', '_json')
+
+    def __init__(self, status_code: int = 200, headers=None, content: Optional[bytes] = None,
+                 raw=None, url: Optional[str] = None, reason: str = '', tier: Optional[str] = None):
+        """
+        Args:
+            status_code: HTTP статус
+            headers: Заголовки ответа
+            content: Тело ответа (если уже прочитано)
+            raw: Объект с методами read(amt), readinto(b) и close() для потокового чтения тела
+            url: URL запроса
+            reason: Текстовое описание статуса
+            tier: Уровень, через который получен ответ
+        """
+        self.status_code = status_code
+        self.headers = headers if headers is not None else {}
+        self.raw = raw
+        self.url = url
+        self.reason = reason
+        self.tier = tier
+        # Замеры времени запроса (gost_http.metrics.RequestTiming)
+        self.timing = None
+        # Совместимость с requests.Response (HTTPError.request)
+        self.request = None
+        self._content = content
+        self._content_consumed = content is not None
+        self._encoding = _UNSET
+        self._text = None
+        self._json = _UNSET
+
+    @property
+    def content(self) -> bytes:
+        """Тело ответа целиком"""
+        if self._content is None:
+            if self._content_consumed:
+                raise RuntimeError('The content for this response was already consumed')
+            self._content = b''.join(self.iter_content(CONTENT_CHUNK_SIZE))
+        return self._content
+
+    @property
+    def encoding(self) -> Optional[str]:
+        """Кодировка для text: из Content-Type или заданная явно (None - не указана)"""
+        if self._encoding is _UNSET:
+            self._encoding = encoding_from_headers(self.headers)
+        return self._encoding
+
+    @encoding.setter
+    def encoding(self, value: Optional[str]) -> None:
+        self._encoding = value
+        self._text = None
+
+    @property
+    def apparent_encoding(self) -> str:
+        """Кодировка, определенная по содержимому тела"""
+        content = self.content
+        try:
+            content.decode('utf-8')
+            return 'utf-8'
+        except UnicodeDecodeError:
+            pass
+        try:
+            import charset_normalizer
+        except ImportError:
+            return 'utf-8'
+        best = charset_normalizer.from_bytes(content).best()
+        return best.encoding if best is not None else 'utf-8'
+
+    @property
+    def text(self) -> str:
+        """Тело ответа как строка (декодируется при первом обращении)"""
+        if self._text is None:
+            content = self.content
+            encoding = self.encoding or (self.apparent_encoding if content else 'utf-8')
+            try:
+                self._text = content.decode(encoding, errors='replace')
+            except LookupError:
+                # Неизвестная кодировка в charset
+                self._text = content.decode('utf-8', errors='replace')
+        return self._text
+
+    def json(self, **kwargs) -> Any:
+        """
+        Разбирает тело ответа как JSON
+
+        Результат без аргументов запоминается: повторные вызовы возвращают
+        тот же объект.
+        """
+        if kwargs:
+            return self._parse_json(**kwargs)
+        if self._json is _UNSET:
+            self._json = self._parse_json()
+        return self._json
+
+    def _parse_json(self, **kwargs) -> Any:
+        if self.encoding is None:
+            # json.loads сам определяет UTF-8/16/32 по первым байтам
+            return json_module.loads(self.content, **kwargs)
+        return json_module.loads(self.text, **kwargs)
+
+    @property
+    def ok(self) -> bool:
+        """True, если статус меньше 400"""
+        return self.status_code < 400
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    @property
+    def is_redirect(self) -> bool:
+        """Ответ - перенаправление с заголовком Location"""
+        return self.status_code in (301, 302, 303, 307, 308) and _header(self.headers, 'Location') is not None
+
+    @property
+    def history(self) -> list:
+        """Перенаправления перед ответом (прямой и curl уровни возвращают последний ответ)"""
+        return []
+
+    @property
+    def elapsed(self) -> timedelta:
+        """Полное время запроса (по замерам timing)"""
+        return timedelta(seconds=self.timing.total if self.timing is not None else 0.0)
+
+    def raise_for_status(self) -> None:
+        """
+        Raises:
+            requests.HTTPError: Если статус 4xx или 5xx
+        """
+        if not 400 <= self.status_code < 600:
+            return
+        kind = 'Client' if self.status_code < 500 else 'Server'
+        message = f'{self.status_code} {kind} Error: {self.reason} for url: {self.url}'
+        try:
+            from requests.exceptions import HTTPError
+        except ImportError:
+            raise IOError(message)
+        raise HTTPError(message, response=self)
+
+    def iter_content(self, chunk_size: Optional[int] = 1, decode_unicode: bool = False) -> Iterator:
+        """
+        Итерирует тело ответа блоками
+
+        Args:
+            chunk_size: Максимальный размер блока в байтах (None - по мере поступления)
+            decode_unicode: Декодировать блоки в строки
+        """
+        def generate():
+            if self._content is not None:
+                size = chunk_size or CONTENT_CHUNK_SIZE
+                for start in range(0, len(self._content), size):
+                    yield self._content[start:start + size]
+                return
+            if self._content_consumed:
+                raise RuntimeError('The content for this response was already consumed')
+            self._content_consumed = True
+            if self.raw is None:
+                return
+            try:
+                while True:
+                    chunk = self.raw.read(chunk_size or CONTENT_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                self.raw.close()
+
+        chunks = generate()
+        if not decode_unicode:
+            return chunks
+        return self._decode_chunks(chunks)
+
+    def _decode_chunks(self, chunks: Iterator[bytes]) -> Iterator[str]:
+        try:
+            decoder = codecs.getincrementaldecoder(self.encoding or 'utf-8')(errors='replace')
+        except LookupError:
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        for chunk in chunks:
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        text = decoder.decode(b'', final=True)
+        if text:
+            yield text
+
+    def iter_lines(self, chunk_size: int = 512, decode_unicode: bool = False,
+                   delimiter=None) -> Iterator:
+        """Итерирует тело ответа построчно"""
+        pending = None
+        for chunk in self.iter_content(chunk_size=chunk_size, decode_unicode=decode_unicode):
+            if pending is not None:
+                chunk = pending + chunk
+            lines = chunk.split(delimiter) if delimiter else chunk.splitlines()
+            if lines and lines[-1] and chunk and lines[-1][-1] == chunk[-1]:
+                pending = lines.pop()
+            else:
+                pending = None
+            yield from lines
+        if pending is not None:
+            yield pending
+
+    def close(self) -> None:
+        """Освобождает соединение или процесс, из которого читается тело"""
+        if self.raw is not None:
+            self.raw.close()
+
+    def __enter__(self) -> 'GOSTResponse':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self.iter_content(128)
+
+    def __repr__(self) -> str:
+        return f'<GOSTResponse [{self.status_code}]>'
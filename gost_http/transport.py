@@ -0,0 +1,676 @@
+"""
+transport - прямой GOST TLS транспорт поверх pyOpenSSL SSL.Connection
+
+Используется уровнем pyOpenSSL в GOSTHTTPClient для сайтов, с которыми не
+справляется requests. Соединения держатся открытыми (keep-alive) в пуле по
+(host, port), ответы разбираются инкрементальным парсером HTTP/1.1. Если
+сервер согласовал в ALPN протокол h2, запросы к хосту мультиплексируются по
+одному соединению HTTP/2 (см. модуль http2). Сжатые ответы (Accept-Encoding)
+распаковываются, в том числе в потоковом режиме (см. модуль compression).
+"""
+
+import json as json_module
+import ssl
+import threading
+import time
+from collections import deque
+from urllib.parse import urlencode
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .body import BODY_CHUNK_SIZE, as_buffer, body_length, body_rewinder, is_stream_body, iter_body
+from .compression import ACCEPT_ENCODING, DecodingReader, decode_content, get_decoder
+from .metrics import record
+from .http11 import HTTP11ResponseParser, HTTPParseError, NEED_DATA, END_OF_MESSAGE, ResponseHead
+from .http2 import ALPN_H2, H2_AVAILABLE, HTTP2Connection, HTTP2StreamError
+
+try:
+    from OpenSSL import SSL
+    from urllib3.util import wait_for_read, wait_for_write
+    PYOPENSSL_AVAILABLE = True
+except ImportError:
+    PYOPENSSL_AVAILABLE = False
+    SSL = None
+
+# Размер буфера чтения из соединения
+RECV_BUFFER_SIZE = 64 * 1024
+
+# Методы, которые безопасно повторить на новом соединении
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE')
+
+
+def tls_connection_dropped(ssl_sock) -> bool:
+    """
+    Проверяет, закрыл ли сервер простаивающее TLS соединение
+
+    Простаивающее соединение доступно для чтения не только при EOF: сервер
+    TLS 1.3 присылает NewSessionTicket примерно через RTT после handshake.
+    Такие записи обрабатываются неблокирующим чтением, и соединение считается
+    закрытым только при EOF, ошибке или неожиданных данных.
+
+    Args:
+        ssl_sock: SSL.Connection pyOpenSSL или ssl.SSLSocket
+    """
+    try:
+        if ssl_sock.pending() > 0:
+            return True
+        if not wait_for_read(ssl_sock, 0.0):
+            return False
+        timeout = ssl_sock.gettimeout()
+    except Exception:
+        return True
+
+    ssl_sock.setblocking(False)
+    try:
+        ssl_sock.recv(1)
+        # Данные или EOF без запроса - соединение непригодно
+        return True
+    except (SSL.WantReadError, ssl.SSLWantReadError):
+        # Прочитаны только служебные записи TLS
+        return False
+    except Exception:
+        return True
+    finally:
+        try:
+            ssl_sock.settimeout(timeout)
+        except Exception:
+            pass
+
+
+class DirectConnection:
+    """
+    Открытое TLS соединение с хостом
+
+    Обертка над SSL.Connection с блокирующими sendall/recv_into, учитывающими
+    таймаут сокета (WantReadError/WantWriteError обрабатываются ожиданием).
+    """
+
+    def __init__(self, ssl_sock, host: str, port: int):
+        """
+        Args:
+            ssl_sock: SSL.Connection после успешного handshake
+            host: Имя хоста
+            port: Порт
+        """
+        self.ssl_sock = ssl_sock
+        self.host = host
+        self.port = port
+        self.created = time.monotonic()
+        self.last_used = self.created
+        self.requests = 0
+        self.closed = False
+        # Протокол, согласованный в ALPN (b'' - ALPN не использовался)
+        try:
+            self.alpn_protocol = ssl_sock.get_alpn_proto_negotiated() or b''
+        except Exception:
+            self.alpn_protocol = b''
+        # Буфер чтения выделяется один раз на соединение
+        self._buffer = memoryview(bytearray(RECV_BUFFER_SIZE))
+
+    def sendall(self, data) -> None:
+        """Отправляет все данные, ожидая готовности сокета при необходимости"""
+        view = memoryview(data)
+        timeout = self.ssl_sock.gettimeout()
+        while view:
+            try:
+                sent = self.ssl_sock.send(view)
+            except SSL.WantWriteError:
+                if not wait_for_write(self.ssl_sock, timeout):
+                    raise TimeoutError('Таймаут записи в соединение')
+                continue
+            except SSL.WantReadError:
+                if not wait_for_read(self.ssl_sock, timeout):
+                    raise TimeoutError('Таймаут записи в соединение')
+                continue
+            view = view[sent:]
+
+    def recv_into(self, buffer) -> int:
+        """
+        Читает данные в буфер
+
+        Returns:
+            Количество прочитанных байтов; 0 - соединение закрыто сервером
+        """
+        timeout = self.ssl_sock.gettimeout()
+        while True:
+            try:
+                return self.ssl_sock.recv_into(buffer)
+            except SSL.WantReadError:
+                if not wait_for_read(self.ssl_sock, timeout):
+                    raise TimeoutError('Таймаут чтения из соединения')
+            except SSL.WantWriteError:
+                if not wait_for_write(self.ssl_sock, timeout):
+                    raise TimeoutError('Таймаут чтения из соединения')
+            except SSL.ZeroReturnError:
+                return 0
+            except SSL.SysCallError as e:
+                # (-1, 'Unexpected EOF') - сервер закрыл TCP без close_notify
+                if e.args and e.args[0] in (-1, 0):
+                    return 0
+                raise
+
+    def receive(self, parser: HTTP11ResponseParser) -> None:
+        """Читает очередную порцию данных в буфер соединения и передает ее парсеру"""
+        received = self.recv_into(self._buffer)
+        if received:
+            parser.feed(self._buffer[:received])
+        else:
+            parser.feed_eof()
+
+    def is_dropped(self) -> bool:
+        """Проверяет, закрыл ли сервер простаивающее соединение"""
+        return self.closed or tls_connection_dropped(self.ssl_sock)
+
+    def close(self) -> None:
+        """Закрывает соединение, отправляя close_notify"""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.ssl_sock.shutdown()
+        except Exception:
+            pass
+        try:
+            self.ssl_sock.close()
+        except Exception:
+            pass
+
+
+class DirectBodyReader:
+    """
+    Потоковое чтение тела ответа из соединения пула
+
+    Когда тело прочитано до конца, соединение возвращается в пул (или
+    закрывается, если keep-alive невозможен). Закрытие до конца тела
+    закрывает соединение.
+    """
+
+    def __init__(self, pool: 'DirectTLSPool', conn: DirectConnection, parser: HTTP11ResponseParser):
+        self._pool = pool
+        self._conn = conn
+        self._parser = parser
+        self._pending = b''
+        self.finished = False
+
+    def _next_chunk(self) -> bytes:
+        while not self.finished:
+            event = self._parser.next_event()
+            if event is NEED_DATA:
+                try:
+                    self._conn.receive(self._parser)
+                except Exception:
+                    self.close()
+                    raise
+            elif event is END_OF_MESSAGE:
+                self.finished = True
+                self._pool._response_done(self._conn, self._parser)
+            elif event:
+                return event
+        return b''
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        """
+        Читает до ``amt`` байтов тела (None - все оставшееся тело)
+
+        Returns:
+            Очередной фрагмент; b'' - тело прочитано полностью
+        """
+        if amt is None:
+            chunks = [self._pending]
+            self._pending = b''
+            while True:
+                chunk = self._next_chunk()
+                if not chunk:
+                    return b''.join(chunks)
+                chunks.append(chunk)
+
+        data = self._pending or self._next_chunk()
+        if len(data) > amt:
+            self._pending = data[amt:]
+            return data[:amt]
+        self._pending = b''
+        return data
+
+    def readinto(self, buffer) -> int:
+        """Читает очередной фрагмент тела в буфер, возвращает количество байтов"""
+        view = memoryview(buffer).cast('B')
+        data = self.read(len(view))
+        view[:len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        """Прекращает чтение; недочитанное соединение закрывается"""
+        if not self.finished:
+            self.finished = True
+            self._conn.close()
+
+
+class DirectResponse:
+    """Ответ, полученный через прямой TLS транспорт"""
+
+    def __init__(self, head: ResponseHead, content: Optional[bytes], connection_reused: bool,
+                 raw: Optional[DirectBodyReader] = None):
+        self.status_code = head.status_code
+        self.reason = head.reason
+        self.version = head.version
+        self.headers = head.headers
+        # Тело сжато по Accept-Encoding: content и raw отдают распакованные данные
+        content_encoding = head.get('Content-Encoding')
+        decoder = get_decoder(content_encoding)
+        if decoder is not None and content is not None:
+            content = decode_content(content, content_encoding)
+        elif decoder is not None and raw is not None:
+            raw = DecodingReader(raw, decoder, content_encoding)
+        self.content = content
+        self.raw = raw
+        self.connection_reused = connection_reused
+
+
+class DirectTLSPool:
+    """
+    Пул постоянных TLS соединений по (host, port)
+
+    Соединения создаются функцией connect(host, port, timeout), которая
+    возвращает SSL.Connection после handshake или None. После полностью
+    прочитанного ответа с keep-alive соединение возвращается в пул.
+
+    Соединения, для которых сервер выбрал в ALPN h2, становятся общими
+    HTTP2Connection: запросы всех потоков к хосту идут по ним параллельно,
+    новое соединение открывается, только когда у существующих исчерпан лимит
+    одновременных потоков (не больше maxsize соединений на хост).
+    """
+
+    def __init__(self, connect: Callable[[str, int, float], Any], maxsize: int = 10,
+                 idle_timeout: float = 60.0,
+                 on_first_response: Optional[Callable[[DirectConnection], None]] = None,
+                 http2: bool = False):
+        """
+        Args:
+            connect: Функция создания TLS соединения
+            maxsize: Максимум простаивающих соединений на хост
+            idle_timeout: Через сколько секунд простоя соединение закрывается
+            on_first_response: Вызывается после первого ответа на новом соединении
+                (например, чтобы сохранить TLS 1.3 session ticket)
+            http2: connect предлагает h2 в ALPN: пока протокол хоста неизвестен,
+                одновременные запросы ждут первое соединение, а не открывают свои
+        """
+        self.connect = connect
+        self.http2 = http2
+        self.on_first_response = on_first_response
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple[str, int], deque] = {}
+        # Общие HTTP/2 соединения по (host, port)
+        self._h2: Dict[Tuple[str, int], List[HTTP2Connection]] = {}
+        # Хосты, выбравшие в ALPN HTTP/1.1, и блокировки открытия соединений
+        self._http1_hosts = set()
+        self._connect_locks: Dict[Tuple[str, int], threading.Lock] = {}
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.http2_streams = 0
+
+    def acquire(self, host: str, port: int, timeout: float) -> Tuple[Optional[DirectConnection], bool]:
+        """
+        Берет простаивающее соединение из пула или создает новое
+
+        Returns:
+            Кортеж (соединение или None, было ли соединение переиспользовано)
+        """
+        key = (host, port)
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                conn = idle.pop() if idle else None
+            if conn is None:
+                break
+            if now - conn.last_used > self.idle_timeout or conn.is_dropped():
+                conn.close()
+                continue
+            conn.ssl_sock.settimeout(timeout)
+            with self._lock:
+                self.connections_reused += 1
+            return conn, True
+
+        ssl_sock = self.connect(host, port, timeout)
+        if ssl_sock is None:
+            return None, False
+        with self._lock:
+            self.connections_created += 1
+        return DirectConnection(ssl_sock, host, port), False
+
+    def prewarm(self, host: str, port: int, count: int, timeout: float) -> int:
+        """
+        Открывает соединения заранее, чтобы в пуле хоста было ``count`` простаивающих
+
+        Простаивающие соединения, закрытые сервером или истекшие, заменяются
+        новыми. ``count`` ограничивается maxsize; для хоста с HTTP/2
+        достаточно одного соединения.
+
+        Returns:
+            Количество готовых простаивающих соединений
+        """
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            # Одно HTTP/2 соединение обслуживает все запросы к хосту
+            if any(not h2conn.closed for h2conn in self._h2.get(key, ())):
+                return 1
+            idle = self._idle.pop(key, deque())
+        alive = []
+        for conn in idle:
+            if now - conn.last_used > self.idle_timeout or conn.is_dropped():
+                conn.close()
+            else:
+                alive.append(conn)
+
+        try:
+            while len(alive) < min(count, self.maxsize):
+                ssl_sock = self.connect(host, port, timeout)
+                if ssl_sock is None:
+                    break
+                with self._lock:
+                    self.connections_created += 1
+                alive.append(DirectConnection(ssl_sock, host, port))
+                if alive[-1].alpn_protocol == ALPN_H2 and H2_AVAILABLE:
+                    break
+        finally:
+            for conn in alive:
+                self.release(conn)
+        return len(alive)
+
+    def release(self, conn: DirectConnection) -> None:
+        """Возвращает соединение в пул (или закрывает, если пул хоста заполнен)"""
+        if conn.closed:
+            return
+        if conn.alpn_protocol == ALPN_H2 and H2_AVAILABLE:
+            self._adopt_http2(conn)
+            return
+        conn.last_used = time.monotonic()
+        with self._lock:
+            idle = self._idle.setdefault((conn.host, conn.port), deque())
+            if len(idle) < self.maxsize:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        """Закрывает все простаивающие и HTTP/2 соединения"""
+        with self._lock:
+            connections = [conn for idle in self._idle.values() for conn in idle]
+            connections.extend(h2conn for h2conns in self._h2.values() for h2conn in h2conns)
+            self._idle.clear()
+            self._h2.clear()
+        for conn in connections:
+            conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает количество созданных, переиспользованных и простаивающих соединений"""
+        with self._lock:
+            return {
+                'created': self.connections_created,
+                'reused': self.connections_reused,
+                'idle': sum(len(idle) for idle in self._idle.values()),
+                'http2_connections': sum(len(h2conns) for h2conns in self._h2.values()),
+                'http2_streams': self.http2_streams,
+            }
+
+    def _adopt_http2(self, conn: DirectConnection) -> HTTP2Connection:
+        """Делает соединение с согласованным h2 общим HTTP/2 соединением хоста"""
+        h2conn = HTTP2Connection(conn)
+        with self._lock:
+            self._h2.setdefault((conn.host, conn.port), []).append(h2conn)
+        return h2conn
+
+    def _http2_connection(self, key: Tuple[str, int]) -> Optional[HTTP2Connection]:
+        """
+        Выбирает HTTP/2 соединение хоста для нового запроса
+
+        Returns:
+            Наименее загруженное соединение со свободным потоком; занятое
+            соединение, если открыто maxsize соединений; None - нужно новое
+        """
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            h2conns = self._h2.get(key)
+            if not h2conns:
+                return None
+            for h2conn in list(h2conns):
+                idle = h2conn.active_streams == 0 and now - h2conn.last_used > self.idle_timeout
+                if h2conn.closed or idle:
+                    h2conns.remove(h2conn)
+                    expired.append(h2conn)
+            available = [h2conn for h2conn in h2conns if h2conn.has_capacity()]
+            if available:
+                chosen = min(available, key=lambda h2conn: h2conn.active_streams)
+            elif h2conns and len(h2conns) >= self.maxsize:
+                chosen = min(h2conns, key=lambda h2conn: h2conn.active_streams)
+            else:
+                chosen = None
+        for h2conn in expired:
+            h2conn.close()
+        return chosen
+
+    def request(self, method: str, host: str, port: int, target: str,
+                headers: Optional[Iterable[Tuple[str, str]]] = None,
+                timeout: float = 10, stream: bool = False, body: Any = None) -> DirectResponse:
+        """
+        Выполняет HTTP запрос через пул соединений
+
+        Если переиспользованное соединение оказалось закрытым сервером до
+        получения первого байта ответа, идемпотентный запрос повторяется на
+        новом соединении (если тело можно отправить повторно, см. body_rewinder).
+
+        Args:
+            method: HTTP метод
+            host: Имя хоста
+            port: Порт
+            target: Путь с query string
+            headers: Дополнительные заголовки запроса
+            timeout: Таймаут в секундах
+            stream: Не читать тело заранее; тело доступно через DirectResponse.raw
+            body: Тело запроса: bytes, буфер, файловый объект или итератор
+                (см. модуль body); отправляется фрагментами, без длины - chunked
+
+        Returns:
+            DirectResponse
+
+        Raises:
+            ConnectionError: если не удалось подключиться
+            OSError, SSL.Error, HTTPParseError: при ошибке обмена
+        """
+        method = method.upper()
+        headers = list(headers or ())
+        if body is not None and not is_stream_body(body):
+            body = as_buffer(body)
+        length = body_length(body) if body is not None else None
+        chunked = body is not None and length is None
+        names = {name.lower() for name, _ in headers}
+        if chunked:
+            headers.append(('Transfer-Encoding', 'chunked'))
+        elif body is not None and 'content-length' not in names:
+            headers.append(('Content-Length', str(length)))
+        request_bytes = build_request(method, host, port, target, headers)
+        rewind = body_rewinder(body)
+        attempts = 0
+
+        while True:
+            conn = self._http2_connection((host, port))
+            reused = True
+            if conn is None:
+                conn, reused = self._acquire_for_request(host, port, timeout)
+            if conn is None:
+                raise ConnectionError(f'Не удалось установить TLS соединение с {host}:{port}')
+
+            if isinstance(conn, HTTP2Connection):
+                attempts += 1
+                try:
+                    return self._request_http2(conn, method, target, headers, timeout, stream, reused, body)
+                except HTTP2StreamError as e:
+                    # Запрос не обработан сервером - повторяем на другом соединении
+                    if e.retryable and method in IDEMPOTENT_METHODS and attempts < 3 and rewind is not None:
+                        rewind()
+                        continue
+                    raise
+
+            parser = HTTP11ResponseParser(method)
+            sent = time.perf_counter()
+            try:
+                send_request(conn, request_bytes, body, chunked)
+                head = read_response_head(conn, parser)
+            except (OSError, SSL.Error, HTTPParseError):
+                conn.close()
+                if (reused and not parser.received_any and method in IDEMPOTENT_METHODS
+                        and rewind is not None):
+                    # Устаревшее keep-alive соединение - повторяем на новом
+                    rewind()
+                    continue
+                raise
+            except Exception:
+                # Ошибка чтения тела запроса: соединение в неизвестном состоянии
+                conn.close()
+                raise
+
+            conn.requests += 1
+            received = time.perf_counter()
+            record('ttfb', received - sent)
+            reader = DirectBodyReader(self, conn, parser)
+            if stream:
+                return DirectResponse(head, None, reused, raw=reader)
+            content = reader.read()
+            record('transfer', time.perf_counter() - received)
+            return DirectResponse(head, content, reused)
+
+    def _acquire_for_request(self, host: str, port: int, timeout: float) -> Tuple[Any, bool]:
+        """
+        Берет соединение для запроса: HTTP/1.1 DirectConnection или HTTP2Connection
+
+        Returns:
+            Кортеж (соединение или None, было ли соединение переиспользовано)
+        """
+        key = (host, port)
+        if not self.http2 or key in self._http1_hosts:
+            conn, reused = self.acquire(host, port, timeout)
+            if conn is not None and conn.alpn_protocol == ALPN_H2 and H2_AVAILABLE:
+                return self._adopt_http2(conn), False
+            return conn, reused
+
+        # Протокол хоста еще неизвестен или это HTTP/2: соединение открывает
+        # один поток, остальные после него используют то же соединение
+        with self._lock:
+            connect_lock = self._connect_locks.setdefault(key, threading.Lock())
+        with connect_lock:
+            h2conn = self._http2_connection(key)
+            if h2conn is not None:
+                return h2conn, True
+            conn, reused = self.acquire(host, port, timeout)
+            if conn is None:
+                return None, False
+            if conn.alpn_protocol == ALPN_H2 and H2_AVAILABLE:
+                # Сервер выбрал HTTP/2: соединение становится общим для хоста
+                return self._adopt_http2(conn), False
+            self._http1_hosts.add(key)
+            return conn, reused
+
+    def _request_http2(self, h2conn: HTTP2Connection, method: str, target: str,
+                       headers: List[Tuple[str, str]], timeout: float, stream: bool,
+                       reused: bool, body: Any = None) -> DirectResponse:
+        """Выполняет запрос отдельным потоком HTTP/2 соединения"""
+        sent = time.perf_counter()
+        head, reader = h2conn.request(method, target, headers, body, timeout)
+        with self._lock:
+            self.http2_streams += 1
+            if reused:
+                self.connections_reused += 1
+        if h2conn.requests == 1 and self.on_first_response is not None:
+            with h2conn._lock:
+                self.on_first_response(h2conn.conn)
+        received = time.perf_counter()
+        record('ttfb', received - sent)
+        if stream:
+            return DirectResponse(head, None, reused, raw=reader)
+        content = reader.read()
+        record('transfer', time.perf_counter() - received)
+        return DirectResponse(head, content, reused)
+
+    def _response_done(self, conn: DirectConnection, parser: HTTP11ResponseParser) -> None:
+        """Вызывается после полного чтения ответа: возвращает соединение в пул"""
+        if conn.requests == 1 and self.on_first_response is not None:
+            self.on_first_response(conn)
+        if parser.keep_alive:
+            self.release(conn)
+        else:
+            conn.close()
+
+
+def build_request(method: str, host: str, port: int, target: str,
+                  headers: Optional[Iterable[Tuple[str, str]]] = None) -> bytes:
+    """Формирует стартовую строку и заголовки HTTP/1.1 запроса"""
+    host_header = host if port == 443 else f'{host}:{port}'
+    lines: List[str] = [f'{method} {target} HTTP/1.1']
+    names = set()
+    for name, value in headers or ():
+        names.add(name.lower())
+        lines.append(f'{name}: {value}')
+
+    defaults = [('Host', host_header), ('Accept', '*/*'), ('Accept-Encoding', ACCEPT_ENCODING),
+                ('Connection', 'keep-alive')]
+    lines[1:1] = [f'{name}: {value}' for name, value in defaults if name.lower() not in names]
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+
+def send_request(conn: DirectConnection, request_bytes: bytes, body: Any, chunked: bool) -> None:
+    """
+    Отправляет заголовки и тело запроса
+
+    Небольшое тело в памяти уходит одной записью вместе с заголовками,
+    остальные - фрагментами (срезы memoryview для буферов); при chunked
+    каждый фрагмент оформляется блоком Transfer-Encoding: chunked.
+    """
+    if body is None or (not chunked and not is_stream_body(body) and len(body) <= BODY_CHUNK_SIZE):
+        conn.sendall(request_bytes + body if body else request_bytes)
+        return
+    conn.sendall(request_bytes)
+    for chunk in iter_body(body):
+        if chunked:
+            conn.sendall(b'%x\r\n' % len(chunk) + bytes(chunk) + b'\r\n')
+        else:
+            conn.sendall(chunk)
+    if chunked:
+        conn.sendall(b'0\r\n\r\n')
+
+
+def encode_body(data=None, json=None) -> Tuple[Any, Optional[str]]:
+    """
+    Кодирует тело запроса так же, как requests (data= или json=)
+
+    Буферы (bytearray, memoryview, mmap) возвращаются как memoryview без
+    копирования, файловые объекты и итераторы - как есть (см. модуль body).
+
+    Returns:
+        Кортеж (тело или None, Content-Type по умолчанию или None)
+    """
+    if json is not None:
+        return json_module.dumps(json).encode('utf-8'), 'application/json'
+    if data is None:
+        return None, None
+    if isinstance(data, (dict, list, tuple)):
+        return urlencode(data, doseq=True).encode('utf-8'), 'application/x-www-form-urlencoded'
+    if isinstance(data, str):
+        return data.encode('utf-8'), None
+    if is_stream_body(data):
+        return data, None
+    return as_buffer(data), None
+
+
+def read_response_head(conn: DirectConnection, parser: HTTP11ResponseParser) -> ResponseHead:
+    """Читает из соединения стартовую строку и заголовки ответа"""
+    while True:
+        event = parser.next_event()
+        if event is NEED_DATA:
+            conn.receive(parser)
+        elif isinstance(event, ResponseHead):
+            return event
+        else:
+            raise HTTPParseError('Ответ завершился без заголовков')
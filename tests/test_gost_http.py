@@ -254,6 +254,1791 @@ def test_requests_gost(url):
         return False
 
 
+def test_lazy_import():
+    """Тест ленивого импорта: import gost_http не загружает тяжелые зависимости"""
+    print("Тестирование ленивого импорта...")
+    try:
+        import os
+        import subprocess
+        code = (
+            'import sys, gost_http\n'
+            'from gost_http import requests_gost\n'
+            'heavy = [m for m in ("requests", "OpenSSL", "urllib3") if m in sys.modules]\n'
+            'assert not heavy, heavy\n'
+            'assert requests_gost.requests._client is None\n'
+            'assert gost_http.GOSTHTTPClient.__name__ == "GOSTHTTPClient"\n'
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=root)
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env)
+        assert result.returncode == 0, result.stderr
+        
+        print("  ✓ Ленивый импорт работает корректно")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        return False
+
+
+def test_engine_registration():
+    """Тест режимов регистрации GOST engine (без engine, с подменой ENGINE API)"""
+    print("Тестирование регистрации GOST engine...")
+    try:
+        from gost_http import gost_http_client as module
+        
+        class FakeEngineLibrary:
+            def __init__(self):
+                self.calls = []
+            
+            def __getattr__(self, name):
+                def call(*args):
+                    self.calls.append((name,) + args[1:])
+                    return 'engine' if name == 'ENGINE_by_id' else 1
+                return call
+        
+        original = (module._engine_library, module._gost_engine_loaded, module._gost_engine_registration)
+        try:
+            for registration in ('scoped', 'default'):
+                library = FakeEngineLibrary()
+                module._engine_library = lambda: library
+                module._gost_engine_loaded = False
+                assert module.load_gost_engine(registration)
+                names = [call[0] for call in library.calls]
+                if registration == 'scoped':
+                    assert 'ENGINE_set_default' not in names
+                    assert set(module._SCOPED_ENGINE_REGISTRATIONS) <= set(names)
+                else:
+                    assert ('ENGINE_set_default', module.ENGINE_METHOD_ALL) in library.calls
+                    assert not any(name.startswith('ENGINE_register_') for name in names)
+                assert module._gost_engine_registration == registration
+        finally:
+            module._engine_library, module._gost_engine_loaded, module._gost_engine_registration = original
+        
+        print("  ✓ Режимы регистрации работают корректно")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_thread_safety():
+    """Тест однократной загрузки engine и сессий потоков (без сети)"""
+    print("Тестирование потокобезопасности...")
+    try:
+        import threading
+        import time
+        from gost_http import gost_http_client as module
+        from gost_http.gost_http_client import GOSTHTTPClient, REQUESTS_AVAILABLE
+        
+        class SlowEngineLibrary:
+            def __init__(self):
+                self.init_calls = 0
+            
+            def __getattr__(self, name):
+                def call(*args):
+                    if name == 'ENGINE_init':
+                        self.init_calls += 1
+                        # Окно, в котором без блокировки успели бы войти другие потоки
+                        time.sleep(0.05)
+                    return 'engine' if name == 'ENGINE_by_id' else 1
+                return call
+        
+        library = SlowEngineLibrary()
+        original = (module._engine_library, module._gost_engine_loaded, module._gost_engine_registration)
+        try:
+            module._engine_library = lambda: library
+            module._gost_engine_loaded = False
+            barrier = threading.Barrier(16)
+            results = []
+            
+            def load():
+                barrier.wait()
+                results.append(module.load_gost_engine())
+            
+            threads = [threading.Thread(target=load) for _ in range(16)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert results == [True] * 16
+            assert library.init_calls == 1
+        finally:
+            module._engine_library, module._gost_engine_loaded, module._gost_engine_registration = original
+        
+        # Объект ENGINE API создается один раз
+        if module.PYOPENSSL_AVAILABLE:
+            assert module._engine_library() is module._engine_library()
+        
+        if REQUESTS_AVAILABLE:
+            with GOSTHTTPClient() as client:
+                client.session.headers['X-Test'] = '1'
+                sessions = []
+                thread = threading.Thread(target=lambda: sessions.append(client._thread_session()))
+                thread.start()
+                thread.join()
+                assert client._thread_session() is client.session
+                other = sessions[0]
+                assert other is not client.session
+                # Пулы соединений, cookies и заголовки общие
+                assert other.adapters is client.session.adapters
+                assert other.cookies is client.session.cookies
+                assert other.headers['X-Test'] == '1'
+        
+        print("  ✓ Engine загружается один раз, потоки разделяют пулы соединений")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_tls_session_cache():
+    """Тест кеша TLS сессий и handshake с возобновлением (без сети)"""
+    print("Тестирование кеша TLS сессий...")
+    try:
+        from gost_http import gost_http_client as module
+        from gost_http.gost_http_client import TLSSessionCache
+        
+        if not module.PYOPENSSL_AVAILABLE:
+            print("  ✓ pyOpenSSL не установлен, проверка пропущена")
+            return True
+        
+        ctx, other_ctx = object(), object()
+        cache = TLSSessionCache(maxsize=2)
+        cache.put(ctx, 'a.ru', 443, 'session-a')
+        cache.put(ctx, 'b.ru', 443, 'session-b')
+        cache.put(ctx, 'a.ru', 443, None)
+        assert cache.get(ctx, 'a.ru', 443) == 'session-a'
+        assert cache.get(other_ctx, 'a.ru', 443) is None
+        # a.ru использован последним - вытесняется b.ru
+        cache.put(ctx, 'c.ru', 443, 'session-c')
+        assert cache.get(ctx, 'b.ru', 443) is None
+        assert cache.get(ctx, 'a.ru', 443) == 'session-a' and cache.stats()['sessions'] == 2
+        cache.invalidate(ctx, 'a.ru', 443)
+        assert cache.get(ctx, 'a.ru', 443) is None
+        
+        assert cache.stats()['resumed_ratio'] == 0.0
+        cache.record_handshake(False)
+        for _ in range(3):
+            cache.record_handshake(True)
+        stats = cache.stats()
+        assert stats['full'] == 1 and stats['resumed'] == 3 and stats['resumed_ratio'] == 0.75
+        cache.clear()
+        assert cache.stats() == {'full': 0, 'resumed': 0, 'resumed_ratio': 0.0, 'sessions': 0}
+        
+        class FakeConnection:
+            """SSL.Connection: запоминает предложенную сессию, handshake может завершиться ошибкой"""
+            def __init__(self, fail=False):
+                self.fail = fail
+                self.offered = None
+            
+            def set_session(self, session):
+                self.offered = session
+            
+            def set_connect_state(self):
+                pass
+            
+            def do_handshake(self):
+                if self.fail:
+                    raise module.SSL.Error('handshake failure')
+            
+            def get_session(self):
+                return 'new-session'
+        
+        original = (module.tls_session_cache, module._session_reused)
+        try:
+            module.tls_session_cache = cache
+            module._session_reused = lambda ssl_sock: ssl_sock.offered is not None
+            
+            # Первое соединение - полный handshake, сессия сохраняется
+            connection = FakeConnection()
+            module._handshake_with_session(connection, None, ctx, 'a.ru', 443)
+            assert connection.offered is None and cache.get(ctx, 'a.ru', 443) == 'new-session'
+            
+            # Следующее предлагает сохраненную сессию
+            connection = FakeConnection()
+            module._handshake_with_session(connection, None, ctx, 'a.ru', 443)
+            assert connection.offered == 'new-session'
+            assert cache.stats()['resumed'] == 1 and cache.stats()['full'] == 1
+            
+            # Ошибка handshake удаляет сессию хоста
+            connection = FakeConnection(fail=True)
+            try:
+                module._handshake_with_session(connection, None, ctx, 'a.ru', 443)
+                raise AssertionError('SSL.Error не выброшен')
+            except module.SSL.Error:
+                pass
+            assert connection.offered == 'new-session' and cache.get(ctx, 'a.ru', 443) is None
+        finally:
+            module.tls_session_cache, module._session_reused = original
+        
+        print("  ✓ Кеш TLS сессий работает корректно")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_ssl_context_cache():
+    """Тест общего SSL контекста get_ssl_context для GOSTAdapter и pyOpenSSL (без сети)"""
+    print("Тестирование общего SSL контекста...")
+    try:
+        import datetime
+        import os
+        import socket
+        import tempfile
+        import requests
+        from gost_http import gost_http_client as module
+        
+        if not module.PYOPENSSL_AVAILABLE:
+            print("  ✓ pyOpenSSL не установлен, проверка пропущена")
+            return True
+        
+        from cryptography import x509
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import ec
+        
+        # Самоподписанный сертификат: CA bundle и клиентский сертификат
+        key = ec.generate_private_key(ec.SECP256R1())
+        name = x509.Name([x509.NameAttribute(x509.NameOID.COMMON_NAME, 'gost-http-test')])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        certificate = (x509.CertificateBuilder().subject_name(name).issuer_name(name)
+                       .public_key(key.public_key()).serial_number(x509.random_serial_number())
+                       .not_valid_before(now).not_valid_after(now + datetime.timedelta(days=1))
+                       .sign(key, hashes.SHA256()))
+        
+        with tempfile.TemporaryDirectory() as directory:
+            cert_path = os.path.join(directory, 'cert.pem')
+            key_path = os.path.join(directory, 'key.pem')
+            with open(cert_path, 'wb') as f:
+                f.write(certificate.public_bytes(serialization.Encoding.PEM))
+            with open(key_path, 'wb') as f:
+                f.write(key.private_bytes(serialization.Encoding.PEM,
+                                          serialization.PrivateFormat.PKCS8,
+                                          serialization.NoEncryption()))
+            
+            # Одинаковый ключ (verify, cipher list, CA bundle, сертификат) - один контекст
+            context = module.get_ssl_context(verify=False)
+            assert module.get_ssl_context(verify=False) is context
+            assert module.get_ssl_context(verify=cert_path) is module.get_ssl_context(verify=cert_path)
+            assert (module.get_ssl_context(client_cert=[cert_path, key_path])
+                    is module.get_ssl_context(client_cert=(cert_path, key_path)))
+            
+            # Любая другая часть ключа - другой контекст
+            variants = [
+                module.get_ssl_context(verify=True),
+                module.get_ssl_context(ciphers=module.FALLBACK_CIPHER_LIST),
+                module.get_ssl_context(verify=cert_path),
+                module.get_ssl_context(client_cert=(cert_path, key_path)),
+            ]
+            assert len({id(context)} | {id(variant) for variant in variants}) == 5
+            
+            # GOSTAdapter и прямое pyOpenSSL подключение используют один контекст
+            adapter = module.GOSTAdapter(verify=False)
+            assert adapter.poolmanager.connection_pool_kw['ssl_context'] is context
+            request = requests.Request('GET', 'https://example.ru/').prepare()
+            _, pool_kwargs = adapter.build_connection_pool_key_attributes(request, cert_path)
+            assert pool_kwargs['ssl_context'] is module.get_ssl_context(verify=cert_path)
+            
+            used = []
+            
+            def fake_handshake(ssl_sock, sock, ctx, host, port):
+                used.append(ctx)
+                raise module.SSL.Error('handshake failure')
+            
+            original = (module.create_connection, module._handshake_with_session, module.load_gost_engine)
+            sockets = []
+            try:
+                module.create_connection = lambda *args, **kwargs: sockets.append(socket.socket()) or sockets[-1]
+                module._handshake_with_session = fake_handshake
+                module.load_gost_engine = lambda: True
+                assert module._connect_via_pyopenssl('example.ru', verify=False) is None
+                assert module._connect_via_pyopenssl('example.ru', verify=cert_path) is None
+            finally:
+                module.create_connection, module._handshake_with_session, module.load_gost_engine = original
+                for sock in sockets:
+                    sock.close()
+            assert used == [context._ctx, module.get_ssl_context(verify=cert_path)._ctx]
+        
+        print("  ✓ Контекст общий для одинаковой конфигурации и для обоих уровней")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_default_clients():
+    """Тест общих клиентов get_default_client/configure_default_client (без сети)"""
+    print("Тестирование общих клиентов...")
+    try:
+        from gost_http import gost_http_client as module
+        from gost_http.gost_http_client import configure_default_client, get_default_client
+        
+        try:
+            configure_default_client()
+            client = get_default_client(False, 10)
+            assert get_default_client(False, 10) is client
+            assert get_default_client(False, 30) is not client
+            assert get_default_client(True, 10) is not client
+            assert client.routes is not None and client.timeout == 10
+            
+            # Новые параметры применяются к новым клиентам, свободный старый закрывается сразу
+            closed = []
+            client.close = lambda: closed.append(client)
+            configure_default_client(route_ttl=0, pool_maxsize=4)
+            replaced = get_default_client(False, 10)
+            assert replaced is not client and get_default_client(False, 10) is replaced
+            assert replaced.routes is None and replaced.direct_pool.maxsize == 4
+            assert closed == [client]
+            
+            # Клиент, занятый вызовом gost_get, закрывается после завершения вызова
+            replaced.close = lambda: closed.append(replaced)
+            with module._using_default_client(False, 10) as used:
+                assert used is replaced
+                configure_default_client()
+                assert closed == [client]
+                assert get_default_client(False, 10) is not replaced
+            assert closed == [client, replaced]
+            assert not module._default_client_users and not module._retired_default_clients
+            assert get_default_client(False, 10).routes is not None
+        finally:
+            configure_default_client()
+        
+        print("  ✓ Общие клиенты создаются по ключу (verify, timeout), заменяются и закрываются")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_connector():
+    """Тест кеша DNS и Happy Eyeballs (только localhost)"""
+    print("Тестирование кеша DNS и Happy Eyeballs...")
+    try:
+        import socket
+        import time
+        from gost_http.connector import DNSCache, happy_eyeballs_connect, interleave_addresses
+        
+        v4 = [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('192.0.2.%d' % i, 443)) for i in (1, 2)]
+        v6 = [(socket.AF_INET6, socket.SOCK_STREAM, 6, '', ('2001:db8::%d' % i, 443, 0, 0)) for i in (1, 2)]
+        ordered = interleave_addresses(v6 + v4)
+        assert [address[0] for address in ordered] == [socket.AF_INET6, socket.AF_INET] * 2
+        
+        cache = DNSCache(ttl=60)
+        first = cache.resolve('localhost', 443)
+        cache.resolve('localhost', 443)
+        stats = cache.stats()
+        assert stats['hits'] == 1 and stats['misses'] == 1
+        cache.prefer('localhost', 443, first[-1][4])
+        assert cache.resolve('localhost', 443)[0][4] == first[-1][4]
+        cache.invalidate('localhost', 443)
+        cache.resolve('127.0.0.1', 443)
+        assert cache.stats()['size'] == 0
+        
+        # Первый адрес не отвечает (очередь listen заполнена) - побеждает второй
+        slow = socket.socket()
+        slow.bind(('127.0.0.1', 0))
+        slow.listen(0)
+        backlog = []
+        for _ in range(4):
+            sock = socket.socket()
+            sock.setblocking(False)
+            sock.connect_ex(slow.getsockname())
+            backlog.append(sock)
+        good = socket.socket()
+        good.bind(('127.0.0.1', 0))
+        good.listen(8)
+        addresses = [(socket.AF_INET, socket.SOCK_STREAM, 6, '', slow.getsockname()),
+                     (socket.AF_INET, socket.SOCK_STREAM, 6, '', good.getsockname())]
+        started = time.monotonic()
+        sock = happy_eyeballs_connect(addresses, timeout=5, delay=0.1)
+        elapsed = time.monotonic() - started
+        assert sock.getpeername() == good.getsockname()
+        assert elapsed < 2
+        for other in [sock, slow, good] + backlog:
+            other.close()
+        
+        print(f"  ✓ Кеш DNS работает, Happy Eyeballs подключился за {elapsed * 1000:.0f} мс")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_prewarm():
+    """Тест прогрева соединений (без сети)"""
+    print("Тестирование prewarm...")
+    try:
+        import socket
+        from gost_http.transport import DirectTLSPool
+        from gost_http.gost_http_client import GOSTHTTPClient, REQUESTS_AVAILABLE
+        
+        class IdleSocket:
+            """Подключенный сокет без входящих данных"""
+            def __init__(self):
+                self.sock, self.peer = socket.socketpair()
+            
+            def __getattr__(self, name):
+                return getattr(self.sock, name)
+            
+            def pending(self):
+                return 0
+            
+            def shutdown(self):
+                pass
+            
+            def close(self):
+                self.sock.close()
+                self.peer.close()
+        
+        opened = []
+        
+        def connect(host, port, timeout):
+            opened.append(IdleSocket())
+            return opened[-1]
+        
+        pool = DirectTLSPool(connect, maxsize=3)
+        assert pool.prewarm('example.ru', 443, 5, timeout=1) == 3
+        # Повторный прогрев не открывает лишних соединений
+        assert pool.prewarm('example.ru', 443, 3, timeout=1) == 3
+        assert len(opened) == 3
+        # Соединение, закрытое сервером, заменяется новым
+        opened[0].peer.close()
+        assert pool.prewarm('example.ru', 443, 3, timeout=1) == 3
+        assert len(opened) == 4
+        conn, reused = pool.acquire('example.ru', 443, timeout=1)
+        assert reused and pool.stats()['created'] == 4
+        pool.close()
+        
+        if REQUESTS_AVAILABLE:
+            with GOSTHTTPClient() as client:
+                # Недоступный хост: ни один уровень не прогрет, уровни помечены нерабочими
+                result = client.prewarm(['127.0.0.1:1'], connections_per_host=2, keep_warm=60)
+                assert result == {'127.0.0.1:1': {'tier': None, 'connections': 0}}
+                assert client.routes.stats()['negative'] >= 1
+                assert client._keep_warm is not None
+            assert client._keep_warm is None
+            
+            # Пул urllib3 без _get_conn/_put_conn: уровень session не прогревается
+            import requests
+            from gost_http.gost_http_client import _prewarm_adapter
+            
+            class LegacyAdapter:
+                def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):
+                    return object()
+            
+            with requests.Session() as session:
+                assert _prewarm_adapter(LegacyAdapter(), session, 'https://example.ru/', 2, False, 1) is None
+        
+        print("  ✓ Прогрев соединений работает корректно")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_tier_routing_cache():
+    """Тест кеша маршрутизации по транспортным уровням (без сети)"""
+    print("Тестирование TierRoutingCache...")
+    try:
+        from gost_http.gost_http_client import TierRoutingCache, TIER_SESSION, TIER_PYOPENSSL, TIER_CURL
+        
+        chain = [TIER_SESSION, TIER_PYOPENSSL, TIER_CURL]
+        key = ('dss.uc-em.ru', 443)
+        routes = TierRoutingCache(ttl=60, negative_ttl=60)
+        
+        # Первый запрос проходит всю цепочку
+        assert routes.plan(key, chain) == chain
+        routes.record_failure(key, TIER_SESSION, 0.5)
+        routes.record_success(key, TIER_PYOPENSSL)
+        
+        # Следующий запрос сразу идет на рабочий уровень
+        assert routes.plan(key, chain) == [TIER_PYOPENSSL, TIER_CURL]
+        stats = routes.stats()
+        assert stats['hits'] == 1 and stats['misses'] == 1
+        assert stats['skipped'] == 1 and stats['saved_time'] == 0.5
+        
+        # Ошибка рабочего уровня сбрасывает маршрут
+        routes.record_failure(key, TIER_PYOPENSSL)
+        assert routes.plan(key, chain) == [TIER_CURL]
+        
+        # Истекшие отрицательные записи позволяют перепроверить хост
+        routes = TierRoutingCache(ttl=60, negative_ttl=0)
+        routes.record_failure(key, TIER_SESSION)
+        assert routes.plan(key, chain) == chain
+        
+        print("  ✓ Маршрутизация по уровням работает корректно")
+        return True
+    except AssertionError:
+        print("  ✗ Неверный порядок уровней")
+        import traceback
+        traceback.print_exc()
+        return False
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_hedging():
+    """Тест хеджирования уровней (уровни подменены, без сети)"""
+    print("Тестирование хеджирования уровней...")
+    try:
+        import time
+        from gost_http.gost_http_client import GOSTHTTPClient, TIER_SESSION, TIER_PYOPENSSL, TIER_CURL
+        
+        class FakeResponse:
+            def __init__(self, status_code):
+                self.status_code = status_code
+                self.content = b''
+                self.closed = False
+            
+            def close(self):
+                self.closed = True
+        
+        slow = FakeResponse(200)
+        fast = FakeResponse(200)
+        
+        class HedgedClient(GOSTHTTPClient):
+            # Уровень session отвечает медленно, pyOpenSSL - быстро, curl - ошибка
+            tier_responses = {TIER_SESSION: (0.5, slow), TIER_PYOPENSSL: (0.05, fast), TIER_CURL: (0.0, None)}
+            
+            def _tier_chain(self, method, url):
+                return [TIER_SESSION, TIER_PYOPENSSL, TIER_CURL]
+            
+            def _request_via_tier(self, tier, method, url, kwargs):
+                delay, response = self.tier_responses[tier]
+                time.sleep(delay)
+                return response
+        
+        with HedgedClient(hedge_delay=0.1) as client:
+            started = time.monotonic()
+            response = client.get('https://example.ru/')
+            elapsed = time.monotonic() - started
+            assert response is fast and elapsed < 0.4
+            stats = client.hedge_stats()
+            assert stats['requests'] == 1 and stats['fired'] == 1
+            assert stats['wins'] == {TIER_PYOPENSSL: 1} and stats['fallback_wins'] == 1
+            # Ответ проигравшего уровня закрывается, когда он завершится
+            deadline = time.monotonic() + 2
+            while not slow.closed and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert slow.closed
+            
+            # Рабочий уровень запомнен: следующий запрос начинается с него и не хеджируется
+            assert client.get('https://example.ru/') is fast
+            assert client.hedge_stats()['fired'] == 1
+        
+        # Неуспешный ответ session закрывается, потоков - pool_maxsize на уровень
+        rejected = FakeResponse(503)
+        with HedgedClient(hedge_delay=0.1, pool_maxsize=4) as client:
+            client.tier_responses = dict(client.tier_responses, **{TIER_SESSION: (0.0, rejected)})
+            assert client.get('https://example.ru/') is fast and rejected.closed
+            assert client.hedge_workers == 12 and client._hedge_executor._max_workers == 12
+        with HedgedClient(hedge_delay=0.1, hedge_workers=2) as client:
+            assert client.hedge_workers == 2
+        
+        print(f"  ✓ Хеджирование работает корректно ({elapsed * 1000:.0f} мс вместо 500 мс)")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_metrics():
+    """Тест замеров времени запросов и sink метрик (уровни подменены, без сети)"""
+    print("Тестирование замеров времени и метрик...")
+    try:
+        from gost_http import metrics
+        from gost_http.gost_http_client import GOSTHTTPClient, TIER_SESSION, TIER_PYOPENSSL, TIER_CURL
+        from gost_http.curl_batch import curl_phase_timings
+        from gost_http.response import GOSTResponse
+        
+        class TimedClient(GOSTHTTPClient):
+            # session - ошибка после DNS, pyOpenSSL - ответ с фазами, curl не вызывается
+            def _tier_chain(self, method, url):
+                return [TIER_SESSION, TIER_PYOPENSSL, TIER_CURL]
+            
+            def _request_via_tier(self, tier, method, url, kwargs):
+                if tier == TIER_SESSION:
+                    metrics.record('dns', 0.002)
+                    metrics.record_error(ConnectionError('refused'))
+                    return None
+                assert tier == TIER_PYOPENSSL
+                for phase, seconds in (('dns', 0.001), ('connect', 0.003), ('tls', 0.02),
+                                       ('ttfb', 0.03), ('transfer', 0.004)):
+                    metrics.record(phase, seconds)
+                return GOSTResponse(200, content=b'x' * 100, tier=tier)
+        
+        collector = metrics.MetricsCollector()
+        timings = []
+        
+        def sink(timing):
+            timings.append(timing)
+            collector(timing)
+            if len(timings) > 1:
+                raise RuntimeError('sink error')
+        
+        with TimedClient(metrics_sink=sink) as client:
+            response = client.get('https://example.ru/')
+            timing = response.timing
+            assert timings == [timing]
+            assert timing.tier == TIER_PYOPENSSL and timing.status_code == 200 and timing.bytes == 100
+            assert timing.tls == 0.02 and timing.ttfb == 0.03 and timing.connection_reused is False
+            assert [failure['tier'] for failure in timing.failed_tiers] == [TIER_SESSION]
+            assert 'refused' in timing.failed_tiers[0]['error']
+            assert timing.wasted >= 0 and timing.total >= timing.wasted
+            assert timing.as_dict()['failed_tiers'][0]['tier'] == TIER_SESSION
+            # Рабочий уровень запомнен, ошибка sink не влияет на запрос
+            second = client.get('https://example.ru/')
+            assert second is not None and second.timing.failed_tiers == []
+        
+        text = collector.prometheus_text()
+        assert 'gost_http_requests_total{host="example.ru:443",tier="pyopenssl",status="200"} 2' in text
+        assert 'gost_http_phase_duration_seconds_bucket{host="example.ru:443",tier="pyopenssl",phase="tls",le="0.025"} 2' in text
+        assert 'gost_http_tier_failures_total{host="example.ru:443",tier="session"} 1' in text
+        assert 'gost_http_response_bytes_total{host="example.ru:443",tier="pyopenssl"} 200' in text
+        
+        sink = metrics.StatsDSink()
+        lines = sink.lines(timing)
+        sink.close()
+        assert 'gost_http.request.count:1|c|#host:example.ru,tier:pyopenssl,status:200' in lines
+        assert 'gost_http.request.tls:20.000|ms|#host:example.ru,tier:pyopenssl' in lines
+        
+        # Накопленные замеры curl --write-out -> длительности фаз
+        phases = curl_phase_timings(0.01, 0.03, 0.08, 0.1, 0.15)
+        assert {name: round(value, 3) for name, value in phases.items()} == {
+            'dns': 0.01, 'connect': 0.02, 'tls': 0.05, 'ttfb': 0.02, 'transfer': 0.05}
+        assert set(curl_phase_timings(0, 0, 0, 0.02, 0.03)) == {'ttfb', 'transfer'}
+        
+        print(f"  ✓ Замеры и метрики работают корректно ({timing!r})")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_bench_cli():
+    """Тест python -m gost_http bench (без сети)"""
+    print("Тестирование python -m gost_http bench...")
+    try:
+        import argparse
+        import contextlib
+        import io
+        import json
+        import tempfile
+        from gost_http.__main__ import BenchResult, format_report, main, _request_kwargs
+        from gost_http.response import GOSTResponse
+        
+        result = BenchResult()
+        for latency in (0.010, 0.012, 0.020, 0.050):
+            result.add(latency, GOSTResponse(200, content=b'x' * 10, tier='pyopenssl'))
+        result.add(0.001, None, 'curl: ConnectionError: refused')
+        result.elapsed = 0.5
+        data = result.as_dict()
+        assert data['requests'] == 5 and data['completed'] == 4 and data['bytes'] == 40
+        assert data['rps'] == 8.0 and data['tiers'] == {'pyopenssl': 4}
+        assert sum(count for _, count in data['histogram_ms']) == 4
+        assert abs(data['histogram_ms'][-1][0] - 50.0) < 1e-6
+        report = format_report(result)
+        assert 'Уровни: pyopenssl: 4' in report and '[1] curl: ConnectionError: refused' in report
+        
+        with tempfile.NamedTemporaryFile(suffix='.json') as body:
+            body.write(b'{"a": 1}')
+            body.flush()
+            args = argparse.Namespace(header=['Content-Type: application/json'], data='@' + body.name)
+            kwargs = _request_kwargs(args)
+        assert kwargs == {'headers': {'Content-Type': 'application/json'}, 'data': b'{"a": 1}'}
+        
+        # Недоступный порт: все запросы с ошибкой, код возврата 1
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            code = main(['bench', 'https://127.0.0.1:1/', '-c', '2', '-n', '4',
+                         '--tier', 'curl', '--timeout', '2', '--json'])
+        data = json.loads(output.getvalue())
+        assert code == 1 and data['requests'] == 4 and sum(data['errors'].values()) == 4
+        assert all(error.startswith('curl') for error in data['errors'])
+        
+        # --tier передается клиентам параметром tiers: цепочка вместо цепочки по методу и URL
+        from gost_http.async_client import AsyncGOSTHTTPClient
+        from gost_http.gost_http_client import GOSTHTTPClient
+        with GOSTHTTPClient(tiers=['curl']) as client:
+            assert client._tier_chain('DELETE', 'https://example.ru/') == ['curl']
+        assert AsyncGOSTHTTPClient(tiers=['pyopenssl'])._tier_chain('http://example.ru/') == ['pyopenssl']
+        for client_class in (GOSTHTTPClient, AsyncGOSTHTTPClient):
+            try:
+                client_class(tiers=['ssh'])
+                raise AssertionError('ValueError не выброшен')
+            except ValueError:
+                pass
+        
+        print("  ✓ CLI bench работает корректно")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_http2():
+    """Тест HTTP/2 через DirectTLSPool (без сети)"""
+    print("Тестирование HTTP/2...")
+    try:
+        import socket
+        import threading
+        import time
+        from gost_http.http2 import H2_AVAILABLE, build_h2_headers
+        from gost_http.transport import DirectTLSPool
+        
+        headers = build_h2_headers('GET', 'example.ru', 8443, '/a?b=1',
+                                   [('Connection', 'keep-alive'), ('X-Test', '1')])
+        assert headers[:4] == [(b':method', b'GET'), (b':scheme', b'https'),
+                               (b':authority', b'example.ru:8443'), (b':path', b'/a?b=1')]
+        assert (b'x-test', b'1') in headers and (b'accept', b'*/*') in headers
+        assert not any(name == b'connection' for name, _ in headers)
+        
+        if not H2_AVAILABLE:
+            print("  ✓ h2 не установлен, HTTP/2 отключен")
+            return True
+        
+        import h2.config
+        import h2.connection
+        import h2.events
+        
+        class H2Socket:
+            """Сокет с согласованным в ALPN h2 (TLS не используется)"""
+            def __init__(self):
+                self.sock, self.peer = socket.socketpair()
+            
+            def __getattr__(self, name):
+                return getattr(self.sock, name)
+            
+            def get_alpn_proto_negotiated(self):
+                return b'h2'
+            
+            def pending(self):
+                return 0
+            
+            def shutdown(self):
+                pass
+            
+            def close(self):
+                self.sock.close()
+        
+        def serve(sock):
+            """HTTP/2 сервер: /slow отвечает через 0.2 с, /size/N - N байт, /echo - длина тела"""
+            server = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+            server.initiate_connection()
+            sock.sendall(server.data_to_send())
+            lock = threading.Lock()
+            pending = {}
+            requests = {}
+            
+            def respond(stream_id, path, received):
+                if path == '/slow':
+                    time.sleep(0.2)
+                size = int(path[6:]) if path.startswith('/size/') else 2
+                body = str(received).encode() if path == '/echo' else b'h2' if size == 2 else b'x' * size
+                with lock:
+                    server.send_headers(stream_id, [(':status', '200'), ('content-length', str(len(body)))])
+                    pending[stream_id] = body
+                    send_pending()
+            
+            def send_pending():
+                for stream_id, body in list(pending.items()):
+                    if stream_id not in server.streams:
+                        pending.pop(stream_id)
+                        continue
+                    while body:
+                        size = min(server.local_flow_control_window(stream_id),
+                                   server.max_outbound_frame_size, len(body))
+                        if size <= 0:
+                            break
+                        server.send_data(stream_id, body[:size], end_stream=size == len(body))
+                        body = body[size:]
+                    pending[stream_id] = body
+                    if not body:
+                        pending.pop(stream_id)
+                sock.sendall(server.data_to_send())
+            
+            try:
+                while True:
+                    data = sock.recv(65536)
+                    if not data:
+                        return
+                    with lock:
+                        for event in server.receive_data(data):
+                            if isinstance(event, h2.events.RequestReceived):
+                                requests[event.stream_id] = [dict(event.headers)[b':path'].decode(), 0]
+                            elif isinstance(event, h2.events.DataReceived):
+                                requests[event.stream_id][1] += len(event.data)
+                                server.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                            elif isinstance(event, h2.events.StreamEnded):
+                                threading.Thread(target=respond, args=(event.stream_id, *requests.pop(event.stream_id)),
+                                                 daemon=True).start()
+                        send_pending()
+            except OSError:
+                pass
+            finally:
+                sock.close()
+        
+        opened = []
+        
+        def connect(host, port, timeout):
+            opened.append(H2Socket())
+            threading.Thread(target=serve, args=(opened[-1].peer,), daemon=True).start()
+            return opened[-1]
+        
+        pool = DirectTLSPool(connect, maxsize=3, http2=True)
+        responses = []
+        threads = [threading.Thread(target=lambda: responses.append(
+            pool.request('GET', 'example.ru', 443, '/slow', timeout=5))) for _ in range(6)]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+        # Все запросы идут параллельно по одному соединению
+        assert len(opened) == 1 and elapsed < 1.0, (len(opened), elapsed)
+        assert [response.content for response in responses] == [b'h2'] * 6
+        assert responses[0].version == 'HTTP/2'
+        
+        # Тело больше окна управления потоком
+        response = pool.request('GET', 'example.ru', 443, '/size/300000', timeout=5)
+        assert response.status_code == 200 and len(response.content) == 300000
+        
+        # Потоковое чтение и досрочное закрытие не мешают следующим запросам
+        response = pool.request('GET', 'example.ru', 443, '/size/300000', timeout=5, stream=True)
+        assert response.raw.read(1000) == b'x' * 1000
+        response.raw.close()
+        response = pool.request('GET', 'example.ru', 443, '/', timeout=5)
+        assert response.content == b'h2' and response.connection_reused
+        
+        # Тело запроса больше окна сервера отправляется фрагментами
+        upload = (b'y' * 50000 for _ in range(6))
+        response = pool.request('POST', 'example.ru', 443, '/echo', timeout=5, body=upload)
+        assert response.content == b'300000'
+        
+        stats = pool.stats()
+        assert stats['created'] == 1 and stats['http2_connections'] == 1
+        assert stats['http2_streams'] == 10
+        pool.close()
+        assert opened[0].sock.fileno() == -1
+        
+        print("  ✓ HTTP/2 работает корректно")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_compression():
+    """Тест распаковки сжатых ответов (без сети)"""
+    print("Тестирование сжатия ответов...")
+    try:
+        import gzip
+        import zlib
+        from gost_http.compression import (ACCEPT_ENCODING, ContentDecodingError, DecodingReader,
+                                           decode_content, get_decoder)
+        from gost_http.http11 import ResponseHead
+        from gost_http.response import GOSTResponse
+        from gost_http.transport import DirectResponse, build_request
+        
+        body = ''.join(f'<record id="{i}">Организация {i}</record>' for i in range(2000)).encode('utf-8')
+        variants = [
+            ('gzip', gzip.compress(body)),
+            ('gzip', gzip.compress(body[:100]) + gzip.compress(body[100:])),
+            ('deflate', zlib.compress(body)),
+            ('deflate', zlib.compress(body)[2:-4]),
+            ('deflate, gzip', gzip.compress(zlib.compress(body))),
+        ]
+        for encoding, data in variants:
+            assert decode_content(data, encoding) == body, encoding
+        assert get_decoder('identity') is None and get_decoder('zstd') is None
+        assert decode_content(body, None) == body
+        try:
+            decode_content(b'not gzip', 'gzip')
+            raise AssertionError('ContentDecodingError не выброшен')
+        except ContentDecodingError:
+            pass
+        
+        class ChunkedRaw:
+            """Тело, приходящее из сети по size байт"""
+            def __init__(self, data, size=100):
+                self.data = data
+                self.size = size
+                self.closed = False
+            
+            def read(self, amt=None):
+                chunk, self.data = self.data[:self.size], self.data[self.size:]
+                return chunk
+            
+            def close(self):
+                self.closed = True
+        
+        wire = gzip.compress(body)
+        reader = DecodingReader(ChunkedRaw(wire), get_decoder('gzip'), 'gzip')
+        chunks = []
+        while True:
+            chunk = reader.read(1000)
+            if not chunk:
+                break
+            assert len(chunk) <= 1000
+            chunks.append(chunk)
+        assert b''.join(chunks) == body
+        assert reader.wire_bytes == len(wire) and reader.decoded_bytes == len(body)
+        for encoding, data in variants:
+            reader = DecodingReader(ChunkedRaw(data, len(data)), get_decoder(encoding), encoding)
+            chunks = list(iter(lambda: reader.read(300), b''))
+            assert b''.join(chunks) == body and max(map(len, chunks)) <= 300, encoding
+        
+        # Сжатая "бомба": одно чтение распаковывает не больше запрошенного
+        bomb = gzip.compress(bytes(64 * 1024 * 1024))
+        for encoding, data in (('gzip', bomb), ('gzip, gzip', gzip.compress(bomb))):
+            reader = DecodingReader(ChunkedRaw(data, 64 * 1024), get_decoder(encoding), encoding)
+            for _ in range(3):
+                assert len(reader.read(4096)) == 4096
+            assert reader.decoded_bytes == 3 * 4096, encoding
+        
+        assert f'Accept-Encoding: {ACCEPT_ENCODING}'.encode() in build_request('GET', 'example.ru', 443, '/')
+        assert b'identity' in build_request('GET', 'example.ru', 443, '/', [('Accept-Encoding', 'identity')])
+        
+        # Прямой уровень: тело распаковывается и целиком, и в потоковом режиме
+        head = ResponseHead('HTTP/1.1', 200, 'OK', [('Content-Encoding', 'gzip')])
+        assert DirectResponse(head, wire, False).content == body
+        raw = ChunkedRaw(wire)
+        result = DirectResponse(head, None, False, raw=raw)
+        response = GOSTResponse(200, content=result.content, raw=result.raw)
+        assert ''.join(response.iter_content(512, decode_unicode=True)) == body.decode('utf-8')
+        assert raw.closed
+        
+        print("  ✓ Сжатые ответы распаковываются корректно")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_streaming_upload():
+    """Тест потоковых тел запросов (без сети)"""
+    print("Тестирование потоковых тел запросов...")
+    try:
+        import mmap
+        import os
+        import socket
+        import tempfile
+        import threading
+        from gost_http.body import BufferReader, body_length, body_rewinder, iter_body
+        from gost_http.transport import DirectTLSPool, encode_body
+        
+        data = bytes(range(256)) * 1000
+        buffer = bytearray(data)
+        body, _ = encode_body(data=buffer)
+        assert isinstance(body, memoryview) and body.obj is buffer
+        chunks = list(iter_body(body, 100000))
+        assert [len(chunk) for chunk in chunks] == [100000, 100000, 56000]
+        assert all(isinstance(chunk, memoryview) for chunk in chunks)
+        generator = (b'x' for _ in range(3))
+        assert encode_body(data=generator)[0] is generator
+        assert body_length(generator) is None and body_rewinder(generator) is None
+        assert list(iter_body(['a', b'', 'б'])) == [b'a', 'б'.encode('utf-8')]
+        
+        file = tempfile.TemporaryFile()
+        file.write(data)
+        file.seek(1000)
+        assert body_length(file) == len(data) - 1000
+        rewind = body_rewinder(file)
+        file.read()
+        rewind()
+        assert file.tell() == 1000
+        reader = BufferReader(memoryview(data))
+        assert len(reader) == len(data) and reader.read(10) == data[:10] and reader.tell() == 10
+        read_end, write_end = os.pipe()
+        with os.fdopen(read_end, 'rb') as pipe:
+            assert body_length(pipe) is None
+        os.close(write_end)
+        
+        class PlainSocket:
+            """Соединение без TLS: сервер возвращает метод, способ передачи и длину тела"""
+            def __init__(self):
+                self.sock, self.peer = socket.socketpair()
+                threading.Thread(target=self.serve, daemon=True).start()
+            
+            def __getattr__(self, name):
+                return getattr(self.sock, name)
+            
+            def pending(self):
+                return 0
+            
+            def shutdown(self):
+                pass
+            
+            def serve(self):
+                stream = self.peer.makefile('rb')
+                while True:
+                    line = stream.readline()
+                    if not line:
+                        return
+                    method = line.split()[0].decode()
+                    headers = {}
+                    while True:
+                        line = stream.readline().strip()
+                        if not line:
+                            break
+                        name, _, value = line.decode().partition(':')
+                        headers[name.lower()] = value.strip()
+                    received = 0
+                    if headers.get('transfer-encoding') == 'chunked':
+                        mode = 'chunked'
+                        while True:
+                            size = int(stream.readline().strip(), 16)
+                            received += len(stream.read(size))
+                            stream.readline()
+                            if not size:
+                                break
+                    else:
+                        mode = 'length'
+                        received = len(stream.read(int(headers.get('content-length', 0))))
+                    answer = f'{method} {mode} {received}'.encode()
+                    self.peer.sendall(b'HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s' % (len(answer), answer))
+        
+        pool = DirectTLSPool(lambda host, port, timeout: PlainSocket(), maxsize=2)
+        
+        def upload(body, method='POST'):
+            return pool.request(method, 'example.ru', 443, '/upload', timeout=5, body=body).content
+        
+        assert upload(b'small') == b'POST length 5'
+        assert upload(memoryview(data)) == b'POST length 256000'
+        file.seek(0)
+        assert upload(file, 'PUT') == b'PUT length 256000'
+        assert upload(b'x' * 70000 for _ in range(3)) == b'POST chunked 210000'
+        with mmap.mmap(file.fileno(), 0) as mapped:
+            view = memoryview(mapped)
+            assert upload(view) == b'POST length 256000'
+            view.release()
+        assert pool.stats()['created'] == 1
+        pool.close()
+        file.close()
+        
+        print("  ✓ Потоковые тела запросов работают корректно")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_download():
+    """Тест параллельной загрузки диапазонами и докачки (без сети)"""
+    print("Тестирование загрузки диапазонами...")
+    try:
+        import os
+        import re
+        import tempfile
+        from requests.structures import CaseInsensitiveDict
+        from gost_http.download import RangeDownloader, split_ranges
+        from gost_http.response import GOSTResponse
+        
+        assert split_ranges(10, 4, 1) == [(0, 2), (3, 5), (6, 8), (9, 9)]
+        assert split_ranges(100, 4, 1000) == [(0, 99)]
+        assert split_ranges(0, 4) == []
+        
+        data = os.urandom(300000)
+        
+        class RangeClient:
+            """Сервер с диапазонами: часть с началом fail_at обрывается после 1000 байт"""
+            def __init__(self, ranges=True):
+                self.ranges = ranges
+                self.etag = '"v1"'
+                self.fail_at = None
+                self.requested = []
+            
+            def head(self, url, **kwargs):
+                headers = {'Content-Length': str(len(data)), 'ETag': self.etag}
+                if self.ranges:
+                    headers['Accept-Ranges'] = 'bytes'
+                return GOSTResponse(200, CaseInsensitiveDict(headers), content=b'')
+            
+            def get(self, url, headers=None, **kwargs):
+                headers = CaseInsensitiveDict(headers or {})
+                match = re.match(r'bytes=(\d+)-(\d+)', headers.get('Range', ''))
+                if not self.ranges or match is None or headers.get('If-Range', self.etag) != self.etag:
+                    return GOSTResponse(200, CaseInsensitiveDict({'ETag': self.etag}), content=data)
+                start, end = int(match.group(1)), int(match.group(2))
+                self.requested.append((start, end))
+                body = data[start:end + 1]
+                if start == self.fail_at:
+                    body = body[:1000]
+                    raise_after = True
+                else:
+                    raise_after = False
+                
+                class Raw:
+                    def __init__(self):
+                        self.body = body
+                    
+                    def read(self, amt=None):
+                        if not self.body and raise_after:
+                            raise ConnectionError('обрыв соединения')
+                        chunk, self.body = self.body[:amt], self.body[amt:]
+                        return chunk
+                    
+                    def close(self):
+                        pass
+                
+                response_headers = {'Content-Range': f'bytes {start}-{end}/{len(data)}', 'ETag': self.etag}
+                return GOSTResponse(206, CaseInsensitiveDict(response_headers), raw=Raw())
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'data.bin')
+            state = path + '.gostdownload'
+            
+            client = RangeClient()
+            result = RangeDownloader(client, 'https://example.ru/data', path, parts=4, min_part_size=1).run()
+            assert result['ranges'] and result['parts'] == 4 and result['downloaded'] == len(data)
+            assert open(path, 'rb').read() == data and not os.path.exists(state)
+            
+            # Обрыв части без повторов: прогресс сохраняется, повторный вызов докачивает остаток
+            os.remove(path)
+            client.fail_at = 75000
+            assert RangeDownloader(client, 'https://example.ru/data', path, parts=4, retries=0,
+                                   min_part_size=1).run() is None
+            assert os.path.exists(state) and not os.path.exists(state + '.tmp')
+            with open(state, 'rb') as f:
+                saved = f.read()
+            # Сбой при записи прогресса не повреждает прежний файл прогресса
+            broken = RangeDownloader(client, 'https://example.ru/data', path)
+            broken._size, broken._validator, broken._parts = len(data), None, []
+            fsync = os.fsync
+            
+            def failing_fsync(fd):
+                raise OSError('нет места на диске')
+            
+            os.fsync = failing_fsync
+            try:
+                broken._save_state(force=True)
+            finally:
+                os.fsync = fsync
+            with open(state, 'rb') as f:
+                assert f.read() == saved
+            assert not os.path.exists(state + '.tmp')
+            client.fail_at = None
+            client.requested = []
+            result = RangeDownloader(client, 'https://example.ru/data', path, parts=4, min_part_size=1).run()
+            assert client.requested == [(76000, 149999)], client.requested
+            assert result['resumed'] == len(data) - 74000 and result['downloaded'] == 74000
+            assert open(path, 'rb').read() == data and not os.path.exists(state)
+            
+            # Повтор после обрыва продолжает часть с последнего записанного байта
+            client.fail_at = 150000
+            client.requested = []
+            downloader = RangeDownloader(client, 'https://example.ru/data', path, parts=4, min_part_size=1)
+            original_get = client.get
+            
+            def get_once(url, headers=None, **kwargs):
+                response = original_get(url, headers=headers, **kwargs)
+                if headers.get('Range', '').startswith('bytes=150000-'):
+                    client.fail_at = None
+                return response
+            
+            client.get = get_once
+            os.remove(path)
+            assert downloader.run() is not None and open(path, 'rb').read() == data
+            assert (151000, 224999) in client.requested
+            client.get = original_get
+            
+            # Ресурс изменился: прогресс не используется, файл загружается заново
+            client.fail_at = 0
+            assert RangeDownloader(client, 'https://example.ru/data', path, parts=4, retries=0,
+                                   min_part_size=1).run() is None
+            client.fail_at = None
+            client.etag = '"v2"'
+            result = RangeDownloader(client, 'https://example.ru/data', path, parts=4, min_part_size=1).run()
+            assert result['resumed'] == 0 and open(path, 'rb').read() == data
+            
+            # Сервер без диапазонов: файл загружается одним запросом
+            result = RangeDownloader(RangeClient(ranges=False), 'https://example.ru/data', path, parts=4).run()
+            assert not result['ranges'] and result['size'] == len(data)
+            assert open(path, 'rb').read() == data
+        
+        print("  ✓ Загрузка диапазонами и докачка работают корректно")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_http_cache():
+    """Тест кеша ответов RFC 9111 (без сети)"""
+    print("Тестирование кеша ответов...")
+    try:
+        import os
+        import tempfile
+        import time
+        from email.utils import formatdate
+        from requests.structures import CaseInsensitiveDict
+        from gost_http.cache import HTTPCache, parse_cache_control
+        from gost_http.gost_http_client import GOSTHTTPClient
+        from gost_http.response import GOSTResponse
+        
+        assert parse_cache_control('max-age=60, No-Cache, private="x"') == {
+            'max-age': '60', 'no-cache': None, 'private': 'x'}
+        
+        class Server:
+            """send для HTTPCache: отвечает заданными заголовками, 304 по ETag"""
+            def __init__(self, headers, body=b'<reestr/>'):
+                self.headers = headers
+                self.body = body
+                self.requests = []
+            
+            def __call__(self, method, url, kwargs):
+                request_headers = dict(kwargs.get('headers') or {})
+                self.requests.append((method, url, request_headers))
+                headers = CaseInsensitiveDict(self.headers)
+                if method == 'GET' and 'ETag' in headers and request_headers.get('If-None-Match') == headers['ETag']:
+                    return GOSTResponse(304, headers, content=b'')
+                return GOSTResponse(200, headers, content=self.body if method == 'GET' else b'ok')
+        
+        url = 'https://example.ru/reestr'
+        
+        # Свежий ответ отдается без запроса
+        cache = HTTPCache()
+        server = Server({'Cache-Control': 'max-age=60'})
+        assert cache.handle('GET', url, {}, server).status_code == 200
+        cached = cache.handle('GET', url, {}, server)
+        assert cached.tier == 'cache' and cached.content == b'<reestr/>' and cached.headers['Age'] == '0'
+        assert len(server.requests) == 1
+        # Запрос max-age=0 и параметры запроса - мимо записи
+        cache.handle('GET', url, {'headers': {'Cache-Control': 'max-age=0'}}, server)
+        cache.handle('GET', url, {'params': {'page': 2}}, server)
+        assert len(server.requests) == 3 and server.requests[2][1] == url
+        
+        # no-cache с ETag: каждый раз условный запрос, 304 отдает сохраненное тело
+        cache = HTTPCache()
+        server = Server({'Cache-Control': 'no-cache', 'ETag': '"v1"'})
+        cache.handle('GET', url, {}, server)
+        response = cache.handle('GET', url, {'headers': {'Accept': 'application/xml'}}, server)
+        assert response.status_code == 200 and response.content == b'<reestr/>' and response.tier == 'cache'
+        assert server.requests[1][2] == {'Accept': 'application/xml', 'If-None-Match': '"v1"'}
+        assert cache.stats()['revalidated'] == 1
+        # Запрос с условием от вызывающего выполняется как есть
+        assert cache.handle('GET', url, {'headers': {'If-None-Match': '"v1"'}}, server).status_code == 304
+        
+        # Устаревшая запись без валидаторов удаляется (из памяти и с диска), запрос - обычный
+        with tempfile.TemporaryDirectory() as directory:
+            cache = HTTPCache(directory=directory)
+            # Age больше max-age: запись сохраняется, но уже устарела
+            server = Server({'Cache-Control': 'max-age=60', 'Age': '120'})
+            cache.handle('GET', url, {}, server)
+            assert cache.stats()['entries'] == 1 and os.listdir(directory)
+            server.headers = {'Cache-Control': 'no-store'}
+            assert cache.handle('GET', url, {}, server).tier is None
+            assert server.requests[1][2] == {}
+            assert cache.stats()['entries'] == 0 and not os.listdir(directory)
+        
+        # Не сохраняются: no-store, Expires в прошлом без валидаторов, Vary: *
+        for headers in ({'Cache-Control': 'no-store, max-age=60'},
+                        {'Expires': formatdate(0, usegmt=True)},
+                        {'Cache-Control': 'max-age=60', 'Vary': '*'}):
+            cache = HTTPCache()
+            server = Server(headers)
+            cache.handle('GET', url, {}, server)
+            cache.handle('GET', url, {}, server)
+            assert len(server.requests) == 2, headers
+        
+        # Тело сохраняется распакованным: Content-Encoding удаляется, длина пересчитывается
+        cache = HTTPCache()
+        server = Server({'Cache-Control': 'max-age=60', 'Content-Encoding': 'gzip', 'Content-Length': '29'})
+        cache.handle('GET', url, {}, server)
+        cached = cache.handle('GET', url, {}, server)
+        assert 'Content-Encoding' not in cached.headers and cached.headers['Content-Length'] == '9'
+        # Неизвестное кодирование уровни не распаковывают - заголовки как есть
+        cache = HTTPCache()
+        server = Server({'Cache-Control': 'max-age=60', 'Content-Encoding': 'compress', 'Content-Length': '7'})
+        cache.handle('GET', url, {}, server)
+        cached = cache.handle('GET', url, {}, server)
+        assert cached.headers['Content-Encoding'] == 'compress' and cached.headers['Content-Length'] == '7'
+        
+        # Эвристический срок по Last-Modified: 10% возраста документа
+        cache = HTTPCache()
+        now = time.time()
+        server = Server({'Date': formatdate(now, usegmt=True),
+                         'Last-Modified': formatdate(now - 10 * 3600, usegmt=True)})
+        cache.handle('GET', url, {}, server)
+        assert cache.handle('GET', url, {}, server).tier == 'cache'
+        entry = cache._entries[url]
+        assert 3590 <= entry.freshness_lifetime() <= 3610
+        
+        # Vary: запрос с другим значением заголовка - промах
+        cache = HTTPCache()
+        server = Server({'Cache-Control': 'max-age=60', 'Vary': 'Accept-Language'})
+        cache.handle('GET', url, {'headers': {'Accept-Language': 'ru'}}, server)
+        assert cache.handle('GET', url, {'headers': {'accept-language': 'ru'}}, server).tier == 'cache'
+        cache.handle('GET', url, {'headers': {'Accept-Language': 'en'}}, server)
+        assert len(server.requests) == 2
+        
+        # POST делает запись недействительной; LRU вытесняет записи по размеру
+        cache = HTTPCache(max_size=2500)
+        server = Server({'Cache-Control': 'max-age=60'}, body=b'x' * 1000)
+        cache.handle('GET', url, {}, server)
+        cache.handle('POST', url, {'data': b'1'}, server)
+        cache.handle('GET', url, {}, server)
+        assert [method for method, _, _ in server.requests] == ['GET', 'POST', 'GET']
+        for index in range(3):
+            cache.handle('GET', f'{url}/{index}', {}, server)
+        stats = cache.stats()
+        assert stats['entries'] == 2 and stats['evictions'] == 2 and stats['bytes'] <= 2500
+        
+        # Записи на диске доступны другому экземпляру (другому процессу)
+        with tempfile.TemporaryDirectory() as directory:
+            server = Server({'Cache-Control': 'max-age=60', 'ETag': '"v1"'})
+            HTTPCache(directory=directory).handle('GET', url, {}, server)
+            shared = HTTPCache(directory=directory)
+            assert shared.handle('GET', url, {}, server).content == b'<reestr/>'
+            assert len(server.requests) == 1
+            shared.clear()
+            assert HTTPCache(directory=directory).handle('GET', url, {}, server).tier is None
+        
+        # GOSTHTTPClient: запросы идут через кеш, попадания передаются в sink замеров
+        server = Server({'Cache-Control': 'max-age=60'})
+        timings = []
+        client = GOSTHTTPClient(cache=HTTPCache(), metrics_sink=timings.append)
+        client._send = server
+        client.get(url)
+        response = client.get(url)
+        assert response.tier == 'cache' and len(server.requests) == 1
+        assert timings == [response.timing] and response.timing.tier == 'cache'
+        assert response.timing.status_code == 200 and response.timing.bytes == 9
+        client.close()
+        
+        print("  ✓ Кеш ответов работает корректно")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_http11_parser():
+    """Тест инкрементального парсера HTTP/1.1 (без сети)"""
+    print("Тестирование HTTP11ResponseParser...")
+    try:
+        from gost_http.http11 import HTTP11ResponseParser, NEED_DATA, END_OF_MESSAGE, ResponseHead
+        
+        def parse(data, method='GET', step=3):
+            parser = HTTP11ResponseParser(method)
+            head, body, pos = None, b'', 0
+            while True:
+                event = parser.next_event()
+                if event is NEED_DATA:
+                    if pos >= len(data):
+                        parser.feed_eof()
+                    else:
+                        parser.feed(data[pos:pos + step])
+                        pos += step
+                elif event is END_OF_MESSAGE:
+                    return head, body, parser.keep_alive
+                elif isinstance(event, ResponseHead):
+                    head = event
+                else:
+                    body += event
+        
+        # Content-Length с промежуточным 100 Continue
+        head, body, keep_alive = parse(
+            b'HTTP/1.1 100 Continue\r\n\r\n'
+            b'HTTP/1.1 200 OK\r\nContent-Length: 5\r\nContent-Type: text/plain\r\n\r\nhello'
+        )
+        assert head.status_code == 200 and head.get('content-type') == 'text/plain'
+        assert body == b'hello' and keep_alive
+        
+        # Chunked transfer encoding с расширениями и trailer
+        head, body, keep_alive = parse(
+            b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n'
+            b'5;ext=1\r\nhello\r\n6\r\n world\r\n0\r\nX-Trailer: 1\r\n\r\n'
+        )
+        assert body == b'hello world' and keep_alive
+        
+        # Тело до закрытия соединения
+        head, body, keep_alive = parse(b'HTTP/1.0 200 OK\r\n\r\nuntil close')
+        assert body == b'until close' and not keep_alive
+        
+        # HEAD и 304 без тела
+        head, body, _ = parse(b'HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\n', method='HEAD')
+        assert body == b''
+        head, body, _ = parse(b'HTTP/1.1 304 Not Modified\r\n\r\n')
+        assert head.status_code == 304 and body == b''
+        
+        print("  ✓ Парсер корректно разбирает ответы")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_gost_response_streaming():
+    """Тест потокового чтения GOSTResponse (без сети)"""
+    print("Тестирование потокового GOSTResponse...")
+    try:
+        import io
+        from gost_http.response import GOSTResponse
+        
+        body = b'line one\nline two\nline three'
+        response = GOSTResponse(200, {}, raw=io.BytesIO(body))
+        chunks = list(response.iter_content(5))
+        assert b''.join(chunks) == body and max(len(c) for c in chunks) <= 5
+        
+        # Тело уже прочитано потоково
+        try:
+            response.content
+            assert False, 'content должен быть недоступен после потокового чтения'
+        except RuntimeError:
+            pass
+        
+        response = GOSTResponse(200, {}, raw=io.BytesIO(body))
+        assert list(response.iter_lines(chunk_size=4)) == [b'line one', b'line two', b'line three']
+        
+        response = GOSTResponse(200, {}, raw=io.BytesIO('привет'.encode('utf-8')))
+        assert ''.join(response.iter_content(1, decode_unicode=True)) == 'привет'
+        
+        response = GOSTResponse(200, {}, raw=io.BytesIO(b'{"key": "value"}'))
+        assert response.json() == {'key': 'value'}
+        
+        print("  ✓ Потоковое чтение работает корректно")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_gost_response_interface():
+    """Тест совместимости GOSTResponse с requests.Response (без сети)"""
+    print("Тестирование интерфейса GOSTResponse...")
+    try:
+        import requests
+        from requests.structures import CaseInsensitiveDict
+        from gost_http.response import GOSTResponse
+        
+        response = GOSTResponse(200, {})
+        assert not hasattr(response, '__dict__')
+        
+        # Кодировка из charset заголовка Content-Type, text декодируется один раз
+        body = 'Реестр аккредитованных удостоверяющих центров'.encode('cp1251')
+        headers = CaseInsensitiveDict({'Content-Type': 'text/xml; charset=windows-1251'})
+        response = GOSTResponse(200, headers, content=body)
+        assert response.encoding == 'windows-1251'
+        assert response.text.startswith('Реестр') and response.text is response.text
+        response.encoding = 'utf-8'
+        assert response.text != 'Реестр аккредитованных удостоверяющих центров'
+        
+        # Без charset кодировка определяется по содержимому
+        response = GOSTResponse(200, {'content-type': 'text/plain'}, content='привет'.encode('utf-8'))
+        assert response.encoding is None and response.apparent_encoding == 'utf-8'
+        assert response.text == 'привет'
+        
+        # json() запоминает результат; application/json - UTF-8, без заголовка UTF-16 определяется по байтам
+        response = GOSTResponse(200, {'Content-Type': 'application/json'}, content='{"ключ": 1}'.encode('utf-8'))
+        assert response.json() == {'ключ': 1} and response.json() is response.json()
+        assert GOSTResponse(200, {}, content='[1]'.encode('utf-16')).json() == [1]
+        
+        # ok, bool и raise_for_status как у requests.Response
+        assert GOSTResponse(200, {}, content=b'').ok and GOSTResponse(302, {}, content=b'')
+        response = GOSTResponse(503, {}, content=b'', url='https://example.ru/', reason='Service Unavailable')
+        assert not response.ok and not response
+        try:
+            response.raise_for_status()
+            raise AssertionError('HTTPError не выброшен')
+        except requests.HTTPError as e:
+            assert e.response is response and '503 Server Error' in str(e)
+        GOSTResponse(200, {}, content=b'').raise_for_status()
+        
+        print("  ✓ Интерфейс GOSTResponse совместим с requests.Response")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_batch_map():
+    """Тест GOSTHTTPClient.map()/fetch_all() (без сети)"""
+    print("Тестирование пакетных запросов map()...")
+    try:
+        import threading
+        import time
+        from gost_http import GOSTHTTPClient
+        
+        client = GOSTHTTPClient()
+        lock = threading.Lock()
+        current = {}
+        peak = {}
+        
+        def fake_request(method, url, **kwargs):
+            host = url.split('/')[2]
+            with lock:
+                current[host] = current.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), current[host])
+            time.sleep(0.005)
+            with lock:
+                current[host] -= 1
+            return (method, url, kwargs)
+        
+        client._request = fake_request
+        urls = [f'https://host{i % 3}.example/{i}' for i in range(60)]
+        
+        # Порядок ответов совпадает с порядком запросов, лимит на хост соблюдается
+        results = list(client.map(iter(urls), max_workers=8, per_host=2))
+        assert [url for _, url, _ in results] == urls
+        assert max(peak.values()) <= 2
+        
+        # Режим по мере готовности возвращает пары (индекс, ответ)
+        pairs = list(client.map(urls, max_workers=8, ordered=False))
+        assert sorted(index for index, _ in pairs) == list(range(len(urls)))
+        assert all(result[1] == urls[index] for index, result in pairs)
+        
+        # Разные формы описания запроса
+        results = client.fetch_all([
+            'https://a.example/',
+            ('post', 'https://a.example/', {'json': {'a': 1}}),
+            {'method': 'PUT', 'url': 'https://a.example/', 'data': 'x'},
+        ])
+        assert results == [
+            ('GET', 'https://a.example/', {}),
+            ('POST', 'https://a.example/', {'json': {'a': 1}}),
+            ('PUT', 'https://a.example/', {'data': 'x'}),
+        ]
+        
+        print("  ✓ Пакетные запросы работают корректно")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_curl_batch_parsing():
+    """Тест разбора вывода curl (без сети)"""
+    print("Тестирование разбора вывода curl...")
+    try:
+        from gost_http.curl_batch import parse_header_dump, _quote
+        
+        # При редиректе используется последний блок заголовков
+        dump = (b'HTTP/1.1 301 Moved Permanently\r\nLocation: /new\r\n\r\n'
+                b'HTTP/1.1 100 Continue\r\n\r\n'
+                b'HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nX-Test: a: b\r\n\r\n')
+        status_code, reason, headers = parse_header_dump(dump)
+        assert status_code == 200 and reason == 'OK'
+        assert headers == [('Content-Type', 'text/html'), ('X-Test', 'a: b')]
+        assert parse_header_dump(b'') == (None, '', [])
+        
+        # Вывод одиночного curl -D -: заголовки, затем тело
+        import io
+        from gost_http.gost_http_client import _read_curl_head
+        output = io.BytesIO(
+            b'HTTP/1.1 302 Found\r\nLocation: /next\r\nContent-Length: 0\r\n\r\n'
+            b'HTTP/1.1 404 Not Found\r\nContent-Type: application/octet-stream\r\n\r\n'
+            b'\x00\xff\r\n\r\nbody'
+        )
+        assert _read_curl_head(output) == (404, 'Not Found', [('Content-Type', 'application/octet-stream')])
+        assert output.read() == b'\x00\xff\r\n\r\nbody'
+        
+        assert _quote('a "b" \\c') == '"a \\"b\\" \\\\c"'
+        
+        # Строки --write-out: передача без строки или с некорректной строкой - неудачная
+        from gost_http.curl_batch import parse_write_out
+        reports = parse_write_out(b'0 200 0 0.001 0.002 0.010 0.020 0.030\n'
+                                  b'2 000 28 0.001 0.002 0 0 15.0\n'
+                                  b'%{urlnum} 200 %{exitcode} 0 0 0 0 0\n'
+                                  b'3 200 0\n')
+        assert sorted(reports) == [0, 2]
+        assert reports[0][0] == 0 and abs(reports[0][1]['tls'] - 0.008) < 1e-9
+        assert reports[2][0] == 28
+        
+        print("  ✓ Разбор вывода curl работает корректно")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_async_client_offline():
+    """Тест AsyncGOSTHTTPClient без сети: кодирование тела и недоступный хост"""
+    print("Тестирование AsyncGOSTHTTPClient...")
+    try:
+        import asyncio
+        import http.server
+        import shutil
+        import tempfile
+        import threading
+        from gost_http import AsyncGOSTHTTPClient
+        from gost_http.async_client import AsyncTLSPool
+        from gost_http.transport import encode_body
+        
+        assert encode_body(json={'a': 1}) == (b'{"a": 1}', 'application/json')
+        assert encode_body(data={'a': 'б'}) == (b'a=%D0%B1', 'application/x-www-form-urlencoded')
+        assert encode_body(data='текст') == ('текст'.encode('utf-8'), None)
+        assert encode_body() == (None, None)
+        
+        async def request_closed_port():
+            async with AsyncGOSTHTTPClient(timeout=2) as client:
+                response = await client.get('https://127.0.0.1:1/')
+                return response, client.routes.stats()
+        
+        response, stats = asyncio.run(request_closed_port())
+        assert response is None
+        # Все уровни завершились ошибкой и исключены из цепочки
+        assert stats['negative'] >= 1 and stats['routes'] == 0
+        
+        # Загрузка engine и SSL контекста выполняется вне потока event loop
+        async def load_context_thread():
+            loaded = []
+            
+            def load_ssl_context():
+                loaded.append(threading.current_thread())
+                raise ConnectionError('GOST engine недоступен')
+            
+            async with AsyncGOSTHTTPClient(timeout=2, tiers=['pyopenssl']) as client:
+                client._load_ssl_context = load_ssl_context
+                assert await client.get('https://127.0.0.1:1/') is None
+            return loaded
+        
+        loaded = asyncio.run(load_context_thread())
+        assert loaded and loaded[0] is not threading.current_thread()
+        
+        # Потоковое тело отправляется фрагментами, без склейки в один bytes
+        class RecordingConnection:
+            def __init__(self, host, port):
+                self.host, self.port = host, port
+                self.ssl_conn = None
+                self.closed = False
+                self.requests = 0
+                self.last_used = 0
+                self.writes = []
+            
+            async def sendall(self, data):
+                self.writes.append(bytes(data))
+            
+            async def receive(self, parser):
+                parser.feed(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok')
+            
+            def is_dropped(self):
+                return False
+            
+            def close(self):
+                self.closed = True
+        
+        async def upload_stream(body):
+            connections = []
+            
+            async def connect(host, port):
+                connections.append(RecordingConnection(host, port))
+                return connections[-1]
+            
+            pool = AsyncTLSPool(connect)
+            response = await pool.request('POST', 'example.ru', 443, '/upload', body=body)
+            assert response.content == b'ok'
+            return connections[0].writes
+        
+        chunks = [b'x' * 70000 for _ in range(3)]
+        head, *writes = asyncio.run(upload_stream(iter(chunks)))
+        assert b'Transfer-Encoding: chunked' in head and b'Content-Length' not in head
+        assert writes[:3] == [b'%x\r\n' % 70000 + chunk + b'\r\n' for chunk in chunks]
+        assert writes[3:] == [b'0\r\n\r\n']
+        file = tempfile.TemporaryFile()
+        file.write(b'y' * 200000)
+        file.seek(0)
+        head, *writes = asyncio.run(upload_stream(file))
+        assert b'Content-Length: 200000' in head and len(writes) > 1
+        assert b''.join(writes) == b'y' * 200000
+        file.close()
+        head, *writes = asyncio.run(upload_stream(b'small'))
+        assert head.endswith(b'Content-Length: 5\r\n\r\nsmall') and not writes
+        
+        # Уровень curl передает потоковое тело через stdin по мере чтения
+        class EchoHandler(http.server.BaseHTTPRequestHandler):
+            def do_PUT(self):
+                if self.headers.get('Transfer-Encoding') == 'chunked':
+                    mode, received = 'chunked', 0
+                    while True:
+                        size = int(self.rfile.readline().strip(), 16)
+                        received += len(self.rfile.read(size))
+                        self.rfile.readline()
+                        if not size:
+                            break
+                else:
+                    mode = 'length'
+                    received = len(self.rfile.read(int(self.headers['Content-Length'])))
+                answer = f'{mode} {received}'.encode()
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(answer)))
+                self.end_headers()
+                self.wfile.write(answer)
+            
+            def log_message(self, *args):
+                pass
+        
+        if shutil.which('curl'):
+            server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), EchoHandler)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            url = f'http://127.0.0.1:{server.server_address[1]}/upload'
+            
+            async def curl_upload(body):
+                async with AsyncGOSTHTTPClient(timeout=5) as client:
+                    return (await client.put(url, data=body)).content
+            
+            assert asyncio.run(curl_upload(iter(chunks))) == b'chunked 210000'
+            file = tempfile.TemporaryFile()
+            file.write(b'y' * 200000)
+            file.seek(0)
+            assert asyncio.run(curl_upload(file)) == b'length 200000'
+            file.close()
+            server.shutdown()
+            server.server_close()
+        
+        print("  ✓ AsyncGOSTHTTPClient работает корректно")
+        return True
+    except Exception as e:
+        print(f"  ✗ Ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def run_all_tests():
     """Запуск всех тестов"""
     print("=" * 60)
@@ -276,6 +2061,99 @@ def run_all_tests():
         print("  pip install requests pyOpenSSL cryptography")
         return 1
     
+    # Offline тесты внутренних компонентов
+    success = test_lazy_import()
+    results.append(("Ленивый импорт", success))
+    print()
+    
+    success = test_engine_registration()
+    results.append(("Регистрация GOST engine", success))
+    print()
+    
+    success = test_thread_safety()
+    results.append(("Потокобезопасность", success))
+    print()
+    
+    success = test_tls_session_cache()
+    results.append(("Кеш TLS сессий", success))
+    print()
+    
+    success = test_ssl_context_cache()
+    results.append(("Общий SSL контекст", success))
+    print()
+    
+    success = test_default_clients()
+    results.append(("Общие клиенты", success))
+    print()
+    
+    success = test_connector()
+    results.append(("Кеш DNS и Happy Eyeballs", success))
+    print()
+    
+    success = test_prewarm()
+    results.append(("Прогрев соединений", success))
+    print()
+    
+    success = test_tier_routing_cache()
+    results.append(("TierRoutingCache", success))
+    print()
+    
+    success = test_hedging()
+    results.append(("Хеджирование уровней", success))
+    print()
+    
+    success = test_metrics()
+    results.append(("Замеры времени и метрики", success))
+    print()
+    
+    success = test_bench_cli()
+    results.append(("python -m gost_http bench", success))
+    print()
+    
+    success = test_http2()
+    results.append(("HTTP/2", success))
+    print()
+    
+    success = test_compression()
+    results.append(("Сжатие ответов", success))
+    print()
+    
+    success = test_streaming_upload()
+    results.append(("Потоковые тела запросов", success))
+    print()
+    
+    success = test_download()
+    results.append(("Загрузка диапазонами", success))
+    print()
+    
+    success = test_http_cache()
+    results.append(("Кеш ответов", success))
+    print()
+    
+    success = test_http11_parser()
+    results.append(("HTTP11ResponseParser", success))
+    print()
+    
+    success = test_gost_response_streaming()
+    results.append(("Потоковый GOSTResponse", success))
+    print()
+    
+    success = test_gost_response_interface()
+    results.append(("Интерфейс GOSTResponse", success))
+    print()
+    
+    success = test_batch_map()
+    results.append(("GOSTHTTPClient.map()", success))
+    print()
+    
+    success = test_curl_batch_parsing()
+    results.append(("CurlBatcher", success))
+    print()
+    
+    success = test_async_client_offline()
+    results.append(("AsyncGOSTHTTPClient", success))
+    print()
+    
     # Собираем информацию о SSL для всех сайтов после успешных тестов
     # (будет заполнено после тестов)
     